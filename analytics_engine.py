@@ -0,0 +1,529 @@
+# Offline user_analytics computation
+#
+# Recomputes every column public.update_user_analytics_bulk() writes from a
+# columnar export of journal_entries and users, so the nightly job can run
+# off the primary database instead of competing with the Friday-afternoon
+# journal writes.  Numeric columns are reduced with NumPy group-bys; the
+# JSONB insights are decoded once per entry.  Week numbering, rounding and
+# JSON number formatting follow the SQL so the results match row for row
+# (dates are taken in UTC, the Supabase session time zone).
+#
+# Exports are Parquet or Arrow IPC/Feather files, read memory-mapped with the
+# optional `pyarrow` package (pip install numpy pyarrow), or CSV from psql:
+#
+#   \copy (SELECT user_id, week_start_date, completion_status, productivity_score,
+#          satisfaction_score, skills_applied, accomplishments, daily_entries
+#          FROM public.journal_entries
+#          UNION ALL
+#          SELECT user_id, week_start_date, completion_status, productivity_score,
+#          satisfaction_score, skills_applied, accomplishments, daily_entries
+#          FROM journal_archive.journal_entries) TO 'journal_entries.csv' CSV HEADER
+#   \copy (SELECT id, created_at FROM public.users) TO 'users.csv' CSV HEADER
+#
+# (for Parquet, run the same SELECTs through DuckDB's postgres extension with
+# COPY ... TO 'journal_entries.parquet').  The result is a psql script that
+# bulk-loads the rows and upserts them:
+#
+#   python analytics_engine.py --entries journal_entries.parquet --users users.parquet
+#   psql "$DATABASE_URL" -f user_analytics_upsert.sql
+#
+# Rows the journal triggers have updated since the export are left alone.
+# --compare checks the result against a CSV export of user_analytics taken
+# right after update_user_analytics_bulk() ran on the same data.
+
+import argparse
+import csv
+import json
+import re
+import sys
+import time
+import uuid
+from datetime import date, datetime, timezone
+from decimal import ROUND_HALF_UP, Decimal
+
+import numpy as np
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # optional dependency
+    pyarrow = None
+
+DEFAULT_OUT = 'user_analytics_upsert.sql'
+EPOCH_MONDAY = date(2000, 1, 3).toordinal()  # origin of the SQL week numbers
+UNIX_EPOCH = date(1970, 1, 1).toordinal()
+DAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+TOP_SKILLS = 5
+ENERGY_WEEKS = 52
+CENTS = Decimal('0.01')
+SLOPE_PLACES = Decimal('0.0001')
+
+ENTRY_COLUMNS = ('user_id', 'week_start_date', 'completion_status', 'productivity_score',
+                 'satisfaction_score', 'skills_applied', 'accomplishments', 'daily_entries')
+USER_COLUMNS = ('id', 'created_at')
+OUTPUT_COLUMNS = ('user_id', 'total_entries', 'consistency_score', 'average_productivity',
+                  'average_satisfaction', 'growth_trend', 'productivity_sum', 'productivity_count',
+                  'satisfaction_sum', 'satisfaction_count', 'top_skills', 'achievement_patterns',
+                  'last_computed_at')
+JSON_COLUMNS = ('growth_trend', 'top_skills', 'achievement_patterns')
+
+
+# ---------------------------------------------------------------------------
+# Reading exports
+# ---------------------------------------------------------------------------
+
+def _read_arrow(path, columns):
+    if pyarrow is None:
+        raise SystemExit(f"❌ {path}: reading Parquet/Arrow needs pyarrow (pip install pyarrow), "
+                         f"or export CSV instead")
+    if path.endswith('.parquet'):
+        table = pyarrow.parquet.read_table(path, columns=list(columns), memory_map=True)
+    else:
+        source = pyarrow.memory_map(path)
+        reader = pyarrow.ipc.open_stream(source) if path.endswith('.arrows') else pyarrow.ipc.open_file(source)
+        table = reader.read_all().select(list(columns))
+    out = {}
+    for name in columns:
+        column = table.column(name).combine_chunks()
+        if pyarrow.types.is_integer(column.type):
+            out[name] = (column.fill_null(0).to_numpy(zero_copy_only=False).astype(np.int64),
+                         column.is_valid().to_numpy(zero_copy_only=False))
+        elif pyarrow.types.is_date(column.type):
+            days = column.cast(pyarrow.date32()).to_numpy(zero_copy_only=False)
+            out[name] = days.astype('datetime64[D]').astype(np.int64) + UNIX_EPOCH
+        else:
+            out[name] = column.to_pylist()
+    return out
+
+
+def _read_csv(path, columns):
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    return {name: [row[name] if row[name] != '' else None for row in rows] for name in columns}
+
+
+def read_export(path, columns):
+    """Columns of an export; NumPy arrays where pyarrow could type them."""
+    if path.endswith('.csv'):
+        return _read_csv(path, columns)
+    return _read_arrow(path, columns)
+
+
+def _uuid_text(value):
+    if isinstance(value, bytes) and len(value) == 16:
+        return str(uuid.UUID(bytes=value))
+    return str(value)
+
+
+def _day_numbers(values):
+    """Dates as proleptic ordinals (date.toordinal)."""
+    if isinstance(values, np.ndarray):
+        return values
+    return np.array([(v if isinstance(v, date) else date.fromisoformat(v)).toordinal() for v in values],
+                    dtype=np.int64)
+
+
+def _timestamp(value):
+    if isinstance(value, str):
+        value = value.replace(' ', 'T', 1)
+        if re.search(r'[+-]\d\d$', value):
+            value += ':00'
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _scores(values):
+    """(values, present) arrays for a nullable integer column."""
+    if isinstance(values, tuple):
+        return values
+    present = np.array([v is not None for v in values], dtype=bool)
+    return np.array([int(v) if v is not None else 0 for v in values], dtype=np.int64), present
+
+
+def _json(value):
+    if value is None or value == '':
+        return None
+    if isinstance(value, str):
+        return json.loads(value, parse_float=Decimal)
+    return value
+
+
+def load(entries_path, users_path):
+    """Normalize the two exports into arrays indexed by user position."""
+    raw_users = read_export(users_path, USER_COLUMNS)
+    user_ids = [_uuid_text(v) for v in raw_users['id']]
+    position = {user_id: i for i, user_id in enumerate(user_ids)}
+    signup = np.array([_timestamp(v).date().toordinal() for v in raw_users['created_at']], dtype=np.int64)
+
+    raw = read_export(entries_path, ENTRY_COLUMNS)
+    owner = np.array([position.get(_uuid_text(v), -1) for v in raw['user_id']], dtype=np.int64)
+    known = owner >= 0  # rows of deleted users never reach user_analytics
+    productivity, has_productivity = _scores(raw['productivity_score'])
+    satisfaction, has_satisfaction = _scores(raw['satisfaction_score'])
+    keep = np.flatnonzero(known)
+    entries = {
+        'user': owner[keep],
+        'week_start': _day_numbers(raw['week_start_date'])[keep],
+        'completed': np.array([s == 'completed' for s in raw['completion_status']], dtype=bool)[keep],
+        'productivity': productivity[keep],
+        'has_productivity': has_productivity[keep],
+        'satisfaction': satisfaction[keep],
+        'has_satisfaction': has_satisfaction[keep],
+    }
+    for name in ('skills_applied', 'accomplishments', 'daily_entries'):
+        entries[name] = [raw[name][i] for i in keep]
+    return {'ids': user_ids, 'signup': signup}, entries
+
+
+# ---------------------------------------------------------------------------
+# SQL semantics
+# ---------------------------------------------------------------------------
+
+def monday(days):
+    """Monday of the week containing each ordinal (ordinal 1 is a Monday)."""
+    return days - (days - 1) % 7
+
+
+def week_numbers(days):
+    return (monday(days) - EPOCH_MONDAY) // 7
+
+
+def round_numeric(value, places):
+    """ROUND(numeric, n): half away from zero, no negative zero."""
+    value = value.quantize(places, rounding=ROUND_HALF_UP)
+    return abs(value) if value == 0 else value
+
+
+def _is_number(value):
+    return isinstance(value, (int, Decimal, float)) and not isinstance(value, bool)
+
+
+def _jsonb_text(value):
+    """jsonb's text form of a value, as jsonb_array_elements_text yields it."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value
+    return _jsonb_literal(value)
+
+
+def _jsonb_literal(value):
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (int, Decimal)):
+        return format(Decimal(value), 'f')
+    if isinstance(value, float):
+        return format(Decimal(repr(value)), 'f')
+    if isinstance(value, str):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, date):
+        return f'"{value.isoformat()}"'
+    if isinstance(value, list):
+        return '[' + ', '.join(_jsonb_literal(v) for v in value) + ']'
+    # jsonb orders object keys by length, then bytewise
+    keys = sorted(value, key=lambda k: (len(k.encode('utf-8')), k.encode('utf-8')))
+    return '{' + ', '.join(f'{json.dumps(k, ensure_ascii=False)}: {_jsonb_literal(value[k])}' for k in keys) + '}'
+
+
+# ---------------------------------------------------------------------------
+# Reductions
+# ---------------------------------------------------------------------------
+
+def _max_at(size, index, values):
+    out = np.zeros(size, dtype=np.int64)
+    np.maximum.at(out, index, values)
+    return out
+
+
+def streak_summary(user, week, n_users, current_week):
+    """Distinct completed weeks plus the gaps-and-islands streak columns."""
+    span = int(week.max() - week.min() + 1) if len(week) else 1
+    base = int(week.min()) if len(week) else 0
+    keys = np.unique(user * span + (week - base))
+    pair_user, pair_week = keys // span, keys % span + base
+
+    new_user = np.r_[True, pair_user[1:] != pair_user[:-1]] if len(keys) else np.zeros(0, bool)
+    step = np.r_[0, np.diff(pair_week)] if len(keys) else np.zeros(0, np.int64)
+    run_start = new_user | (step != 1)
+    run_id = np.cumsum(run_start) - 1
+    run_length = np.bincount(run_id) if len(keys) else np.zeros(0, np.int64)
+    run_user = pair_user[run_start]
+    run_last = pair_week[np.flatnonzero(np.r_[run_start[1:], True])] if len(keys) else pair_week
+    ongoing = run_last >= current_week - 1
+
+    return {
+        'completed_weeks': np.bincount(pair_user, minlength=n_users),
+        'current_streak': _max_at(n_users, run_user[ongoing], run_length[ongoing]),
+        'longest_streak': _max_at(n_users, run_user, run_length),
+        'longest_gap': _max_at(n_users, pair_user[~new_user], step[~new_user] - 1),
+        'last_week': _max_at(n_users, pair_user, pair_week),
+    }
+
+
+def energy_trend(entries, n_users, today):
+    """public.energy_trend(): weekly average energy and its slope per user."""
+    # daily_metrics rows, keyed like its primary key (user_id, entry_date)
+    metrics = {}
+    for user, week_start, daily in zip(entries['user'].tolist(), entries['week_start'].tolist(),
+                                       entries['daily_entries']):
+        daily = _json(daily)
+        if not isinstance(daily, dict):
+            continue
+        iso_dow = (week_start - 1) % 7 + 1
+        for key, value in daily.items():
+            if key not in DAYS or not isinstance(value, dict) or not _is_number(value.get('energy')):
+                continue
+            entry_date = week_start + (DAYS.index(key) + 1 - iso_dow + 7) % 7
+            energy = int(Decimal(str(value['energy'])).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+            # Off-scale values are stored as NULL
+            metrics[user, entry_date] = (week_start, energy if 1 <= energy <= 10 else None)
+
+    cutoff = today - 7 * ENERGY_WEEKS
+    rows = [(user, week_start, energy) for (user, entry_date), (week_start, energy) in metrics.items()
+            if entry_date >= cutoff and energy is not None]
+    if not rows:
+        return {}
+    user, week, energy = (np.array(column, dtype=np.int64) for column in zip(*rows))
+
+    span = int(week.max() - week.min() + 1)
+    keys, group = np.unique(user * span + (week - week.min()), return_inverse=True)
+    group_user, group_week = keys // span, keys % span + week.min()
+    total = np.bincount(group, weights=energy).astype(np.int64)
+    count = np.bincount(group)
+
+    # regr_slope(average energy, weeks since the epoch Monday)
+    x = (group_week - EPOCH_MONDAY) / 7.0
+    y = total / count
+    n = np.bincount(group_user, minlength=n_users)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_x = np.bincount(group_user, weights=x, minlength=n_users) / n
+        mean_y = np.bincount(group_user, weights=y, minlength=n_users) / n
+        dx = x - mean_x[group_user]
+        sxx = np.bincount(group_user, weights=dx * dx, minlength=n_users)
+        sxy = np.bincount(group_user, weights=dx * (y - mean_y[group_user]), minlength=n_users)
+        slope = sxy / sxx
+
+    trends = {}
+    for g in range(len(keys)):  # np.unique sorts by user, then week
+        u = int(group_user[g])
+        trend = trends.setdefault(u, {'weekly_energy': [], 'energy_slope_per_week': None})
+        trend['weekly_energy'].append({
+            'week': date.fromordinal(int(group_week[g])),
+            'energy': round_numeric(Decimal(int(total[g])) / Decimal(int(count[g])), CENTS),
+        })
+    for u, trend in trends.items():
+        if n[u] >= 2 and sxx[u] != 0:
+            # float8 -> numeric keeps 15 significant digits before ROUND
+            trend['energy_slope_per_week'] = round_numeric(Decimal(f'{slope[u]:.15g}'), SLOPE_PLACES)
+    return trends
+
+
+def top_skills(entries, done):
+    """public.top_skills(): most used skills per user, ties by text (C collation)."""
+    counts = {}
+    for i in done.tolist():
+        skills = _json(entries['skills_applied'][i])
+        if not isinstance(skills, list):
+            continue
+        user = int(entries['user'][i])
+        for skill in skills:
+            key = (user, _jsonb_text(skill))
+            counts[key] = counts.get(key, 0) + 1
+
+    per_user = {}
+    for (user, skill), weeks in counts.items():
+        per_user.setdefault(user, []).append((skill, weeks))
+    result = {}
+    for user, skills in per_user.items():
+        skills.sort(key=lambda item: (-item[1], item[0] is None, item[0] or ''))
+        result[user] = [{'skill': skill, 'weeks': weeks} for skill, weeks in skills[:TOP_SKILLS]]
+    return result
+
+
+def achievement_patterns(entries, done, n_users):
+    """public.achievement_patterns() for every user with completed entries."""
+    user = entries['user'][done]
+    week = entries['week_start'][done]
+    count = np.array([len(v) if isinstance(v, list) else 0
+                      for v in (_json(entries['accomplishments'][i]) for i in done.tolist())], dtype=np.int64)
+    total = np.bincount(user, weights=count, minlength=n_users).astype(np.int64)
+    with_any = np.bincount(user[count > 0], minlength=n_users)
+    weeks = np.bincount(user, minlength=n_users)
+
+    # best_week: most accomplishments, latest week on ties
+    order = np.lexsort((-week, -count, user))
+    first = order[np.r_[True, user[order][1:] != user[order][:-1]]] if len(order) else order
+    best_week = dict(zip(user[first].tolist(), week[first].tolist()))
+
+    return {u: {
+        'total': int(total[u]),
+        'weeks_with_accomplishments': int(with_any[u]),
+        'average_per_week': round_numeric(Decimal(int(total[u])) / Decimal(int(weeks[u])), CENTS),
+        'best_week': date.fromordinal(best_week[u]),
+    } for u in best_week}
+
+
+def compute(users, entries, as_of):
+    """Rows of public.user_analytics, one per user, in export order."""
+    n_users = len(users['ids'])
+    today = as_of.date().toordinal()
+    current_week = int(week_numbers(np.array([today]))[0])
+    done = np.flatnonzero(entries['completed'])
+    user = entries['user'][done]
+
+    total = np.bincount(user, minlength=n_users)
+    sums = {}
+    for score in ('productivity', 'satisfaction'):
+        present = entries['has_' + score][done]
+        values = entries[score][done]
+        sums[score] = (np.bincount(user[present], weights=values[present], minlength=n_users).astype(np.int64),
+                       np.bincount(user[present], minlength=n_users))
+
+    streaks = streak_summary(user, week_numbers(entries['week_start'][done]), n_users, current_week)
+    weeks_since = (monday(today) - monday(users['signup'])) // 7 + 1
+    trends = energy_trend(entries, n_users, today)
+    skills = top_skills(entries, done)
+    patterns = achievement_patterns(entries, done, n_users)
+
+    rows = []
+    for u, user_id in enumerate(users['ids']):
+        completed_weeks = int(streaks['completed_weeks'][u])
+        since = int(weeks_since[u])
+        growth = dict(trends.get(u, {}))
+        if completed_weeks:
+            growth.update({
+                'current_streak': int(streaks['current_streak'][u]),
+                'longest_streak': int(streaks['longest_streak'][u]),
+                'longest_gap': int(streaks['longest_gap'][u]),
+                'last_completed_week': date.fromordinal(EPOCH_MONDAY + 7 * int(streaks['last_week'][u])),
+            })
+        growth.update({'completed_weeks': completed_weeks, 'weeks_since_signup': since})
+
+        row = {
+            'user_id': user_id,
+            'total_entries': int(total[u]),
+            'consistency_score': round_numeric(
+                min(Decimal(completed_weeks) / max(since, 1), Decimal(1)), CENTS),
+            'growth_trend': growth,
+            'top_skills': skills.get(u),
+            'achievement_patterns': patterns.get(u),
+            'last_computed_at': as_of,
+        }
+        for score in ('productivity', 'satisfaction'):
+            score_sum, score_count = int(sums[score][0][u]), int(sums[score][1][u])
+            row[f'average_{score}'] = (round_numeric(Decimal(score_sum) / score_count, CENTS)
+                                       if score_count else None)
+            row[f'{score}_sum'] = score_sum
+            row[f'{score}_count'] = score_count
+        rows.append(row)
+    return rows
+
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+def _csv_value(name, value):
+    if value is None:
+        return ''
+    if name in JSON_COLUMNS:
+        return _jsonb_literal(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def write_upsert(rows, path, as_of):
+    """psql script: COPY into a temp table, then one upsert statement.
+
+    Rows whose last_computed_at is newer than the export (the journal
+    triggers have applied deltas since) are skipped.
+    """
+    columns = ', '.join(OUTPUT_COLUMNS)
+    updates = ',\n    '.join(f'{c} = EXCLUDED.{c}' for c in OUTPUT_COLUMNS if c != 'user_id')
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(f"-- user_analytics computed offline by analytics_engine.py as of {as_of.isoformat()}\n"
+                f"BEGIN;\n"
+                f"CREATE TEMP TABLE user_analytics_import (LIKE public.user_analytics INCLUDING DEFAULTS) ON COMMIT DROP;\n"
+                f"COPY user_analytics_import ({columns}) FROM STDIN WITH (FORMAT csv);\n")
+        writer = csv.writer(f, lineterminator='\n')
+        for row in rows:
+            writer.writerow([_csv_value(c, row[c]) for c in OUTPUT_COLUMNS])
+        f.write(f"\\.\n"
+                f"INSERT INTO public.user_analytics AS a ({columns})\n"
+                f"SELECT {columns}\n"
+                f"FROM user_analytics_import i\n"
+                f"WHERE EXISTS (SELECT 1 FROM public.users u WHERE u.id = i.user_id)\n"
+                f"ON CONFLICT (user_id) DO UPDATE SET\n"
+                f"    {updates},\n"
+                f"    updated_at = NOW()\n"
+                f"WHERE a.last_computed_at IS NULL OR a.last_computed_at <= EXCLUDED.last_computed_at;\n"
+                f"COMMIT;\n")
+
+
+def _comparable(name, value):
+    if value is None or value == '':
+        return None
+    if name in JSON_COLUMNS:
+        return json.loads(value if isinstance(value, str) else _jsonb_literal(value), parse_float=Decimal)
+    if name in ('consistency_score', 'average_productivity', 'average_satisfaction'):
+        return Decimal(str(value))
+    if name == 'user_id':
+        return str(value)
+    return int(value)
+
+
+def compare(rows, expected_path, limit=20):
+    """Differences against a CSV export of public.user_analytics."""
+    with open(expected_path, newline='', encoding='utf-8') as f:
+        expected = {row['user_id']: row for row in csv.DictReader(f)}
+    differences = []
+    for row in rows:
+        other = expected.pop(row['user_id'], None)
+        if other is None:
+            differences.append(f"{row['user_id']}: missing from {expected_path}")
+            continue
+        for name in OUTPUT_COLUMNS[1:-1]:
+            ours, theirs = _comparable(name, row[name]), _comparable(name, other.get(name))
+            if ours != theirs:
+                differences.append(f"{row['user_id']} {name}: {ours!r} != {theirs!r}")
+    differences += [f"{user_id}: only in {expected_path}" for user_id in expected]
+    return differences[:limit], len(differences)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compute user_analytics offline from exported tables.')
+    parser.add_argument('--entries', required=True, help='journal_entries export (.parquet, .arrow, .feather, .csv)')
+    parser.add_argument('--users', required=True, help='users export with id, created_at')
+    parser.add_argument('--as-of', help='export time, ISO 8601 (default: now); drives CURRENT_DATE')
+    parser.add_argument('--out', default=DEFAULT_OUT, help=f'upsert script to write (default: {DEFAULT_OUT})')
+    parser.add_argument('--compare', metavar='CSV', help='check against an export of user_analytics')
+    args = parser.parse_args(argv)
+
+    as_of = _timestamp(args.as_of) if args.as_of else datetime.now(timezone.utc)
+    started = time.perf_counter()
+    users, entries = load(args.entries, args.users)
+    loaded = time.perf_counter()
+    rows = compute(users, entries, as_of)
+    computed = time.perf_counter()
+    write_upsert(rows, args.out, as_of)
+
+    print(f"✅ {len(rows):,} users from {len(entries['user']):,} entries → {args.out}")
+    print(f"⏱️  load {loaded - started:.2f}s · compute {computed - loaded:.2f}s")
+    if args.compare:
+        differences, count = compare(rows, args.compare)
+        for line in differences:
+            print(f"   {line}")
+        print(f"{'✅' if not count else '❌'} {count} difference(s) against {args.compare}")
+        if count:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,322 @@
+# Offline page-load benchmark
+#
+# Serves a build (dist/ by default, else the repo root) from a local HTTP
+# server, fetches index.html and every subresource it pulls in to get the
+# real on-the-wire sizes (gzip, as a production host would send them), then
+# replays that resource graph through a simple network model — round trips
+# for DNS/TCP/TLS and requests, a shared downlink, TCP slow start and six
+# connections per origin — for each throttling profile.  No browser and no
+# network access are needed, so it runs in CI and compares builds.
+#
+#   python bench.py                  # dist/ if built, all profiles
+#   python bench.py --dir . -p 3g    # unbuilt artifacts on 3G only
+#   python bench.py --check          # exit 1 if 3G load exceeds the README's 1s
+#
+# Results are appended to bench_history.json with the delta against the
+# previous run.
+
+import argparse
+import gzip
+import http.client
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urljoin, urlsplit
+
+import budget
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+HISTORY_FILE = os.path.join(ROOT, 'bench_history.json')
+
+# Round-trip time and downlink, after WebPageTest's connectivity presets
+PROFILES = {
+    'slow-3g': {'rtt_ms': 400, 'down_kbps': 400},
+    '3g': {'rtt_ms': 300, 'down_kbps': 1600},
+    '4g': {'rtt_ms': 170, 'down_kbps': 9000},
+}
+# README: "Load Time: <1s on 3G"
+TARGET_PROFILE = '3g'
+TARGET_LOAD_MS = 1000
+
+MAX_CONNECTIONS_PER_ORIGIN = 6
+INITIAL_CWND = 10 * 1460  # bytes, RFC 6928
+STEP_MS = 1.0
+# Sizes assumed for third-party responses we cannot fetch offline
+THIRD_PARTY_BYTES = {'fonts.googleapis.com': 1_200}
+DEFAULT_THIRD_PARTY_BYTES = 20_000
+
+FONT_URL_RE = re.compile(r'url\(\s*[\'"]?([^\'")]+\.woff2?)[\'"]?\s*\)')
+COMPRESSIBLE = ('.html', '.css', '.js', '.json', '.svg')
+
+
+# ---------------------------------------------------------------------------
+# Local server
+# ---------------------------------------------------------------------------
+
+class _Handler(SimpleHTTPRequestHandler):
+    """Static handler that gzips like a production host would."""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            path = os.path.join(path, 'index.html')
+        if not os.path.isfile(path):
+            self.send_error(404)
+            return
+        if 'gzip' in self.headers.get('Accept-Encoding', '') and path.endswith(COMPRESSIBLE):
+            if os.path.exists(path + '.gz'):
+                with open(path + '.gz', 'rb') as f:
+                    body = f.read()
+            else:
+                with open(path, 'rb') as f:
+                    body = gzip.compress(f.read(), compresslevel=9, mtime=0)
+            encoding = 'gzip'
+        else:
+            with open(path, 'rb') as f:
+                body = f.read()
+            encoding = None
+        self.send_response(200)
+        self.send_header('Content-Type', self.guess_type(path))
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve(directory):
+    """Start a loopback server for ``directory``; returns (server, base_url)."""
+    def handler(*args, **kwargs):
+        return _Handler(*args, directory=directory, **kwargs)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+def fetch(url):
+    """GET ``url``; returns (decoded body, bytes on the wire)."""
+    parts = urlsplit(url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port)
+    try:
+        conn.request('GET', parts.path or '/', headers={'Accept-Encoding': 'gzip'})
+        response = conn.getresponse()
+        body = response.read()
+        if response.status != 200:
+            raise RuntimeError(f"{url}: HTTP {response.status}")
+        header_bytes = sum(len(f"{k}: {v}\r\n") for k, v in response.getheaders()) + 17
+        decoded = gzip.decompress(body) if response.getheader('Content-Encoding') == 'gzip' else body
+        return decoded, len(body) + header_bytes
+    finally:
+        conn.close()
+
+
+def resource_graph(base_url, page='index.html'):
+    """Fetch ``page`` and its subresources and describe how they are found.
+
+    Returns a list of dicts with ``url``, ``origin``, ``kind``,
+    ``blocking``, ``bytes`` (on the wire), ``estimated`` and ``parent`` (the
+    resource whose arrival reveals it).
+    """
+    page_url = urljoin(base_url, page)
+    html, wire = fetch(page_url)
+    graph = [{'url': page, 'origin': None, 'kind': 'document', 'blocking': True,
+              'bytes': wire, 'estimated': False, 'parent': None}]
+
+    resources, _ = budget.page_resources(html.decode('utf-8'))
+    fonts_seen = {r['url'] for r in resources if r['kind'] == 'font'}
+    for resource in resources:
+        entry = dict(resource, parent=page, estimated=bool(resource['origin']))
+        if resource['origin']:
+            entry['bytes'] = THIRD_PARTY_BYTES.get(resource['origin'], DEFAULT_THIRD_PARTY_BYTES)
+            graph.append(entry)
+            continue
+        body, entry['bytes'] = fetch(urljoin(page_url, resource['url']))
+        graph.append(entry)
+        if resource['kind'] == 'style':
+            # Fonts that are not preloaded are only discovered once the CSS is in
+            for font in FONT_URL_RE.findall(body.decode('utf-8')):
+                font_url = urljoin(resource['url'], font)
+                if font_url in fonts_seen:
+                    continue
+                fonts_seen.add(font_url)
+                _, size = fetch(urljoin(page_url, font_url))
+                graph.append({'url': font_url, 'origin': None, 'kind': 'font', 'blocking': False,
+                              'bytes': size, 'estimated': False, 'parent': resource['url']})
+    return graph
+
+
+# ---------------------------------------------------------------------------
+# Network model
+# ---------------------------------------------------------------------------
+
+def simulate(graph, rtt_ms, down_kbps):
+    """Replay ``graph`` over a throttled link; returns per-resource timings.
+
+    A new connection costs DNS (first connection to an origin only), TCP and
+    TLS round trips; each request costs one more round trip before its first
+    byte.  Concurrent responses split the downlink evenly and each is capped
+    by its connection's congestion window, which starts at INITIAL_CWND and
+    grows by the bytes delivered (slow start).
+    """
+    bytes_per_ms = down_kbps * 1000 / 8 / 1000
+    pending = [dict(r, state='undiscovered') for r in graph]
+    pending[0]['state'] = 'waiting'
+    connections = {}  # origin -> list of connection dicts
+    t = 0.0
+
+    while any(r['state'] != 'done' for r in pending):
+        # Hand waiting requests a connection
+        for r in pending:
+            if r['state'] != 'waiting':
+                continue
+            pool = connections.setdefault(r['origin'], [])
+            idle = next((c for c in pool if not c['busy']), None)
+            if idle is None and len(pool) < MAX_CONNECTIONS_PER_ORIGIN:
+                setup = (3 if not pool else 2) * rtt_ms  # DNS + TCP + TLS 1.3
+                idle = {'busy': False, 'cwnd': INITIAL_CWND, 'ready_at': t + setup}
+                pool.append(idle)
+            if idle is not None:
+                idle['busy'] = True
+                r['conn'] = idle
+                r['start'] = t
+                r['first_byte'] = max(t, idle['ready_at']) + rtt_ms
+                r['received'] = 0.0
+                r['state'] = 'requesting'
+
+        for r in pending:
+            if r['state'] == 'requesting' and t >= r['first_byte']:
+                r['state'] = 'transferring'
+
+        active = [r for r in pending if r['state'] == 'transferring']
+        for r in active:
+            share = bytes_per_ms * STEP_MS / len(active)
+            cap = r['conn']['cwnd'] / rtt_ms * STEP_MS
+            chunk = min(share, cap, r['bytes'] - r['received'])
+            r['received'] += chunk
+            r['conn']['cwnd'] += chunk
+        t += STEP_MS
+
+        for r in active:
+            if r['received'] >= r['bytes']:
+                r['state'] = 'done'
+                r['end'] = t
+                r['conn']['busy'] = False
+                for child in pending:
+                    if child['state'] == 'undiscovered' and child['parent'] == r['url']:
+                        child['state'] = 'waiting'
+
+    return [{key: r[key] for key in ('url', 'kind', 'blocking', 'bytes', 'estimated', 'start', 'first_byte', 'end')}
+            for r in pending]
+
+
+def metrics(timings):
+    """Summary numbers for one simulated load."""
+    document = timings[0]
+    render = [r['end'] for r in timings if r['blocking'] and r['kind'] != 'font']
+    return {
+        'ttfb_ms': round(document['first_byte']),
+        'first_render_ms': round(max(render)),
+        'load_ms': round(max(r['end'] for r in timings)),
+        'bytes': sum(r['bytes'] for r in timings),
+        'requests': len(timings),
+        'estimated_bytes': sum(r['bytes'] for r in timings if r['estimated']),
+    }
+
+
+# ---------------------------------------------------------------------------
+# History
+# ---------------------------------------------------------------------------
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path=HISTORY_FILE):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return []
+
+
+def save_history(history, path=HISTORY_FILE):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(history, f, indent=2)
+        f.write('\n')
+
+
+def run(directory, profiles, page='index.html'):
+    server, base_url = serve(directory)
+    try:
+        graph = resource_graph(base_url, page)
+    finally:
+        server.shutdown()
+        server.server_close()
+    results = {}
+    for name in profiles:
+        timings = simulate(graph, **PROFILES[name])
+        results[name] = dict(metrics(timings), resources=timings)
+    return graph, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Model page-load time of a build under throttled networks.')
+    default_dir = os.path.join(ROOT, 'dist') if os.path.isdir(os.path.join(ROOT, 'dist')) else ROOT
+    parser.add_argument('--dir', default=default_dir, help='directory to serve (default: dist/ if built)')
+    parser.add_argument('-p', '--profile', action='append', choices=sorted(PROFILES),
+                        help='network profile(s) to model (default: all)')
+    parser.add_argument('--history', default=HISTORY_FILE, help='JSON history file to append to')
+    parser.add_argument('--no-history', action='store_true', help='do not record this run')
+    parser.add_argument('--check', action='store_true',
+                        help=f'exit 1 if {TARGET_PROFILE} load time exceeds {TARGET_LOAD_MS} ms')
+    args = parser.parse_args(argv)
+
+    profiles = args.profile or list(PROFILES)
+    graph, results = run(args.dir, profiles)
+
+    for resource in graph:
+        note = ' (estimated)' if resource['estimated'] else ''
+        print(f"• {resource['kind']:<9} {resource['url']:<48} {resource['bytes']:>8,} B{note}")
+
+    history = load_history(args.history)
+    previous = history[-1]['profiles'] if history else {}
+    for name, result in results.items():
+        line = (f"📶 {name:<8} TTFB {result['ttfb_ms']:>5} ms · render {result['first_render_ms']:>5} ms"
+                f" · load {result['load_ms']:>5} ms · {result['bytes']:,} B in {result['requests']} requests")
+        if name in previous:
+            line += f" (Δ load {result['load_ms'] - previous[name]['load_ms']:+} ms)"
+        print(line)
+
+    if not args.no_history:
+        history.append({
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'commit': git_commit(),
+            'dir': os.path.relpath(os.path.abspath(args.dir), ROOT),
+            'profiles': {name: {k: v for k, v in result.items() if k != 'resources'}
+                         for name, result in results.items()},
+        })
+        save_history(history, args.history)
+
+    if TARGET_PROFILE in results:
+        load_ms = results[TARGET_PROFILE]['load_ms']
+        ok = load_ms <= TARGET_LOAD_MS
+        print(f"{'✅' if ok else '❌'} {TARGET_PROFILE} load {load_ms} ms vs. {TARGET_LOAD_MS} ms target")
+        if args.check and not ok:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,216 @@
+# Performance budget enforcement
+#
+# Checks the generated pages against budget.json: per-artifact size limits,
+# the total bytes and request count on each page's critical path, and which
+# third-party origins a page may touch.  build.py runs the check after every
+# build and exits non-zero with a per-asset breakdown when a budget is blown.
+#
+#   python budget.py          # check the artifacts in the repo root
+#   python budget.py dist     # check a release
+
+import gzip
+import json
+import os
+import sys
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+BUDGET_FILE = os.path.join(ROOT, 'budget.json')
+
+
+def gzip_size(data):
+    return len(gzip.compress(data, compresslevel=9, mtime=0))
+
+
+# ---------------------------------------------------------------------------
+# Resource graph
+# ---------------------------------------------------------------------------
+
+class _ResourceParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.resources = []
+        self.preconnects = []
+        self.in_head = False
+        self.in_noscript = False
+
+    def add(self, url, kind, blocking):
+        self.resources.append({'url': url, 'kind': kind, 'blocking': blocking})
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'noscript':
+            self.in_noscript = True
+        if self.in_noscript:
+            return
+        if tag == 'link':
+            rel = (attrs.get('rel') or '').lower().split()
+            href = attrs.get('href')
+            if not href:
+                return
+            if 'preconnect' in rel or 'dns-prefetch' in rel:
+                self.preconnects.append(href)
+            elif 'stylesheet' in rel:
+                self.add(href, 'style', attrs.get('media', 'all') not in ('print',))
+            elif 'preload' in rel or 'modulepreload' in rel:
+                kind = attrs.get('as', 'script')
+                # Fonts preloaded for the first paint are on the critical path;
+                # stylesheets preloaded with an onload swap are not
+                self.add(href, kind, kind == 'font')
+        elif tag == 'script' and attrs.get('src'):
+            deferred = 'async' in attrs or 'defer' in attrs or attrs.get('type') == 'module'
+            self.add(attrs['src'], 'script', not deferred)
+        elif tag in ('img', 'source') and attrs.get('src'):
+            self.add(attrs['src'], 'image', False)
+        elif tag == 'use' and attrs.get('href', '').partition('#')[0]:
+            self.add(attrs['href'].partition('#')[0], 'image', False)
+
+    def handle_endtag(self, tag):
+        if tag == 'noscript':
+            self.in_noscript = False
+
+
+def page_resources(html):
+    """Subresources a page requests, in document order, without duplicates.
+
+    Each entry is ``{'url', 'kind', 'blocking', 'origin'}`` where ``origin``
+    is the host for absolute URLs and None for same-origin ones.  Returns
+    ``(resources, preconnect_origins)``.
+    """
+    parser = _ResourceParser()
+    parser.feed(html)
+    parser.close()
+    seen = {}
+    for resource in parser.resources:
+        resource['origin'] = urlsplit(resource['url']).hostname
+        key = resource['url']
+        if key in seen:
+            seen[key]['blocking'] = seen[key]['blocking'] or resource['blocking']
+        else:
+            seen[key] = resource
+    preconnects = [urlsplit(url).hostname for url in parser.preconnects]
+    return list(seen.values()), preconnects
+
+
+def local_name(url):
+    """Site-relative file name for a same-origin URL."""
+    path = urlsplit(url).path
+    return path.lstrip('/').removeprefix('./')
+
+
+# ---------------------------------------------------------------------------
+# Budget check
+# ---------------------------------------------------------------------------
+
+def load(path=BUDGET_FILE):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _row(name, data, limits):
+    raw, gz = len(data), gzip_size(data)
+    failures = []
+    if 'max_bytes' in limits and raw > limits['max_bytes']:
+        failures.append(f"{raw:,} > {limits['max_bytes']:,} bytes")
+    if 'max_gzip_bytes' in limits and gz > limits['max_gzip_bytes']:
+        failures.append(f"{gz:,} > {limits['max_gzip_bytes']:,} gzip bytes")
+    return raw, gz, failures
+
+
+def check(site, budget, manifest=None):
+    """Check ``site`` ({name: bytes}) against ``budget``.
+
+    Artifact budgets are keyed by the generator's file name; ``manifest``
+    (asset-manifest.json of a release) maps those to fingerprinted names.
+    Returns ``(ok, lines)`` with a per-asset breakdown.
+    """
+    manifest = manifest or {}
+    lines = []
+    ok = True
+
+    for name, limits in budget.get('artifacts', {}).items():
+        final = manifest.get(name, name)
+        if final not in site:
+            continue
+        raw, gz, failures = _row(name, site[final], limits)
+        ok = ok and not failures
+        status = '❌ ' + '; '.join(failures) if failures else '✅'
+        lines.append(f"  {name:<24} {raw:>9,} B {gz:>8,} B gz  {status}")
+
+    page_limits = budget.get('pages', {})
+    allowed = set(budget.get('third_party_origins', []))
+    for page in sorted(name for name in site if name.endswith('.html')):
+        resources, preconnects = page_resources(site[page].decode('utf-8'))
+        critical = [{'url': page, 'kind': 'document', 'blocking': True, 'origin': None}]
+        critical += [r for r in resources if r['blocking']]
+
+        lines.append(f"  {page} critical path:")
+        total = 0
+        for resource in critical:
+            if resource['origin']:
+                size = 'unknown (third party)'
+            else:
+                data = site.get(local_name(resource['url']), b'')
+                gz = gzip_size(data)
+                total += gz
+                size = f"{gz:,} B gz"
+            lines.append(f"    {resource['kind']:<9} {resource['url']:<48} {size}")
+
+        requests = 1 + len(resources)
+        origins = sorted({r['origin'] for r in resources if r['origin']} | set(filter(None, preconnects)))
+        failures = []
+        if 'max_critical_gzip_bytes' in page_limits and total > page_limits['max_critical_gzip_bytes']:
+            failures.append(f"critical path {total:,} > {page_limits['max_critical_gzip_bytes']:,} gzip bytes")
+        if 'max_requests' in page_limits and requests > page_limits['max_requests']:
+            failures.append(f"{requests} requests > {page_limits['max_requests']}")
+        unexpected = [origin for origin in origins if origin not in allowed]
+        if unexpected:
+            failures.append(f"third-party origins not in budget: {', '.join(unexpected)}")
+        if 'max_third_party_origins' in page_limits and len(origins) > page_limits['max_third_party_origins']:
+            failures.append(f"{len(origins)} third-party origins > {page_limits['max_third_party_origins']}")
+
+        ok = ok and not failures
+        lines.append(f"    total {total:,} B gz · {requests} request(s) · "
+                     f"{len(origins)} third-party origin(s){': ' + ', '.join(origins) if origins else ''}")
+        for failure in failures:
+            lines.append(f"    ❌ {failure}")
+    return ok, lines
+
+
+def check_dir(directory, budget=None):
+    """Check the pages and artifacts in ``directory`` (repo root or dist/)."""
+    budget = budget or load()
+    site = {}
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if os.path.isfile(path) and name.endswith(('.html', '.css', '.js', '.svg', '.woff2', '.woff')):
+            with open(path, 'rb') as f:
+                site[name] = f.read()
+    fonts_dir = os.path.join(directory, 'fonts')
+    if os.path.isdir(fonts_dir):
+        for name in os.listdir(fonts_dir):
+            with open(os.path.join(fonts_dir, name), 'rb') as f:
+                site['fonts/' + name] = f.read()
+    manifest = {}
+    manifest_path = os.path.join(directory, 'asset-manifest.json')
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+    # Only the generated pages are budgeted, not the hand-written variants
+    pages = set(budget.get('artifacts', {}))
+    site = {name: data for name, data in site.items() if not name.endswith('.html') or name in pages}
+    return check(site, budget, manifest)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    directory = argv[0] if argv else ROOT
+    ok, lines = check_dir(directory)
+    print('\n'.join(lines))
+    print("✅ Within performance budget" if ok else "❌ Performance budget exceeded")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,372 @@
+# Build driver for the career journaling site
+#
+# Runs the generator scripts (script.py, script_1.py, ...) as a dependency
+# graph, records a content hash for every file they produce and only rewrites
+# the artifacts whose bytes actually changed.  Unchanged files keep their
+# mtime, so the static host and CDN see no change for them.
+#
+#   python build.py            # incremental build into the repo root
+#   python build.py --force    # re-run every generator
+#   python build.py --out DIR  # write artifacts somewhere else
+#   python build.py -j 0 -v    # run generators in parallel, print banners
+#   python build.py --release  # also assemble the deployable site in dist/
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import runpy
+import sys
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from graphlib import TopologicalSorter
+
+import budget
+import critical_css
+import fingerprint
+import fonts
+import minify
+import precache
+import purge_css
+import sprite
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DIST_DIR = os.path.join(ROOT, 'dist')
+CACHE_FILE = '.build-cache.json'
+FILE_MODE = 0o644
+
+# Generator script -> generator scripts whose outputs it reads
+GENERATORS = {
+    'script.py': [],      # index.html
+    'script_1.py': [],    # styles.css
+    'script_2.py': [],    # script.js, profile.js, success.js, social.js
+    'script_3.py': [],    # supabase_schema.sql
+    'script_4.py': [],    # README.md
+    'script_5.py': ['script.py', 'script_1.py', 'script_2.py'],  # sw.js
+}
+
+# Generator script -> repo modules it imports, part of its cached source
+GENERATOR_MODULES = {
+    'script_5.py': ['precache.py', 'fingerprint.py'],
+}
+
+# Generated files that make up the deployable site
+WEB_ARTIFACTS = ('index.html', 'styles.css', 'script.js', 'profile.js', 'success.js', 'social.js', 'sw.js')
+
+# Transformations applied, in order, to the site for a release build.  Each
+# stage takes the site ({path: bytes}) and a list to append log lines to and
+# returns the new site.
+RELEASE_STAGES = [
+    purge_css.purge_unused_css,
+    fonts.self_host_fonts,
+    sprite.sprite_icons,
+    critical_css.inline_critical_css,
+    minify.minify_assets,
+    fingerprint.fingerprint_assets,
+    precache.precache_assets,
+    minify.precompress_assets,
+]
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def read_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def build_order(generators=GENERATORS):
+    """Return the generator scripts in dependency order."""
+    return list(TopologicalSorter(generators).static_order())
+
+
+def run_generator(script, inputs=None):
+    """Run one generator script in a scratch directory.
+
+    ``inputs`` maps relative paths to bytes that are materialized next to the
+    script before it runs (the outputs of its dependencies).  Returns a dict
+    with the files the script wrote, its captured stdout banner and the wall
+    time it took.
+    """
+    inputs = inputs or {}
+    script_path = os.path.join(ROOT, script)
+    cwd = os.getcwd()
+    banner = io.StringIO()
+    with tempfile.TemporaryDirectory(prefix='build-') as scratch:
+        for name, data in inputs.items():
+            path = os.path.join(scratch, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(data)
+
+        started = time.perf_counter()
+        os.chdir(scratch)
+        try:
+            with contextlib.redirect_stdout(banner):
+                runpy.run_path(script_path, run_name='__main__')
+        finally:
+            os.chdir(cwd)
+        seconds = time.perf_counter() - started
+
+        outputs = {}
+        for dirpath, _, filenames in os.walk(scratch):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                name = os.path.relpath(path, scratch).replace(os.sep, '/')
+                data = read_bytes(path)
+                if inputs.get(name) != data:
+                    outputs[name] = data
+
+    return {'outputs': outputs, 'banner': banner.getvalue(), 'seconds': seconds}
+
+
+def write_atomic(path, data):
+    """Write ``data`` to ``path`` via a temp file and rename."""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path) + '.')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp, FILE_MODE)
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp)
+        raise
+
+
+def write_if_changed(out_dir, name, data):
+    """Write one artifact unless the file on disk already has these bytes."""
+    path = os.path.join(out_dir, name)
+    if os.path.exists(path) and sha256(read_bytes(path)) == sha256(data):
+        return False
+    write_atomic(path, data)
+    return True
+
+
+def load_cache(out_dir):
+    try:
+        with open(os.path.join(out_dir, CACHE_FILE), encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_cache(out_dir, cache):
+    data = json.dumps(cache, indent=2, sort_keys=True).encode('utf-8')
+    write_if_changed(out_dir, CACHE_FILE, data)
+
+
+def inputs_for(script, results, generators=GENERATORS):
+    """Collect the outputs of ``script``'s dependencies."""
+    inputs = {}
+    for dep in generators[script]:
+        inputs.update(results[dep]['outputs'])
+    return inputs
+
+
+def cached_result(script, inputs, cache, out_dir):
+    """Reuse the last run of ``script`` if nothing it depends on changed.
+
+    The generator is skipped only when its source, its inputs and every file
+    it produced last time are byte-for-byte what the cache recorded.
+    """
+    entry = cache.get(script)
+    if not entry:
+        return None
+    if entry['source'] != source_digest(script):
+        return None
+    if entry['inputs'] != digest_files(inputs):
+        return None
+
+    outputs = {}
+    for name, digest in entry['outputs'].items():
+        path = os.path.join(out_dir, name)
+        if not os.path.exists(path):
+            return None
+        data = read_bytes(path)
+        if sha256(data) != digest:
+            return None
+        outputs[name] = data
+    return {'outputs': outputs, 'banner': entry.get('banner', ''), 'seconds': 0.0}
+
+
+def source_digest(script):
+    digest = hashlib.sha256()
+    for name in [script] + GENERATOR_MODULES.get(script, []):
+        digest.update(read_bytes(os.path.join(ROOT, name)))
+    return digest.hexdigest()
+
+
+def digest_files(files):
+    return {name: sha256(data) for name, data in sorted(files.items())}
+
+
+def record(cache, script, inputs, result):
+    cache[script] = {
+        'source': source_digest(script),
+        'inputs': digest_files(inputs),
+        'outputs': digest_files(result['outputs']),
+        'banner': result['banner'],
+    }
+
+
+def build(out_dir=ROOT, force=False, jobs=1):
+    """Run every generator in dependency order and write changed artifacts.
+
+    With ``jobs`` > 1 (or 0 for one worker per CPU) generators whose
+    dependencies are done run concurrently in a process pool.  Returns
+    ``(results, written)`` where ``results`` maps each script to its run
+    result (``cached`` is True when the generator was skipped, ``written``
+    maps the files it rewrote to their size) and ``written`` lists every
+    artifact path that was rewritten.
+    """
+    cache = {} if force else load_cache(out_dir)
+    results = {}
+    written = []
+
+    def finish(script, inputs, result, cached):
+        result['cached'] = cached
+        result['written'] = {}
+        if not cached:
+            record(cache, script, inputs, result)
+        for name, data in sorted(result['outputs'].items()):
+            if write_if_changed(out_dir, name, data):
+                result['written'][name] = len(data)
+                written.append(name)
+        results[script] = result
+        sorter.done(script)
+
+    sorter = TopologicalSorter(GENERATORS)
+    sorter.prepare()
+    pool = None if jobs == 1 else ProcessPoolExecutor(max_workers=jobs or None)
+    pending = {}
+    try:
+        while sorter.is_active():
+            for script in sorter.get_ready():
+                inputs = inputs_for(script, results)
+                result = cached_result(script, inputs, cache, out_dir)
+                if result is not None:
+                    finish(script, inputs, result, cached=True)
+                elif pool is None:
+                    finish(script, inputs, run_generator(script, inputs), cached=False)
+                else:
+                    pending[pool.submit(run_generator, script, inputs)] = (script, inputs)
+            if pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    script, inputs = pending.pop(future)
+                    finish(script, inputs, future.result(), cached=False)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    save_cache(out_dir, cache)
+    # Report in declaration order, not completion order
+    results = {script: results[script] for script in GENERATORS}
+    return results, written
+
+
+def web_artifacts(results):
+    """The deployable files among the generator outputs."""
+    site = {}
+    for result in results.values():
+        for name, data in result['outputs'].items():
+            if name in WEB_ARTIFACTS:
+                site[name] = data
+    return site
+
+
+def release(results, dist_dir=DIST_DIR):
+    """Assemble the deployable site from the generator outputs.
+
+    Runs the web artifacts through ``RELEASE_STAGES``, writes the files whose
+    bytes changed into ``dist_dir`` and removes files left over from the
+    previous release (e.g. assets with an old fingerprint).  Returns
+    ``(site, written, removed, log)``.
+    """
+    site = web_artifacts(results)
+    raw = dict(site)
+    log = []
+    for stage in RELEASE_STAGES:
+        site = stage(site, log)
+
+    written = [name for name, data in sorted(site.items()) if write_if_changed(dist_dir, name, data)]
+
+    previous = load_cache(dist_dir)
+    sizes, lines = minify.size_report(raw, site, previous.get('sizes'))
+    log.extend(lines)
+
+    removed = []
+    for name in previous.get('files', []):
+        path = os.path.join(dist_dir, name)
+        if name not in site and os.path.exists(path):
+            os.remove(path)
+            removed.append(name)
+    save_cache(dist_dir, {'files': sorted(site), 'sizes': sizes})
+    return site, written, removed, log
+
+
+def summary(results, banners=False):
+    """Format per-generator timings, bytes written and (optionally) banners."""
+    lines = []
+    for script, result in results.items():
+        status = 'cached' if result['cached'] else f"{result['seconds'] * 1000:.1f} ms"
+        size = sum(result['written'].values())
+        lines.append(f"• {script}: {', '.join(sorted(result['outputs']))} ({status}, {size:,} bytes written)")
+    if banners:
+        for script, result in results.items():
+            if result['banner'].strip():
+                lines.append('')
+                lines.append(f"── {script} ──")
+                lines.append(result['banner'].rstrip())
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build the career journaling site artifacts.')
+    parser.add_argument('--out', default=ROOT, help='output directory (default: repo root)')
+    parser.add_argument('--force', action='store_true', help='ignore the build cache and re-run every generator')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='run generators in a process pool of this size (0 = one per CPU)')
+    parser.add_argument('--release', action='store_true', help='assemble the deployable site in --dist')
+    parser.add_argument('--dist', default=DIST_DIR, help='release output directory (default: dist/)')
+    parser.add_argument('--no-budget', action='store_true', help='skip the budget.json performance budget check')
+    parser.add_argument('-v', '--verbose', action='store_true', help="include each generator's banner in the summary")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    results, written = build(args.out, force=args.force, jobs=args.jobs)
+    elapsed = time.perf_counter() - started
+
+    print(summary(results, banners=args.verbose))
+    if written:
+        print(f"✅ Wrote {len(written)} changed file(s) in {elapsed * 1000:.0f} ms: {', '.join(written)}")
+    else:
+        print(f"✅ Everything up to date, nothing written ({elapsed * 1000:.0f} ms)")
+
+    site, manifest = web_artifacts(results), {}
+    if args.release:
+        site, written, removed, log = release(results, args.dist)
+        print('\n'.join(log))
+        print(f"🚀 Release in {args.dist}: {len(site)} file(s), {len(written)} written, {len(removed)} removed")
+        manifest = json.loads(site.get(fingerprint.MANIFEST, b'{}'))
+
+    if not args.no_budget:
+        ok, lines = budget.check(site, budget.load(), manifest)
+        if not ok:
+            print('\n'.join(lines))
+            print("❌ Performance budget exceeded (see budget.json)")
+            return 1
+        print("✅ Within performance budget")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,92 @@
+# Critical-CSS extraction for the release build
+#
+# For every page, works out which rules style what is visible on first paint
+# (elements outside `hidden` / inline `display: none` subtrees, i.e. the
+# signup step), inlines them into <head> and turns the stylesheet <link> into
+# a non-blocking preload.  The full stylesheet is still loaded afterwards so
+# the cascade order of the later steps is unchanged.
+
+import re
+
+import cssparse
+
+# Media queries that never affect first paint on a normal screen
+DEFERRED_MEDIA = ('print', 'prefers-contrast')
+
+STYLESHEET_LINK_RE = re.compile(
+    r'[ \t]*<link\s+rel=["\']stylesheet["\']\s+href=["\']([^"\']+)["\']\s*/?>\n?')
+ANIMATION_RE = re.compile(r'animation(?:-name)?\s*:\s*([^;]+)')
+
+
+def _animation_names(nodes):
+    names = set()
+    for rule in cssparse.walk_rules(nodes):
+        for value in ANIMATION_RE.findall(rule['body']):
+            names.update(value.replace(',', ' ').split())
+    return names
+
+
+def critical_nodes(nodes, usage):
+    """Keep the rules whose selectors match ``usage``.
+
+    Nesting at-rules are kept when anything inside them is, except for media
+    queries in ``DEFERRED_MEDIA``; @font-face and @keyframes used by a
+    critical rule are kept whole.
+    """
+    kept = []
+    for node in nodes:
+        if 'selector' in node:
+            selectors = [s for s in cssparse.split_selectors(node['selector'])
+                         if cssparse.selector_used(s, usage)]
+            if selectors:
+                kept.append({'selector': ', '.join(selectors), 'body': node['body']})
+        elif 'children' in node:
+            if node['at'].startswith('@media') and any(m in node['at'] for m in DEFERRED_MEDIA):
+                continue
+            children = critical_nodes(node['children'], usage)
+            if children:
+                kept.append({'at': node['at'], 'children': children})
+        elif node['at'].startswith('@font-face'):
+            kept.append(node)
+
+    animations = _animation_names(kept)
+    for node in nodes:
+        if node.get('at', '').startswith('@keyframes') and node['at'].split()[-1] in animations:
+            kept.append(node)
+    return kept
+
+
+def async_stylesheet(href, indent):
+    return (f'{indent}<link rel="preload" href="{href}" as="style" '
+            f'onload="this.onload=null;this.rel=\'stylesheet\'">\n'
+            f'{indent}<noscript><link rel="stylesheet" href="{href}"></noscript>\n')
+
+
+def inline_critical_css(site, log):
+    """Inline above-the-fold CSS into every page and defer its stylesheets."""
+    site = dict(site)
+    for page in [name for name in site if name.endswith('.html')]:
+        html = site[page].decode('utf-8')
+        usage = cssparse.html_usage(html, visible_only=True)
+
+        links = [m for m in STYLESHEET_LINK_RE.finditer(html) if m.group(1) in site]
+        if not links:
+            continue
+
+        critical = []
+        for match in links:
+            nodes = cssparse.parse(site[match.group(1)].decode('utf-8'))
+            critical.append(cssparse.serialize(critical_nodes(nodes, usage)))
+        css = '\n'.join(critical)
+
+        first = links[0]
+        indent = re.match(r'[ \t]*', first.group(0)).group(0)
+        replacement = f'{indent}<style>\n{css}\n{indent}</style>\n'
+        for match in links:
+            replacement += async_stylesheet(match.group(1), indent)
+
+        html = html[:first.start()] + replacement + STYLESHEET_LINK_RE.sub(
+            lambda m: '' if m.group(1) in site else m.group(0), html[first.start():])
+        site[page] = html.encode('utf-8')
+        log.append(f"🎯 {page}: inlined {len(css.encode('utf-8')):,} bytes of critical CSS")
+    return site
@@ -0,0 +1,213 @@
+# Minimal CSS and HTML inspection helpers shared by the release stages
+#
+# Just enough of a parser for the stylesheets our generators emit: comments,
+# style rules, block at-rules (@media/@supports, which nest rules, and
+# @keyframes/@font-face, which are kept verbatim) and statement at-rules.
+#
+# Nodes are plain dicts:
+#   {'selector': '.a, .b', 'body': 'color: red; margin: 0'}
+#   {'at': '@media (max-width: 640px)', 'children': [...]}
+#   {'at': '@keyframes spin', 'body': 'to { transform: rotate(360deg); }'}
+#   {'at': '@import url(x.css)'}
+
+import re
+from html.parser import HTMLParser
+
+NESTING_AT_RULES = ('@media', '@supports', '@container', '@layer', '@document')
+VOID_ELEMENTS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+                 'link', 'meta', 'source', 'track', 'wbr'}
+
+COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+
+
+def strip_comments(css):
+    return COMMENT_RE.sub('', css)
+
+
+def _block_end(css, start):
+    """Index of the '}' closing the block whose '{' is at ``start - 1``."""
+    depth = 1
+    quote = None
+    i = start
+    while i < len(css):
+        ch = css[i]
+        if quote:
+            if ch == '\\':
+                i += 1
+            elif ch == quote:
+                quote = None
+        elif ch in '"\'':
+            quote = ch
+        elif ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    raise ValueError('unbalanced braces in stylesheet')
+
+
+def _parse(css):
+    nodes = []
+    i = 0
+    while i < len(css):
+        if css[i].isspace() or css[i] == ';':
+            i += 1
+            continue
+        brace = css.find('{', i)
+        if css[i] == '@':
+            semi = css.find(';', i)
+            if semi != -1 and (brace == -1 or semi < brace):
+                nodes.append({'at': css[i:semi].strip()})
+                i = semi + 1
+                continue
+        if brace == -1:
+            break
+        prelude = ' '.join(css[i:brace].split())
+        end = _block_end(css, brace + 1)
+        body = css[brace + 1:end]
+        if prelude.startswith(NESTING_AT_RULES):
+            nodes.append({'at': prelude, 'children': _parse(body)})
+        elif prelude.startswith('@'):
+            nodes.append({'at': prelude, 'body': body.strip()})
+        else:
+            nodes.append({'selector': prelude, 'body': body.strip()})
+        i = end + 1
+    return nodes
+
+
+def parse(css):
+    """Parse a stylesheet into a list of nodes."""
+    return _parse(strip_comments(css))
+
+
+def _compact_body(body):
+    if '{' in body:
+        return ' '.join(body.split())
+    return ';'.join(' '.join(d.split()) for d in body.split(';') if d.strip())
+
+
+def serialize(nodes):
+    """Serialize nodes back to CSS, one rule per line."""
+    out = []
+    for node in nodes:
+        if 'selector' in node:
+            out.append(f"{node['selector']}{{{_compact_body(node['body'])}}}")
+        elif 'children' in node:
+            inner = serialize(node['children'])
+            if inner:
+                out.append(f"{node['at']}{{\n{inner}\n}}")
+        elif 'body' in node:
+            out.append(f"{node['at']}{{{_compact_body(node['body'])}}}")
+        else:
+            out.append(f"{node['at']};")
+    return '\n'.join(out)
+
+
+def walk_rules(nodes):
+    """Yield every style rule, descending into nesting at-rules."""
+    for node in nodes:
+        if 'selector' in node:
+            yield node
+        elif 'children' in node:
+            yield from walk_rules(node['children'])
+
+
+def split_selectors(selector):
+    """Split a selector list on top-level commas."""
+    parts, depth, current = [], 0, ''
+    for ch in selector:
+        if ch in '([':
+            depth += 1
+        elif ch in ')]':
+            depth -= 1
+        if ch == ',' and depth == 0:
+            parts.append(current.strip())
+            current = ''
+        else:
+            current += ch
+    if current.strip():
+        parts.append(current.strip())
+    return parts
+
+
+PSEUDO_RE = re.compile(r'::?[\w-]+(\((?:[^()]|\([^()]*\))*\))?')
+ATTRIBUTE_RE = re.compile(r'\[[^\]]*\]')
+CLASS_RE = re.compile(r'\.(-?[_a-zA-Z][\w-]*)')
+ID_RE = re.compile(r'#(-?[_a-zA-Z][\w-]*)')
+TAG_RE = re.compile(r'(?:^|[\s>+~])([a-zA-Z][\w-]*)')
+
+
+def selector_tokens(selector):
+    """Return ``(tags, classes, ids)`` a single complex selector requires.
+
+    Pseudo-classes (including the contents of :not()), pseudo-elements and
+    attribute selectors are ignored, so the answer errs towards "needed".
+    """
+    bare = ATTRIBUTE_RE.sub('', PSEUDO_RE.sub('', selector))
+    tags = {tag.lower() for tag in TAG_RE.findall(bare)}
+    return tags, set(CLASS_RE.findall(bare)), set(ID_RE.findall(bare))
+
+
+def selector_used(selector, usage):
+    """True if every tag, class and id ``selector`` needs appears in ``usage``."""
+    tags, classes, ids = selector_tokens(selector)
+    return (tags <= usage['tags'] and classes <= usage['classes'] and ids <= usage['ids'])
+
+
+def empty_usage():
+    return {'tags': set(), 'classes': set(), 'ids': set()}
+
+
+def merge_usage(usage, other):
+    for key in usage:
+        usage[key] |= other[key]
+    return usage
+
+
+class _UsageParser(HTMLParser):
+    def __init__(self, visible_only):
+        super().__init__(convert_charrefs=True)
+        self.visible_only = visible_only
+        self.usage = empty_usage()
+        self.hidden_stack = []
+
+    def _hidden(self, attrs):
+        style = (attrs.get('style') or '').replace(' ', '').lower()
+        return 'hidden' in attrs or 'display:none' in style
+
+    def _record(self, tag, attrs):
+        hidden = bool(self.hidden_stack and self.hidden_stack[-1])
+        if self.visible_only and (hidden or self._hidden(attrs)):
+            return hidden or self._hidden(attrs)
+        self.usage['tags'].add(tag)
+        self.usage['classes'].update((attrs.get('class') or '').split())
+        if attrs.get('id'):
+            self.usage['ids'].add(attrs['id'])
+        return hidden or self._hidden(attrs)
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        hidden = self._record(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self.hidden_stack.append(hidden)
+
+    def handle_startendtag(self, tag, attrs):
+        self._record(tag, dict(attrs))
+
+    def handle_endtag(self, tag):
+        if tag not in VOID_ELEMENTS and self.hidden_stack:
+            self.hidden_stack.pop()
+
+
+def html_usage(html, visible_only=False):
+    """Collect the tags, classes and ids used in an HTML document.
+
+    With ``visible_only`` elements inside a ``hidden`` or inline
+    ``display: none`` subtree are skipped, leaving what paints first.
+    """
+    parser = _UsageParser(visible_only)
+    parser.feed(html)
+    parser.close()
+    return parser.usage
@@ -0,0 +1,126 @@
+# Local analytics ingestion endpoint
+#
+# Serves a build (dist/ by default, else the repo root) and accepts the
+# event batches script.js sends to /api/events, gzipped (?encoding=gzip)
+# or as plain JSON.  Every batch is validated and its events are appended
+# to a JSON Lines file, one event per line with the batch context merged
+# in, the way the production collector would store them.
+#
+#   python events_server.py                     # http://127.0.0.1:8787
+#   python events_server.py --dir . --out /tmp/events.jsonl
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+ENDPOINT = '/api/events'
+EVENTS_FILE = os.path.join(ROOT, 'events.jsonl')
+DEFAULT_PORT = 8787
+MAX_BODY_BYTES = 1 << 20
+BATCH_VERSION = 1
+
+
+def parse_batch(body, encoding=None):
+    """Decode and validate one batch; returns the list of event records.
+
+    Raises ValueError for anything script.js would not have sent.
+    """
+    if encoding == 'gzip':
+        try:
+            body = gzip.decompress(body)
+        except (OSError, EOFError) as exc:
+            raise ValueError(f"bad gzip body: {exc}") from None
+    elif encoding is not None:
+        raise ValueError(f"unsupported encoding {encoding!r}")
+    try:
+        batch = json.loads(body)
+    except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise ValueError(f"bad JSON: {exc}") from None
+
+    if not isinstance(batch, dict) or batch.get('v') != BATCH_VERSION:
+        raise ValueError(f"expected a version {BATCH_VERSION} batch object")
+    events = batch.pop('events', None)
+    started_at = batch.get('startedAt')
+    if not isinstance(events, list) or not isinstance(started_at, int):
+        raise ValueError("batch needs 'events' and 'startedAt'")
+
+    records = []
+    for event in events:
+        if not (isinstance(event, list) and len(event) == 3 and isinstance(event[0], str)
+                and isinstance(event[1], int) and isinstance(event[2], dict)):
+            raise ValueError(f"bad event {event!r}: expected [name, offset_ms, properties]")
+        name, offset_ms, properties = event
+        # The validated name and computed timestamp win over same-named properties
+        records.append({**batch, **properties, 'event': name, 'timestamp_ms': started_at + offset_ms})
+    return records
+
+
+class _Handler(SimpleHTTPRequestHandler):
+    """Static files plus the event endpoint."""
+
+    events_file = EVENTS_FILE
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != ENDPOINT:
+            self.send_error(404)
+            return
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_BODY_BYTES:
+            self.send_error(413)
+            return
+        body = self.rfile.read(length)
+        encoding = parse_qs(url.query).get('encoding', [None])[0]
+        try:
+            records = parse_batch(body, encoding)
+        except ValueError as exc:
+            print(f"❌ Rejected batch ({len(body):,} B): {exc}")
+            self.send_error(400, str(exc))
+            return
+
+        received_at = time.strftime('%Y-%m-%dT%H:%M:%S%z')
+        with self.lock, open(self.events_file, 'a', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps({**record, 'received_at': received_at}) + '\n')
+        names = ', '.join(record['event'] for record in records)
+        print(f"📨 {len(records)} event(s) in {len(body):,} B{' gzip' if encoding else ''}: {names}")
+        self.send_response(204)
+        self.end_headers()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve a build with a local analytics ingestion endpoint.')
+    default_dir = os.path.join(ROOT, 'dist') if os.path.isdir(os.path.join(ROOT, 'dist')) else ROOT
+    parser.add_argument('--dir', default=default_dir, help='directory to serve (default: dist/ if built)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'port (default: {DEFAULT_PORT})')
+    parser.add_argument('--out', default=EVENTS_FILE, help='JSON Lines file to append events to')
+    args = parser.parse_args(argv)
+
+    def handler(*handler_args, **kwargs):
+        return _Handler(*handler_args, directory=args.dir, **kwargs)
+    _Handler.events_file = args.out
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), handler)
+    print(f"✅ Serving {os.path.relpath(args.dir, ROOT)} on http://127.0.0.1:{args.port}, "
+          f"events from {ENDPOINT} → {args.out}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,100 @@
+# Content-hash fingerprinting for the release build
+#
+# Renames every static asset to <stem>.<hash><ext>, rewrites the references
+# to it in the files that load it and writes an asset manifest, so the host
+# can serve assets with `Cache-Control: immutable` and only the HTML is ever
+# revalidated.
+
+import hashlib
+import json
+import os
+import re
+from graphlib import CycleError, TopologicalSorter
+
+HASH_LENGTH = 10
+MANIFEST = 'asset-manifest.json'
+HEADERS = '_headers'
+SERVICE_WORKER = 'sw.js'
+
+# Files that reference other assets and may need their references rewritten
+TEXT_EXTENSIONS = ('.html', '.css', '.js', '.json', '.svg')
+# Files that must keep a stable URL (a service worker is identified by its URL)
+UNHASHED_EXTENSIONS = ('.html', '.json')
+UNHASHED_FILES = (MANIFEST, HEADERS, SERVICE_WORKER)
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'public, max-age=0, must-revalidate'
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def hashed_name(name, data):
+    """styles.css -> styles.<hash>.css"""
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{content_hash(data)}{ext}"
+
+
+def is_hashable(name):
+    return name not in UNHASHED_FILES and not name.endswith(UNHASHED_EXTENSIONS)
+
+
+def reference_pattern(name):
+    """Match ``name`` used as a URL: quoted, inside url(), or after a slash."""
+    return re.compile(r'(?<=["\'(/])' + re.escape(name) + r'(?=["\')?#])')
+
+
+def references(site, name):
+    """Assets referenced from the text file ``name``."""
+    if not name.endswith(TEXT_EXTENSIONS):
+        return set()
+    text = site[name].decode('utf-8')
+    return {other for other in site
+            if other != name and is_hashable(other) and reference_pattern(other).search(text)}
+
+
+def rewrite_references(data, renames):
+    text = data.decode('utf-8')
+    for old, new in renames.items():
+        text = reference_pattern(old).sub(new, text)
+    return text.encode('utf-8')
+
+
+def cache_headers(manifest):
+    """Netlify-style _headers: immutable hashed assets, revalidated HTML and service worker."""
+    lines = []
+    for name in sorted(manifest.values()):
+        lines += [f"/{name}", f"  Cache-Control: {IMMUTABLE}"]
+    lines += ["/*.html", f"  Cache-Control: {REVALIDATE}", "/", f"  Cache-Control: {REVALIDATE}",
+              f"/{SERVICE_WORKER}", f"  Cache-Control: {REVALIDATE}"]
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def fingerprint_assets(site, log):
+    """Fingerprint every hashable asset in ``site`` and rewrite references.
+
+    Assets are hashed after the assets they reference, so a hash always
+    covers the final URLs inside the file (a CSS file changes hash when a
+    font it loads does).
+    """
+    graph = {name: references(site, name) for name in site}
+    try:
+        order = list(TopologicalSorter(graph).static_order())
+    except CycleError as exc:
+        raise ValueError(f"assets reference each other in a cycle: {exc.args[1]}") from None
+
+    renames = {}
+    output = {}
+    for name in order:
+        data = site[name]
+        if name.endswith(TEXT_EXTENSIONS):
+            data = rewrite_references(data, {dep: renames[dep] for dep in graph[name]})
+        if is_hashable(name):
+            renames[name] = hashed_name(name, data)
+            log.append(f"🔖 {name} → {renames[name]}")
+        output[renames.get(name, name)] = data
+
+    output[MANIFEST] = (json.dumps(renames, indent=2, sort_keys=True) + '\n').encode('utf-8')
+    output[HEADERS] = cache_headers(renames)
+    return output
@@ -0,0 +1,176 @@
+# Self-hosted, subsetted Inter for the release build
+#
+# Replaces the Google Fonts <link>/<preconnect> tags with @font-face rules
+# pointing at WOFF2 subsets of a vendored copy of Inter, cut down to the
+# characters the pages and scripts can actually display, and preloads them.
+# Runs fully offline.
+#
+# The sources are vendored in fonts/ (not generated) under the SIL Open Font
+# License, fonts/OFL.txt: Inter 3.019's variable font, or alternatively the
+# three static weights:
+#
+#   fonts/InterVariable.ttf
+#   fonts/Inter-Regular.ttf  fonts/Inter-Medium.ttf  fonts/Inter-SemiBold.ttf
+#
+# The variable font is pinned to upright and cut to the weight range the
+# pages use before subsetting.
+#
+# Requires `pip install fonttools brotli` for the release build: fontTools
+# subsets, brotli encodes WOFF2.  Without brotli the stage writes larger WOFF
+# files and warns; without fontTools (or the font files) it warns and leaves
+# the Google Fonts tags in place.
+
+import io
+import os
+import re
+from html.parser import HTMLParser
+
+try:
+    from fontTools import subset
+    from fontTools.varLib import instancer
+except ImportError:  # optional dependency
+    subset = None
+
+try:
+    import brotli  # noqa: F401  (needed by fontTools for WOFF2)
+    FLAVOR = 'woff2'
+except ImportError:
+    FLAVOR = 'woff'
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+FONT_DIR = os.path.join(ROOT, 'fonts')
+FAMILY = 'Inter'
+VARIABLE_SOURCE = 'InterVariable.ttf'
+STATIC_SOURCES = {400: 'Inter-Regular.ttf', 500: 'Inter-Medium.ttf', 600: 'Inter-SemiBold.ttf'}
+# Variable font axes kept: upright only, the weights the stylesheet uses
+VARIABLE_AXES = {'wght': (min(STATIC_SOURCES), max(STATIC_SOURCES)), 'slnt': 0}
+
+# Always keep printable ASCII: the form inputs inherit the font and users type
+# arbitrary names and e-mail addresses into them.
+BASE_CHARACTERS = {chr(c) for c in range(0x20, 0x7f)}
+
+GOOGLE_FONTS_RE = re.compile(
+    r'[ \t]*<link\b[^>]*https://fonts\.(?:googleapis|gstatic)\.com[^>]*>\n?')
+JS_STRING_RE = re.compile(r'''(['"`])((?:\\.|(?!\1).)*)\1''', re.S)
+VISIBLE_ATTRIBUTES = ('placeholder', 'value', 'title', 'alt', 'aria-label')
+
+
+class _TextParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.text = []
+        self.skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ('script', 'style'):
+            self.skip += 1
+        for name, value in attrs:
+            if name in VISIBLE_ATTRIBUTES and value:
+                self.text.append(value)
+
+    def handle_endtag(self, tag):
+        if tag in ('script', 'style') and self.skip:
+            self.skip -= 1
+
+    def handle_data(self, data):
+        if not self.skip:
+            self.text.append(data)
+
+
+def used_characters(site):
+    """Every character the pages render or the scripts may insert."""
+    chars = set(BASE_CHARACTERS)
+    for name, data in site.items():
+        if name.endswith('.html'):
+            parser = _TextParser()
+            parser.feed(data.decode('utf-8'))
+            chars.update(''.join(parser.text))
+        elif name.endswith('.js'):
+            for _, value in JS_STRING_RE.findall(data.decode('utf-8')):
+                chars.update(value)
+    return {c for c in chars if not c.isspace() or c == ' '}
+
+
+def vendored_sources(font_dir=FONT_DIR):
+    """Map output weight label -> (source path, CSS font-weight)."""
+    variable = os.path.join(font_dir, VARIABLE_SOURCE)
+    if os.path.exists(variable):
+        return {'var': (variable, f"{min(STATIC_SOURCES)} {max(STATIC_SOURCES)}")}
+    sources = {}
+    for weight, filename in STATIC_SOURCES.items():
+        path = os.path.join(font_dir, filename)
+        if os.path.exists(path):
+            sources[str(weight)] = (path, str(weight))
+    return sources
+
+
+def subset_font(path, characters):
+    options = subset.Options()
+    options.flavor = FLAVOR
+    options.layout_features = ['kern', 'liga', 'calt', 'tnum']
+    options.name_IDs = [1, 2]
+    options.notdef_outline = True
+    font = subset.load_font(path, options)
+    if 'fvar' in font:
+        axes = {axis.axisTag for axis in font['fvar'].axes}
+        font = instancer.instantiateVariableFont(
+            font, {tag: limit for tag, limit in VARIABLE_AXES.items() if tag in axes})
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=sorted(ord(c) for c in characters))
+    subsetter.subset(font)
+    out = io.BytesIO()
+    subset.save_font(font, out, options)
+    return out.getvalue()
+
+
+def font_face(url, weight):
+    return (f"@font-face {{\n"
+            f"  font-family: '{FAMILY}';\n"
+            f"  font-style: normal;\n"
+            f"  font-weight: {weight};\n"
+            f"  font-display: swap;\n"
+            f"  src: url('{url}') format('{FLAVOR}');\n"
+            f"}}\n")
+
+
+def preload_link(url, indent):
+    return f'{indent}<link rel="preload" href="{url}" as="font" type="font/{FLAVOR}" crossorigin>\n'
+
+
+def self_host_fonts(site, log, font_dir=FONT_DIR):
+    """Release stage: swap Google Fonts for preloaded local Inter subsets."""
+    sources = vendored_sources(font_dir)
+    if not sources:
+        log.append(f"⚠️  no vendored Inter in {os.path.relpath(font_dir, ROOT)}/, keeping Google Fonts")
+        return site
+    if subset is None:
+        log.append("⚠️  fonttools not installed (pip install fonttools brotli), keeping Google Fonts")
+        return site
+    if FLAVOR != 'woff2':
+        log.append("⚠️  brotli not installed (pip install brotli), writing WOFF fonts instead of WOFF2")
+
+    characters = used_characters(site)
+    site = dict(site)
+    faces = []
+    urls = []
+    for label, (path, weight) in sorted(sources.items()):
+        url = f"fonts/inter-{label}.{FLAVOR}"
+        site[url] = subset_font(path, characters)
+        faces.append(font_face(url, weight))
+        urls.append(url)
+        log.append(f"🔤 {os.path.basename(path)} → {url}: {len(characters)} glyphs, "
+                   f"{os.path.getsize(path):,} → {len(site[url]):,} bytes")
+
+    for name in [name for name in site if name.endswith('.css')]:
+        site[name] = (''.join(faces) + '\n').encode('utf-8') + site[name]
+
+    for name in [name for name in site if name.endswith('.html')]:
+        html = site[name].decode('utf-8')
+        first = GOOGLE_FONTS_RE.search(html)
+        if first is None:
+            continue
+        indent = re.match(r'[ \t]*', first.group(0)).group(0)
+        hints = ''.join(preload_link(url, indent) for url in urls)
+        html = html[:first.start()] + hints + GOOGLE_FONTS_RE.sub('', html[first.start():])
+        site[name] = html.encode('utf-8')
+    return site
@@ -0,0 +1,357 @@
+# Minification and precompression for the release build
+#
+# Conservative minifiers for the HTML, CSS and JS our generators emit (no
+# renaming, no AST rewriting: comments and redundant whitespace only), plus a
+# stage that writes maximum-compression .gz and .br siblings so the static
+# host can serve them as-is.
+#
+# Brotli output needs the optional `brotli` package (pip install brotli);
+# without it only .gz files are written.
+
+import gzip
+import json
+import re
+
+import cssparse
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+COMPRESSIBLE = ('.html', '.css', '.js', '.json', '.svg')
+
+# ---------------------------------------------------------------------------
+# CSS
+# ---------------------------------------------------------------------------
+
+CSS_STRING_RE = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')''')
+
+
+def _outside_strings(text, fn):
+    """Apply ``fn`` to the parts of ``text`` that are not quoted strings."""
+    parts = CSS_STRING_RE.split(text)
+    return ''.join(part if i % 2 else fn(part) for i, part in enumerate(parts))
+
+
+def _minify_value(value):
+    def squeeze(text):
+        text = ' '.join(text.split())
+        text = re.sub(r'\s*([,(])\s*', r'\1', text)
+        text = re.sub(r'\s+\)', ')', text)
+        text = re.sub(r'\s*!important', '!important', text)
+        return re.sub(r'(?<![\w.-])0\.(\d)', r'.\1', text)
+    return _outside_strings(value.strip(), squeeze)
+
+
+def _split_declarations(body):
+    """Split a declaration block on semicolons outside strings and parentheses."""
+    parts, depth, quote, escaped, current = [], 0, None, False, ''
+    for ch in body:
+        if escaped:
+            escaped = False
+            current += ch
+            continue
+        if ch == '\\':
+            escaped = True
+        elif quote:
+            if ch == quote:
+                quote = None
+        elif ch in '"\'':
+            quote = ch
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        if ch == ';' and depth == 0 and not quote:
+            parts.append(current)
+            current = ''
+        else:
+            current += ch
+    parts.append(current)
+    return parts
+
+
+def _minify_declarations(body):
+    declarations = []
+    for declaration in _split_declarations(body):
+        if ':' not in declaration:
+            continue
+        prop, value = declaration.split(':', 1)
+        declarations.append(f"{prop.strip()}:{_minify_value(value)}")
+    return ';'.join(declarations)
+
+
+def _minify_selector(selector):
+    def squeeze(text):
+        text = ' '.join(text.split())
+        return re.sub(r'\s*([,>~+])\s*', r'\1', text)
+    return _outside_strings(selector, squeeze)
+
+
+def _minify_nodes(nodes):
+    out = []
+    for node in nodes:
+        if 'selector' in node:
+            body = _minify_declarations(node['body'])
+            if body:
+                out.append(f"{_minify_selector(node['selector'])}{{{body}}}")
+        elif 'children' in node:
+            inner = _minify_nodes(node['children'])
+            if inner:
+                out.append(f"{' '.join(node['at'].split())}{{{inner}}}")
+        elif 'body' in node:
+            if '{' in node['body']:
+                inner = _minify_nodes(cssparse.parse(node['body']))
+            else:
+                inner = _minify_declarations(node['body'])
+            out.append(f"{' '.join(node['at'].split())}{{{inner}}}")
+        else:
+            out.append(f"{' '.join(node['at'].split())};")
+    return ''.join(out)
+
+
+def minify_css(css):
+    return _minify_nodes(cssparse.parse(css))
+
+
+# ---------------------------------------------------------------------------
+# JavaScript
+# ---------------------------------------------------------------------------
+
+# A '/' after one of these starts a regex literal, not a division
+REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+REGEX_KEYWORDS = ('return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'void', 'yield', 'await')
+# Whitespace next to these never separates two tokens
+TIGHT = set('{}()[];,:=?&|!')
+
+
+def _regex_allowed(out):
+    text = ''.join(out).rstrip()
+    if not text:
+        return True
+    if text[-1] in REGEX_PRECEDERS:
+        return True
+    return re.search(r'\b(' + '|'.join(REGEX_KEYWORDS) + r')$', text) is not None
+
+
+def _skip_string(js, i):
+    """Return the index just past the string/template starting at ``i``."""
+    quote = js[i]
+    i += 1
+    depth = 0
+    while i < len(js):
+        ch = js[i]
+        if ch == '\\':
+            i += 2
+            continue
+        if quote == '`' and ch == '$' and js[i + 1:i + 2] == '{':
+            depth += 1
+        elif quote == '`' and ch == '}' and depth:
+            depth -= 1
+        elif ch == quote and not depth:
+            return i + 1
+        i += 1
+    raise ValueError('unterminated string literal')
+
+
+def _skip_regex(js, i):
+    i += 1
+    in_class = False
+    while i < len(js):
+        ch = js[i]
+        if ch == '\\':
+            i += 2
+            continue
+        if ch == '[':
+            in_class = True
+        elif ch == ']':
+            in_class = False
+        elif ch == '/' and not in_class:
+            i += 1
+            while i < len(js) and (js[i].isalnum() or js[i] == '_'):
+                i += 1
+            return i
+        elif ch == '\n':
+            raise ValueError('unterminated regex literal')
+        i += 1
+    raise ValueError('unterminated regex literal')
+
+
+def minify_js(js):
+    """Strip comments and collapse whitespace, keeping statement newlines.
+
+    Line breaks are only removed where they cannot end a statement, so
+    automatic semicolon insertion behaves exactly as in the source.
+    """
+    out = []
+    i = 0
+    pending = ''  # whitespace seen since the last token: '', ' ' or '\n'
+    while i < len(js):
+        ch = js[i]
+        if js.startswith('//', i):
+            end = js.find('\n', i)
+            i = len(js) if end == -1 else end
+            continue
+        if js.startswith('/*', i):
+            end = js.find('*/', i + 2)
+            if end == -1:
+                raise ValueError('unterminated comment')
+            if '\n' in js[i:end]:
+                pending = '\n'
+            elif not pending:
+                pending = ' '
+            i = end + 2
+            continue
+        if ch.isspace():
+            if ch == '\n':
+                pending = '\n'
+            elif not pending:
+                pending = ' '
+            i += 1
+            continue
+
+        if ch in '"\'`':
+            end = _skip_string(js, i)
+        elif ch == '/' and _regex_allowed(out):
+            end = _skip_regex(js, i)
+        else:
+            end = i + 1
+        token = js[i:end]
+
+        if pending and out:
+            prev = out[-1][-1]
+            if pending == '\n' and (prev in '{(,;[' or ch in ')]},;'):
+                pending = ''
+            elif pending == ' ' and (prev in TIGHT or ch in TIGHT):
+                pending = ''
+            out.append(pending)
+        pending = ''
+        out.append(token)
+        i = end
+    return ''.join(out).strip() + '\n'
+
+
+# ---------------------------------------------------------------------------
+# HTML
+# ---------------------------------------------------------------------------
+
+RAW_TEXT_RE = re.compile(r'(<(script|style|pre|textarea)\b[^>]*>)(.*?)(</\2>)', re.S | re.I)
+HTML_COMMENT_RE = re.compile(r'<!--(?!\[if).*?-->', re.S)
+BLOCK_TAGS = {'html', 'head', 'body', 'title', 'meta', 'link', 'style', 'script', 'noscript',
+              'div', 'main', 'header', 'footer', 'section', 'nav', 'form', 'fieldset', 'p',
+              'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol', 'li', 'select', 'option', '!doctype'}
+GAP_RE = re.compile(r'(</?([!\w-]+)[^>]*>)\s+(?=</?([!\w-]+))')
+
+
+def _collapse_markup(html):
+    html = HTML_COMMENT_RE.sub('', html)
+    html = re.sub(r'\s+', lambda m: '\n' if '\n' in m.group(0) else ' ', html)
+
+    def gap(match):
+        before, after = match.group(2).lower(), match.group(3).lower()
+        return match.group(1) if before in BLOCK_TAGS or after in BLOCK_TAGS else match.group(1) + ' '
+    html = GAP_RE.sub(gap, html)
+    # Whitespace inside a tag between attributes
+    return re.sub(r'<[^>]+>', lambda m: re.sub(r'\s+', ' ', m.group(0)).replace(' >', '>').replace(' />', '/>'), html)
+
+
+def minify_html(html):
+    """Drop comments and redundant whitespace; minify inline CSS and JS."""
+    out = []
+    last = 0
+    for match in RAW_TEXT_RE.finditer(html):
+        out.append(_collapse_markup(html[last:match.start()]))
+        open_tag, tag, content, close_tag = match.groups()
+        if tag.lower() == 'style':
+            content = minify_css(content)
+        elif tag.lower() == 'script' and 'src=' not in open_tag and content.strip():
+            content = minify_js(content).strip()
+        out.append(_collapse_markup(open_tag) + content + close_tag)
+        last = match.end()
+    out.append(_collapse_markup(html[last:]))
+    return ''.join(out).strip() + '\n'
+
+
+MINIFIERS = {'.html': minify_html, '.css': minify_css, '.js': minify_js}
+
+# ---------------------------------------------------------------------------
+# Release stages
+# ---------------------------------------------------------------------------
+
+
+def minify_assets(site, log):
+    """Release stage: minify every HTML, CSS and JS file."""
+    site = dict(site)
+    for name, data in sorted(site.items()):
+        ext = name[name.rfind('.'):]
+        if ext in MINIFIERS:
+            site[name] = MINIFIERS[ext](data.decode('utf-8')).encode('utf-8')
+            log.append(f"🗜️  {name}: {len(data):,} → {len(site[name]):,} bytes")
+    return site
+
+
+def gzip_bytes(data):
+    # mtime=0 keeps the output (and its hash) stable across builds
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def brotli_bytes(data):
+    return brotli.compress(data, quality=11, mode=brotli.MODE_TEXT)
+
+
+def precompress_assets(site, log):
+    """Release stage: add .gz (and .br) siblings for every text asset."""
+    site = dict(site)
+    if brotli is None:
+        log.append("⚠️  brotli not installed, writing .gz files only")
+    for name, data in sorted(site.items()):
+        if not name.endswith(COMPRESSIBLE):
+            continue
+        site[name + '.gz'] = gzip_bytes(data)
+        if brotli is not None:
+            site[name + '.br'] = brotli_bytes(data)
+    return site
+
+
+def size_report(raw, site, previous=None):
+    """Per-artifact sizes: raw generator output vs. shipped and compressed.
+
+    The shipped ("final") size is the output of every release stage, not of
+    minification alone: inlined critical CSS, self-hosted font rules and the
+    sprite can make a page larger than its raw output.  minify_assets() logs
+    the minifier's own before/after.
+
+    ``raw`` maps original names to generator output, ``site`` is the final
+    release (fingerprinted names are resolved through asset-manifest.json)
+    and ``previous`` is the report of the last build, used for deltas.
+    Returns ``(sizes, lines)``.
+    """
+    manifest = json.loads(site.get('asset-manifest.json', b'{}'))
+    previous = previous or {}
+    sizes = {}
+    lines = []
+    for name in sorted(raw):
+        final = manifest.get(name, name)
+        if final not in site:
+            continue
+        row = {
+            'raw': len(raw[name]),
+            'final': len(site[final]),
+            'gzip': len(site.get(final + '.gz', b'')) or None,
+            'brotli': len(site.get(final + '.br', b'')) or None,
+        }
+        sizes[name] = row
+        line = f"📦 {name}: raw {row['raw']:,} · final {row['final']:,}"
+        for key, label in (('gzip', 'gz'), ('brotli', 'br')):
+            if row[key] is not None:
+                line += f" · {label} {row[key]:,}"
+        if name in previous:
+            before = previous[name]
+            deltas = []
+            for key in ('final', 'gzip', 'brotli'):
+                if row[key] is not None and before.get(key) is not None:
+                    deltas.append(f"{key} {row[key] - before[key]:+,}")
+            line += f" (Δ {', '.join(deltas)})"
+        lines.append(line)
+    return sizes, lines
@@ -0,0 +1,48 @@
+# Service worker precache list for the release build
+#
+# script_5.py writes sw.js with the unhashed development URLs.  After
+# fingerprinting, this stage rewrites its CACHE_NAME and PRECACHE_URLS with
+# every page, stylesheet, script, font and sprite of the release, so a new
+# release installs a new cache and the old one is dropped on activation.
+
+import hashlib
+import json
+import re
+
+from fingerprint import SERVICE_WORKER
+
+CACHE_PREFIX = 'career-journal-'
+PRECACHE_EXTENSIONS = ('.html', '.css', '.js', '.svg', '.woff2', '.woff')
+
+CACHE_NAME_RE = re.compile(r"(const CACHE_NAME\s*=\s*)'[^']*'")
+PRECACHE_URLS_RE = re.compile(r"(const PRECACHE_URLS\s*=\s*)\[[^\]]*\]")
+
+
+def cache_version(files):
+    """Short hash over the names and bytes of the precached files."""
+    digest = hashlib.sha256()
+    for name in sorted(files):
+        digest.update(name.encode('utf-8') + b'\0' + hashlib.sha256(files[name]).digest())
+    return digest.hexdigest()[:10]
+
+
+def precache_assets(site, log):
+    """Release stage: point sw.js at the fingerprinted assets of this release."""
+    if SERVICE_WORKER not in site:
+        return site
+    files = {name: data for name, data in site.items()
+             if name != SERVICE_WORKER and name.endswith(PRECACHE_EXTENSIONS)}
+    urls = ['/'] + ['/' + name for name in sorted(files)]
+    cache_name = CACHE_PREFIX + cache_version(files)
+
+    text = site[SERVICE_WORKER].decode('utf-8')
+    text, names = CACHE_NAME_RE.subn(lambda m: f"{m.group(1)}'{cache_name}'", text)
+    text, lists = PRECACHE_URLS_RE.subn(lambda m: m.group(1) + json.dumps(urls), text)
+    if names != 1 or lists != 1:
+        raise ValueError(f"{SERVICE_WORKER} has no CACHE_NAME/PRECACHE_URLS declaration to rewrite")
+
+    site = dict(site)
+    site[SERVICE_WORKER] = text.encode('utf-8')
+    log.append(f"🗃️ {SERVICE_WORKER}: {cache_name}, {len(urls)} precached URL(s), "
+               f"{sum(len(data) for data in files.values()):,} bytes")
+    return site
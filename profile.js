@@ -0,0 +1,33 @@
+// Career Journaling Signup Form - profile step
+// Loaded by script.js on demand or when the browser is idle; the
+// methods are installed on CareerJournalingSignup, so `this` is the flow.
+
+export default {
+    async handleProfileSetup(event) {
+        event.preventDefault();
+        
+        const formData = new FormData(event.target);
+        const profileData = {
+            jobTitle: formData.get('jobTitle').trim(),
+            careerGoal: formData.get('careerGoal')
+        };
+
+        // Queued behind the signup it belongs to, and dropped if that is rejected
+        this.userData = { ...this.userData, ...profileData };
+        await this.outbox.enqueue('profile', { email: this.userData.email, ...profileData },
+            { dependsOn: this.signupId });
+        this.trackEvent('profile_submitted');
+        this.showSuccess();
+    },
+
+    skipProfileSetup() {
+        this.trackEvent('profile_skipped');
+        this.showSuccess();
+    },
+
+    async updateProfile(profileData, idempotencyKey) {
+        // Simulate API call to save profile
+        await new Promise(resolve => setTimeout(resolve, 1000));
+        return { ...profileData, idempotencyKey };
+    }
+};
@@ -0,0 +1,157 @@
+# Unused-CSS pruning
+#
+# Builds a selector-usage index from every HTML page and from the class names
+# the JavaScript toggles (classList.add/remove/toggle, className = ...,
+# querySelector('.x'), class="..." in template strings) and drops rules no
+# page can ever match.
+#
+# As a release stage it prunes the stylesheets in dist/ against the pages and
+# scripts shipped with them.  It also runs standalone against any set of
+# files, e.g. the hand-written variants:
+#
+#   python purge_css.py --html index_1.html index_2.html --js app.js app_1.js -- style.css style_1.css
+#   python purge_css.py ... --out pruned/   # write the pruned copies
+
+import argparse
+import os
+import re
+import sys
+
+import cssparse
+
+# Class names built at runtime that the static scan cannot see
+SAFELIST = {
+    'classes': set(),
+    'ids': set(),
+    'tags': set(),
+}
+
+STRING_RE = re.compile(r'''(['"`])((?:\\.|(?!\1).)*)\1''', re.S)
+CLASSLIST_RE = re.compile(r'classList\.(?:add|remove|toggle|contains|replace)\(([^)]*)\)')
+CLASSNAME_RE = re.compile(r'''className\s*[+]?=\s*(['"`])([^'"`]*)\1''')
+CLASS_ATTR_RE = re.compile(r'''class=\\?["']([^"'\\]*)''')
+SELECTOR_CALL_RE = re.compile(r'''(?:querySelector(?:All)?|closest|matches)\(\s*(['"`])([^'"`]+)\1''')
+ID_CALL_RE = re.compile(r'''getElementById\(\s*(['"`])([^'"`]+)\1''')
+CREATE_ELEMENT_RE = re.compile(r'''createElement\(\s*(['"`])([\w-]+)\1''')
+ANIMATION_RE = re.compile(r'animation(?:-name)?\s*:\s*([^;]+)')
+
+
+def js_usage(js):
+    """Collect the classes, ids and tags a script adds to or looks up in the DOM."""
+    usage = cssparse.empty_usage()
+    for args in CLASSLIST_RE.findall(js):
+        for _, value in STRING_RE.findall(args):
+            usage['classes'].update(value.split())
+    for _, value in CLASSNAME_RE.findall(js):
+        usage['classes'].update(value.split())
+    for value in CLASS_ATTR_RE.findall(js):
+        usage['classes'].update(value.split())
+    for _, selector in SELECTOR_CALL_RE.findall(js):
+        for part in cssparse.split_selectors(selector):
+            tags, classes, ids = cssparse.selector_tokens(part)
+            usage['tags'] |= tags
+            usage['classes'] |= classes
+            usage['ids'] |= ids
+    usage['ids'].update(value for _, value in ID_CALL_RE.findall(js))
+    usage['tags'].update(value.lower() for _, value in CREATE_ELEMENT_RE.findall(js))
+    return usage
+
+
+def usage_index(pages, scripts):
+    """Selector-usage index over HTML documents and JS sources (strings)."""
+    usage = cssparse.merge_usage(cssparse.empty_usage(), SAFELIST)
+    for html in pages:
+        cssparse.merge_usage(usage, cssparse.html_usage(html))
+        for inline in re.findall(r'<script[^>]*>(.*?)</script>', html, re.S):
+            cssparse.merge_usage(usage, js_usage(inline))
+    for js in scripts:
+        cssparse.merge_usage(usage, js_usage(js))
+    return usage
+
+
+def prune_nodes(nodes, usage):
+    """Drop selectors (and then rules) that nothing in ``usage`` can match."""
+    kept = []
+    for node in nodes:
+        if 'selector' in node:
+            selectors = [s for s in cssparse.split_selectors(node['selector'])
+                         if cssparse.selector_used(s, usage)]
+            if selectors:
+                kept.append({'selector': ', '.join(selectors), 'body': node['body']})
+        elif 'children' in node:
+            children = prune_nodes(node['children'], usage)
+            if children:
+                kept.append({'at': node['at'], 'children': children})
+        else:
+            kept.append(node)
+    return kept
+
+
+def _drop_unused_keyframes(nodes):
+    used = set()
+    for rule in cssparse.walk_rules(nodes):
+        for value in ANIMATION_RE.findall(rule['body']):
+            used.update(value.replace(',', ' ').split())
+    return [node for node in nodes
+            if not (node.get('at', '').startswith('@keyframes') and node['at'].split()[-1] not in used)]
+
+
+def prune_css(css, usage):
+    """Return ``(css, removed)`` with the rules ``usage`` never matches dropped.
+
+    ``removed`` counts the bytes of the dropped rules themselves, not the
+    whitespace and comments lost by re-serializing.  The original text is
+    returned untouched when nothing can be removed.
+    """
+    nodes = cssparse.parse(css)
+    pruned = _drop_unused_keyframes(prune_nodes(nodes, usage))
+    if pruned == nodes:
+        return css, 0
+    text = cssparse.serialize(pruned)
+    removed = len(cssparse.serialize(nodes).encode('utf-8')) - len(text.encode('utf-8'))
+    return text + '\n', removed
+
+
+def purge_unused_css(site, log):
+    """Release stage: prune every stylesheet against every page and script."""
+    pages = [data.decode('utf-8') for name, data in site.items() if name.endswith('.html')]
+    scripts = [data.decode('utf-8') for name, data in site.items() if name.endswith('.js')]
+    usage = usage_index(pages, scripts)
+
+    site = dict(site)
+    for name in [name for name in site if name.endswith('.css')]:
+        css, removed = prune_css(site[name].decode('utf-8'), usage)
+        site[name] = css.encode('utf-8')
+        log.append(f"✂️  {name}: removed {removed:,} bytes of unused rules")
+    return site
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Remove CSS rules no page or script can match.')
+    parser.add_argument('stylesheets', nargs='+', help='stylesheets to prune')
+    parser.add_argument('--html', nargs='*', default=[], help='HTML pages that use the stylesheets')
+    parser.add_argument('--js', nargs='*', default=[], help='scripts that toggle classes on those pages')
+    parser.add_argument('--out', help='directory to write pruned copies to (default: report only)')
+    args = parser.parse_args(argv)
+
+    def read(path):
+        with open(path, encoding='utf-8') as f:
+            return f.read()
+
+    usage = usage_index([read(p) for p in args.html], [read(p) for p in args.js])
+    total = 0
+    for path in args.stylesheets:
+        css = read(path)
+        pruned, removed = prune_css(css, usage)
+        total += removed
+        print(f"✂️  {path}: {removed:,} bytes of unused rules")
+        if args.out:
+            os.makedirs(args.out, exist_ok=True)
+            with open(os.path.join(args.out, os.path.basename(path)), 'w', encoding='utf-8') as f:
+                f.write(pruned)
+    print(f"✅ Removed {total:,} bytes of unused rules")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
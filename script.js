@@ -1,13 +1,288 @@
 // Career Journaling Signup Form - JavaScript
 // Handles form validation, submission, and progressive onboarding
 
+const OUTBOX_DB = 'career-journal';
+const OUTBOX_STORE = 'outbox';
+const RETRY_BASE_MS = 1000;
+const RETRY_MAX_MS = 5 * 60 * 1000;
+const ANALYTICS_ENDPOINT = '/api/events';
+const ANALYTICS_FLUSH_MS = 10000;
+const ANALYTICS_MAX_BATCH = 20;
+const EMAIL_PATTERN = /^[^\s@]+@[^\s@]+\.[^\s@]+$/;
+const PERSONAL_EMAIL_DOMAINS = ['gmail.com', 'yahoo.com', 'hotmail.com', 'outlook.com'];
+const VALID = { message: '', valid: true, warning: false };
+
+function randomId() {
+    return crypto.randomUUID ? crypto.randomUUID() : `${Date.now()}-${Math.random().toString(16).slice(2)}`;
+}
+
+// Code for the later steps, split out of the critical path
+const CHUNKS = {
+    profile: './profile.js',
+    success: './success.js',
+    social: './social.js'
+};
+const loadedChunks = {};
+
+// Validation rules for the signup fields. Each one only reads the value and
+// returns what the field should show; rendering is left to the caller.
+const FIELD_RULES = {
+    firstName(value) {
+        const firstName = value.trim();
+        if (!firstName) {
+            return { message: 'First name is required', valid: false, warning: false };
+        }
+        if (firstName.length < 2) {
+            return { message: 'First name must be at least 2 characters', valid: false, warning: false };
+        }
+        return VALID;
+    },
+
+    email(value) {
+        const email = value.trim();
+        if (!email) {
+            return { message: 'Email is required', valid: false, warning: false };
+        }
+        if (!EMAIL_PATTERN.test(email)) {
+            return { message: 'Please enter a valid email address', valid: false, warning: false };
+        }
+        // Check for work email patterns (optional enhancement)
+        const domain = email.split('@')[1]?.toLowerCase();
+        if (PERSONAL_EMAIL_DOMAINS.includes(domain)) {
+            return { message: 'Consider using your work email for better experience', valid: true, warning: true };
+        }
+        return VALID;
+    },
+
+    password(value) {
+        if (!value) {
+            return { message: 'Password is required', valid: false, warning: false };
+        }
+        if (value.length < 6) {
+            return { message: 'Password must be at least 6 characters', valid: false, warning: false };
+        }
+        return VALID;
+    }
+};
+
+// Persistent outbox for signup and profile submissions. Each submission is
+// written to IndexedDB before it is sent and replayed in order with
+// exponential backoff, so a flaky connection delays it instead of losing
+// it. The record id doubles as the idempotency key, which makes replaying
+// a request whose response was lost safe; callers that may submit the same
+// thing twice pass their own id, and the second enqueue replaces the first.
+class SubmissionOutbox {
+    constructor(senders, onPermanentFailure) {
+        this.senders = senders; // kind -> async (payload, idempotencyKey)
+        this.onPermanentFailure = onPermanentFailure;
+        this.memory = new Map(); // records IndexedDB could not take (private mode, quota)
+        this.secrets = new Map(); // fields that are never written to disk, by record id
+        this.failed = new Set();
+        this.timer = null;
+        this.flushing = null;
+        this.again = false;
+        this.db = this.open();
+
+        window.addEventListener('online', () => this.flush());
+    }
+
+    open() {
+        if (!('indexedDB' in window)) {
+            return Promise.resolve(null);
+        }
+        return new Promise((resolve) => {
+            const request = indexedDB.open(OUTBOX_DB, 1);
+            request.onupgradeneeded = () => request.result.createObjectStore(OUTBOX_STORE, { keyPath: 'id' });
+            request.onsuccess = () => resolve(request.result);
+            request.onerror = () => resolve(null);
+            request.onblocked = () => resolve(null);
+        });
+    }
+
+    async records() {
+        const db = await this.db;
+        const stored = !db ? [] : await new Promise((resolve) => {
+            const request = db.transaction(OUTBOX_STORE).objectStore(OUTBOX_STORE).getAll();
+            request.onsuccess = () => resolve(request.result);
+            request.onerror = () => resolve([]);
+        });
+        return [...stored, ...this.memory.values()].sort((a, b) => a.createdAt - b.createdAt);
+    }
+
+    async store(method, value) {
+        const db = await this.db;
+        if (db) {
+            try {
+                await new Promise((resolve, reject) => {
+                    const tx = db.transaction(OUTBOX_STORE, 'readwrite');
+                    tx.objectStore(OUTBOX_STORE)[method](value);
+                    tx.oncomplete = resolve;
+                    tx.onerror = tx.onabort = () => reject(tx.error);
+                });
+                return;
+            } catch (error) {
+                // Fall through to memory: the submission outlives this page only
+            }
+        }
+        if (method === 'put') {
+            this.memory.set(value.id, value);
+        } else {
+            this.memory.delete(value);
+        }
+    }
+
+    async enqueue(kind, payload, { id = randomId(), secret = {}, dependsOn = null } = {}) {
+        const record = { id, kind, payload, dependsOn, attempts: 0, nextAttemptAt: 0, createdAt: Date.now() };
+        this.secrets.set(id, secret);
+        this.failed.delete(id);
+        await this.store('put', record);
+        this.flush();
+        return id;
+    }
+
+    flush() {
+        // One replay loop at a time; a flush requested meanwhile runs after it
+        if (this.flushing) {
+            this.again = true;
+            return this.flushing;
+        }
+        this.flushing = this.replay().finally(() => {
+            this.flushing = null;
+            if (this.again) {
+                this.again = false;
+                this.flush();
+            }
+        });
+        return this.flushing;
+    }
+
+    async replay() {
+        clearTimeout(this.timer);
+        if (navigator.onLine === false) {
+            return; // the 'online' event flushes again
+        }
+        for (const record of await this.records()) {
+            const wait = record.nextAttemptAt - Date.now();
+            if (wait > 0) {
+                this.schedule(wait);
+                return;
+            }
+            if (!this.failed.has(record.dependsOn)) {
+                try {
+                    const payload = { ...record.payload, ...this.secrets.get(record.id) };
+                    await this.senders[record.kind](payload, record.id);
+                } catch (error) {
+                    if (!error.permanent) {
+                        record.attempts += 1;
+                        record.nextAttemptAt = Date.now() + this.backoff(record.attempts);
+                        await this.store('put', record);
+                        // Later submissions wait: a profile must not overtake its signup
+                        this.schedule(record.nextAttemptAt - Date.now());
+                        return;
+                    }
+                    this.failed.add(record.id);
+                    this.onPermanentFailure(record, error);
+                }
+            }
+            await this.store('delete', record.id);
+            this.secrets.delete(record.id);
+        }
+    }
+
+    backoff(attempts) {
+        // Full exponential delay with jitter, so retries from many clients spread out
+        const delay = Math.min(RETRY_BASE_MS * 2 ** (attempts - 1), RETRY_MAX_MS);
+        return delay / 2 + Math.random() * delay / 2;
+    }
+
+    schedule(delay) {
+        clearTimeout(this.timer);
+        this.timer = setTimeout(() => this.flush(), delay);
+    }
+}
+
+// Buffers analytics events and sends them in batches: on a timer, when the
+// batch is full and, with navigator.sendBeacon, when the page is hidden. A
+// funnel costs one or two requests instead of one per step, and the context
+// every event shares (session, UTM source, user agent) is sent once per batch.
+class AnalyticsBuffer {
+    constructor(endpoint = ANALYTICS_ENDPOINT) {
+        this.endpoint = endpoint;
+        this.events = [];
+        this.timer = null;
+        this.startedAt = Date.now();
+        this.context = {
+            session: randomId(),
+            userAgent: navigator.userAgent
+        };
+
+        // The last chance to send: mobile browsers may never fire unload
+        document.addEventListener('visibilitychange', () => {
+            if (document.visibilityState === 'hidden') {
+                this.flush(true);
+            }
+        });
+        window.addEventListener('pagehide', () => this.flush(true));
+    }
+
+    setContext(values) {
+        Object.assign(this.context, values);
+    }
+
+    push(name, properties = {}) {
+        // [name, ms since page start, properties]
+        this.events.push([name, Date.now() - this.startedAt, properties]);
+        if (this.events.length >= ANALYTICS_MAX_BATCH) {
+            this.flush();
+        } else if (!this.timer) {
+            this.timer = setTimeout(() => this.flush(), ANALYTICS_FLUSH_MS);
+        }
+    }
+
+    flush(hidden = false) {
+        clearTimeout(this.timer);
+        this.timer = null;
+        if (!this.events.length) {
+            return Promise.resolve();
+        }
+        const batch = JSON.stringify({ v: 1, startedAt: this.startedAt, ...this.context, events: this.events });
+        const plain = new Blob([batch], { type: 'application/json' });
+        this.events = [];
+
+        // Compression is asynchronous, which a page being hidden may not survive
+        if (hidden || !('CompressionStream' in window)) {
+            this.send(this.endpoint, plain);
+            return Promise.resolve();
+        }
+        const gzipped = new Blob([batch]).stream().pipeThrough(new CompressionStream('gzip'));
+        return new Response(gzipped).blob()
+            .then((body) => this.send(`${this.endpoint}?encoding=gzip`, body))
+            .catch(() => this.send(this.endpoint, plain));
+    }
+
+    send(url, body) {
+        if (navigator.sendBeacon && navigator.sendBeacon(url, body)) {
+            return;
+        }
+        fetch(url, { method: 'POST', body, keepalive: true }).catch(() => undefined);
+    }
+}
+
 class CareerJournalingSignup {
     constructor() {
-        this.supabaseUrl = process.env.REACT_APP_SUPABASE_URL || 'YOUR_SUPABASE_URL';
-        this.supabaseKey = process.env.REACT_APP_SUPABASE_ANON_KEY || 'YOUR_SUPABASE_ANON_KEY';
+        // `process` only exists when a bundler provides it
+        this.supabaseUrl = globalThis.process?.env?.REACT_APP_SUPABASE_URL || 'YOUR_SUPABASE_URL';
+        this.supabaseKey = globalThis.process?.env?.REACT_APP_SUPABASE_ANON_KEY || 'YOUR_SUPABASE_ANON_KEY';
         this.currentStep = 1;
         this.userData = {};
-
+        this.signupId = null;
+        this.signupKey = null; // { email, id } of the signup being submitted
+        this.analytics = new AnalyticsBuffer();
+        this.outbox = new SubmissionOutbox({
+            signup: this.createAccount.bind(this),
+            profile: (profileData, key) => this.callChunk('profile', 'updateProfile', profileData, key)
+        }, this.handleRejectedSubmission.bind(this));
+        
         this.init();
     }
 
@@ -15,6 +290,44 @@ class CareerJournalingSignup {
         this.bindEvents();
         this.setUTMSource();
         this.setupFormValidation();
+        // Send whatever a previous visit left in the outbox
+        this.outbox.flush();
+        this.trackEvent('signup_viewed');
+        this.preloadChunks();
+    }
+
+    loadChunk(name) {
+        // Imported once; the chunk's methods join the class
+        if (!loadedChunks[name]) {
+            loadedChunks[name] = import(CHUNKS[name])
+                .then((module) => Object.assign(CareerJournalingSignup.prototype, module.default))
+                .catch((error) => {
+                    delete loadedChunks[name]; // let the next call retry
+                    throw error;
+                });
+        }
+        return loadedChunks[name];
+    }
+
+    async callChunk(name, method, ...args) {
+        await this.loadChunk(name);
+        return this[method](...args);
+    }
+
+    runChunk(name, method, ...args) {
+        // For event handlers: report a chunk that failed to load
+        return this.callChunk(name, method, ...args)
+            .catch(() => this.showError('Something went wrong loading this step. Please try again.'));
+    }
+
+    preloadChunks() {
+        // Load the later steps once the first one is interactive
+        const load = () => Object.keys(CHUNKS).forEach((name) => this.loadChunk(name).catch(() => undefined));
+        if ('requestIdleCallback' in window) {
+            requestIdleCallback(load, { timeout: 5000 });
+        } else {
+            setTimeout(load, 2000);
+        }
     }
 
     bindEvents() {
@@ -27,19 +340,23 @@ class CareerJournalingSignup {
         // Profile setup form
         const profileForm = document.getElementById('profileSetupForm');
         if (profileForm) {
-            profileForm.addEventListener('submit', this.handleProfileSetup.bind(this));
+            profileForm.addEventListener('submit', (event) => {
+                // Before the chunk loads, or the browser submits the form itself
+                event.preventDefault();
+                this.runChunk('profile', 'handleProfileSetup', event);
+            });
         }
 
         // Social login buttons
         const googleBtn = document.getElementById('googleSignup');
         const linkedinBtn = document.getElementById('linkedinSignup');
-
+        
         if (googleBtn) {
-            googleBtn.addEventListener('click', () => this.handleSocialLogin('google'));
+            googleBtn.addEventListener('click', () => this.runChunk('social', 'handleSocialLogin', 'google'));
         }
-
+        
         if (linkedinBtn) {
-            linkedinBtn.addEventListener('click', () => this.handleSocialLogin('linkedin'));
+            linkedinBtn.addEventListener('click', () => this.runChunk('social', 'handleSocialLogin', 'linkedin'));
         }
 
         // Password visibility toggle
@@ -51,19 +368,19 @@ class CareerJournalingSignup {
         // Skip profile setup
         const skipBtn = document.getElementById('skipProfile');
         if (skipBtn) {
-            skipBtn.addEventListener('click', this.skipProfileSetup.bind(this));
+            skipBtn.addEventListener('click', () => this.runChunk('profile', 'skipProfileSetup'));
         }
 
         // Success actions
         const calendarBtn = document.getElementById('addCalendarReminder');
         const startBtn = document.getElementById('startJournaling');
-
+        
         if (calendarBtn) {
-            calendarBtn.addEventListener('click', this.addCalendarReminder.bind(this));
+            calendarBtn.addEventListener('click', () => this.runChunk('success', 'addCalendarReminder'));
         }
-
+        
         if (startBtn) {
-            startBtn.addEventListener('click', this.startJournaling.bind(this));
+            startBtn.addEventListener('click', () => this.runChunk('success', 'startJournaling'));
         }
     }
 
@@ -74,141 +391,93 @@ class CareerJournalingSignup {
         if (utmField) {
             utmField.value = utmSource;
         }
+        this.analytics.setContext({ utmSource });
     }
 
     setupFormValidation() {
-        // Real-time validation for email
-        const emailInput = document.getElementById('email');
-        if (emailInput) {
-            emailInput.addEventListener('blur', this.validateEmail.bind(this));
-            emailInput.addEventListener('input', this.clearFieldError.bind(this, 'email'));
-        }
-
-        // Real-time validation for password
-        const passwordInput = document.getElementById('password');
-        if (passwordInput) {
-            passwordInput.addEventListener('input', this.validatePassword.bind(this));
-        }
-
-        // Real-time validation for first name
-        const firstNameInput = document.getElementById('firstName');
-        if (firstNameInput) {
-            firstNameInput.addEventListener('blur', this.validateFirstName.bind(this));
-            firstNameInput.addEventListener('input', this.clearFieldError.bind(this, 'firstName'));
-        }
-    }
-
-    validateEmail() {
-        const email = document.getElementById('email').value.trim();
-        const errorElement = document.getElementById('email-error');
-
-        if (!email) {
-            this.showFieldError('email', 'Email is required');
-            return false;
-        }
-
-        const emailRegex = /^[^\s@]+@[^\s@]+\.[^\s@]+$/;
-        if (!emailRegex.test(email)) {
-            this.showFieldError('email', 'Please enter a valid email address');
-            return false;
-        }
-
-        // Check for work email patterns (optional enhancement)
-        const commonPersonalDomains = ['gmail.com', 'yahoo.com', 'hotmail.com', 'outlook.com'];
-        const domain = email.split('@')[1]?.toLowerCase();
-        if (commonPersonalDomains.includes(domain)) {
-            this.showFieldWarning('email', 'Consider using your work email for better experience');
-        }
-
-        this.clearFieldError('email');
-        return true;
-    }
-
-    validatePassword() {
-        const password = document.getElementById('password').value;
-        const errorElement = document.getElementById('password-error');
-
-        if (!password) {
-            this.showFieldError('password', 'Password is required');
-            return false;
+        // Input and error nodes are looked up once; `rendered` is what the
+        // DOM shows, `pending` what the next frame will write
+        this.fields = new Map();
+        this.renderFrame = null;
+        for (const name of Object.keys(FIELD_RULES)) {
+            const input = document.getElementById(name);
+            if (input) {
+                const error = document.getElementById(`${name}-error`);
+                this.fields.set(name, { input, error, rendered: VALID, pending: null });
+            }
         }
 
-        if (password.length < 6) {
-            this.showFieldError('password', 'Password must be at least 6 characters');
-            return false;
+        // One delegated listener per event type for the whole form. focusout
+        // (blur does not bubble) validates a field once the user leaves it;
+        // typing re-checks the password and clears other fields' errors.
+        const authForm = document.getElementById('authForm');
+        if (authForm) {
+            authForm.addEventListener('focusout', (event) => this.validateField(event.target.id));
+            authForm.addEventListener('input', (event) => {
+                const name = event.target.id;
+                if (name === 'password') {
+                    this.validateField(name);
+                } else if (this.fields.has(name)) {
+                    this.renderField(name, VALID);
+                }
+            });
         }
-
-        this.clearFieldError('password');
-        return true;
     }
 
-    validateFirstName() {
-        const firstName = document.getElementById('firstName').value.trim();
-
-        if (!firstName) {
-            this.showFieldError('firstName', 'First name is required');
-            return false;
-        }
-
-        if (firstName.length < 2) {
-            this.showFieldError('firstName', 'First name must be at least 2 characters');
-            return false;
+    validateField(name) {
+        const field = this.fields.get(name);
+        if (!field) {
+            return true;
         }
-
-        this.clearFieldError('firstName');
-        return true;
+        const state = FIELD_RULES[name](field.input.value);
+        this.renderField(name, state);
+        return state.valid;
     }
 
-    showFieldError(fieldName, message) {
-        const errorElement = document.getElementById(`${fieldName}-error`);
-        const inputElement = document.getElementById(fieldName);
-
-        if (errorElement) {
-            errorElement.textContent = message;
-            errorElement.style.display = 'block';
-        }
-
-        if (inputElement) {
-            inputElement.setAttribute('aria-invalid', 'true');
-            inputElement.classList.add('error');
+    validateForm() {
+        // One pass over the cached fields; every field is checked so every
+        // error shows at once
+        let valid = true;
+        for (const name of this.fields.keys()) {
+            valid = this.validateField(name) && valid;
         }
+        return valid;
     }
 
-    showFieldWarning(fieldName, message) {
-        const errorElement = document.getElementById(`${fieldName}-error`);
-
-        if (errorElement) {
-            errorElement.textContent = message;
-            errorElement.style.display = 'block';
-            errorElement.style.color = '#f59e0b'; // Warning color
+    renderField(name, state) {
+        this.fields.get(name).pending = state;
+        if (!this.renderFrame) {
+            this.renderFrame = requestAnimationFrame(() => this.flushFieldStates());
         }
     }
 
-    clearFieldError(fieldName) {
-        const errorElement = document.getElementById(`${fieldName}-error`);
-        const inputElement = document.getElementById(fieldName);
-
-        if (errorElement) {
-            errorElement.textContent = '';
-            errorElement.style.display = 'none';
-            errorElement.style.color = ''; // Reset color
-        }
-
-        if (inputElement) {
-            inputElement.setAttribute('aria-invalid', 'false');
-            inputElement.classList.remove('error');
+    flushFieldStates() {
+        // Every validation DOM write of a frame happens here, and only for
+        // fields whose state changed, so keystrokes never force extra layout
+        this.renderFrame = null;
+        for (const field of this.fields.values()) {
+            const state = field.pending;
+            field.pending = null;
+            const shown = field.rendered;
+            if (!state || (state.message === shown.message && state.valid === shown.valid
+                    && state.warning === shown.warning)) {
+                continue;
+            }
+            field.rendered = state;
+            if (field.error) {
+                field.error.textContent = state.message;
+                field.error.style.display = state.message ? 'block' : 'none';
+                field.error.style.color = state.warning ? '#f59e0b' : ''; // Warning color
+            }
+            field.input.setAttribute('aria-invalid', String(!state.valid));
+            field.input.classList.toggle('error', !state.valid);
         }
     }
 
     async handleSignup(event) {
         event.preventDefault();
-
-        // Validate all fields
-        const isEmailValid = this.validateEmail();
-        const isPasswordValid = this.validatePassword();
-        const isFirstNameValid = this.validateFirstName();
-
-        if (!isEmailValid || !isPasswordValid || !isFirstNameValid) {
+        
+        if (!this.validateForm()) {
             return;
         }
 
@@ -221,35 +490,60 @@ class CareerJournalingSignup {
             utmSource: formData.get('utmSource')
         };
 
-        this.setLoading(true);
         this.clearMessages();
 
+        // Queue the signup and move on: the outbox retries it in the
+        // background. The password stays in memory and never reaches disk.
+        // The idempotency key belongs to the submission, not the record: a
+        // resubmit with the same email (after a rejection, or coming back
+        // from the profile step) reuses it, so it cannot create a second
+        // account.
+        const { password, ...submission } = userData;
+        if (this.signupKey?.email !== submission.email) {
+            this.signupKey = { email: submission.email, id: randomId() };
+        }
+        this.setLoading(true);
         try {
-            // In a real implementation, this would call Supabase Auth
-            // For now, we'll simulate the API call
-            await this.simulateSignup(userData);
+            this.signupId = await this.outbox.enqueue('signup', submission,
+                { id: this.signupKey.id, secret: { password } });
+        } finally {
+            this.setLoading(false);
+        }
+        this.userData = submission;
+        this.trackEvent('signup_submitted');
+        this.showProfileForm();
+    }
 
-            this.userData = userData;
-            this.showProfileForm();
+    async createAccount(userData, idempotencyKey) {
+        // In a real implementation, this would call Supabase Auth with the
+        // idempotency key, so a replay whose first response was lost finds
+        // the account instead of creating a second one. A signup replayed
+        // after a reload has no password and gets a magic sign-in link.
+        // For now, we'll simulate the API call
+        return this.simulateSignup(userData, idempotencyKey);
+    }
 
-        } catch (error) {
+    handleRejectedSubmission(record, error) {
+        this.trackEvent(`${record.kind}_rejected`);
+        if (record.kind === 'signup') {
+            this.showSignupForm();
             this.showError(error.message || 'Failed to create account. Please try again.');
-        } finally {
-            this.setLoading(false);
         }
     }
 
-    async simulateSignup(userData) {
+    async simulateSignup(userData, idempotencyKey) {
         // Simulate API call delay
         await new Promise(resolve => setTimeout(resolve, 1500));
-
-        // Simulate potential errors
+        
+        // Simulate potential errors: rejections are permanent, everything
+        // else (timeouts, dropped connections) is retried by the outbox
         if (userData.email === 'test@error.com') {
-            throw new Error('This email is already registered');
+            throw Object.assign(new Error('This email is already registered'), { permanent: true });
         }
-
+        
         // Simulate success
         return {
+            idempotencyKey,
             user: {
                 id: 'user_' + Date.now(),
                 email: userData.email,
@@ -258,99 +552,51 @@ class CareerJournalingSignup {
         };
     }
 
-    async handleSocialLogin(provider) {
-        this.setLoading(true, `Connecting to ${provider}...`);
-
-        try {
-            // In a real implementation, this would use Supabase Auth
-            // supabase.auth.signInWithOAuth({ provider })
-
-            // Simulate social login
-            await new Promise(resolve => setTimeout(resolve, 2000));
-
-            // For demo, go directly to success
-            this.showSuccess();
-
-        } catch (error) {
-            this.showError(`Failed to connect with ${provider}. Please try again.`);
-        } finally {
-            this.setLoading(false);
-        }
-    }
-
-    async handleProfileSetup(event) {
-        event.preventDefault();
-
-        const formData = new FormData(event.target);
-        const profileData = {
-            jobTitle: formData.get('jobTitle').trim(),
-            careerGoal: formData.get('careerGoal')
-        };
-
-        this.setLoading(true, 'Saving profile...');
-
-        try {
-            // Simulate API call to save profile
-            await new Promise(resolve => setTimeout(resolve, 1000));
-
-            this.userData = { ...this.userData, ...profileData };
-            this.showSuccess();
-
-        } catch (error) {
-            this.showError('Failed to save profile. Please try again.');
-        } finally {
-            this.setLoading(false);
+    showSignupForm() {
+        const signupForm = document.getElementById('signupForm');
+        const profileForm = document.getElementById('profileForm');
+        const successContainer = document.getElementById('successContainer');
+        
+        if (profileForm) profileForm.style.display = 'none';
+        if (successContainer) successContainer.style.display = 'none';
+        if (signupForm) {
+            signupForm.style.display = 'block';
+            signupForm.scrollIntoView({ behavior: 'smooth' });
         }
+        
+        this.currentStep = 1;
     }
 
-    skipProfileSetup() {
-        this.showSuccess();
+    showSuccess() {
+        return this.runChunk('success', 'showSuccessStep');
     }
 
     showProfileForm() {
         const signupForm = document.getElementById('signupForm');
         const profileForm = document.getElementById('profileForm');
-
+        
         if (signupForm) signupForm.style.display = 'none';
         if (profileForm) {
             profileForm.style.display = 'block';
             profileForm.scrollIntoView({ behavior: 'smooth' });
         }
-
+        
         this.currentStep = 2;
     }
 
-    showSuccess() {
-        const signupForm = document.getElementById('signupForm');
-        const profileForm = document.getElementById('profileForm');
-        const successContainer = document.getElementById('successContainer');
-
-        if (signupForm) signupForm.style.display = 'none';
-        if (profileForm) profileForm.style.display = 'none';
-        if (successContainer) {
-            successContainer.style.display = 'block';
-            successContainer.scrollIntoView({ behavior: 'smooth' });
-        }
-
-        this.currentStep = 3;
-
-        // Track conversion (in real app, send to analytics)
-        this.trackConversion();
-    }
-
     setLoading(isLoading, message = 'Creating...') {
         const submitBtn = document.getElementById('submitBtn');
         const btnText = submitBtn?.querySelector('.btn-text');
         const btnLoading = submitBtn?.querySelector('.btn-loading');
-
+        
         if (submitBtn) {
             submitBtn.disabled = isLoading;
         }
-
+        
         if (btnText) {
             btnText.style.display = isLoading ? 'none' : 'block';
         }
-
+        
         if (btnLoading) {
             btnLoading.style.display = isLoading ? 'flex' : 'none';
             btnLoading.textContent = message;
@@ -366,23 +612,15 @@ class CareerJournalingSignup {
         }
     }
 
-    showSuccess(message) {
-        const successElement = document.getElementById('successMessage');
-        if (successElement) {
-            successElement.textContent = message;
-            successElement.style.display = 'block';
-        }
-    }
-
     clearMessages() {
         const errorElement = document.getElementById('errorMessage');
         const successElement = document.getElementById('successMessage');
-
+        
         if (errorElement) {
             errorElement.style.display = 'none';
             errorElement.textContent = '';
         }
-
+        
         if (successElement) {
             successElement.style.display = 'none';
             successElement.textContent = '';
@@ -392,7 +630,7 @@ class CareerJournalingSignup {
     togglePasswordVisibility() {
         const passwordInput = document.getElementById('password');
         const toggleBtn = document.getElementById('passwordToggle');
-
+        
         if (passwordInput && toggleBtn) {
             const isVisible = passwordInput.type === 'text';
             passwordInput.type = isVisible ? 'password' : 'text';
@@ -400,73 +638,10 @@ class CareerJournalingSignup {
         }
     }
 
-    addCalendarReminder() {
-        // Generate calendar event for Friday journaling
-        const event = {
-            title: 'Weekly Career Journal Reflection',
-            description: 'Time to reflect on this week\'s professional growth and document key experiences.',
-            start: this.getNextFriday(),
-            duration: 20, // 20 minutes
-            recurring: 'weekly'
-        };
-
-        const googleCalendarUrl = this.generateGoogleCalendarUrl(event);
-        window.open(googleCalendarUrl, '_blank');
-    }
-
-    getNextFriday() {
-        const today = new Date();
-        const daysUntilFriday = (5 - today.getDay() + 7) % 7 || 7;
-        const nextFriday = new Date(today);
-        nextFriday.setDate(today.getDate() + daysUntilFriday);
-        nextFriday.setHours(16, 0, 0, 0); // 4 PM
-        return nextFriday;
+    trackEvent(name, properties = {}) {
+        this.analytics.push(name, { step: this.currentStep, ...properties });
     }
 
-    generateGoogleCalendarUrl(event) {
-        const baseUrl = 'https://calendar.google.com/calendar/render';
-        const params = new URLSearchParams({
-            action: 'TEMPLATE',
-            text: event.title,
-            details: event.description,
-            dates: this.formatCalendarDate(event.start),
-            recur: 'RRULE:FREQ=WEEKLY;BYDAY=FR'
-        });
-
-        return `${baseUrl}?${params.toString()}`;
-    }
-
-    formatCalendarDate(date) {
-        const start = new Date(date);
-        const end = new Date(start.getTime() + (20 * 60 * 1000)); // 20 minutes later
-
-        const formatDate = (d) => {
-            return d.toISOString().replace(/[-:]/g, '').split('.')[0] + 'Z';
-        };
-
-        return `${formatDate(start)}/${formatDate(end)}`;
-    }
-
-    startJournaling() {
-        // In a real app, this would redirect to the journal interface
-        window.location.href = '/journal';
-    }
-
-    trackConversion() {
-        // In a real app, send conversion data to analytics
-        const conversionData = {
-            event: 'signup_completed',
-            step: this.currentStep,
-            utmSource: this.userData.utmSource,
-            timestamp: new Date().toISOString(),
-            userAgent: navigator.userAgent
-        };
-
-        console.log('Conversion tracked:', conversionData);
-
-        // Example: Send to Google Analytics, Mixpanel, etc.
-        // gtag('event', 'signup_completed', conversionData);
-    }
 }
 
 // Initialize the signup flow when DOM is loaded
@@ -212,7 +212,11 @@ index_html = """<!DOCTYPE html>
         </footer>
     </div>
 
-    <script src="script.js"></script>
+    <script type="module" src="script.js"></script>
+    <!-- Later steps: fetched early, evaluated only when script.js imports them -->
+    <link rel="modulepreload" href="profile.js">
+    <link rel="modulepreload" href="success.js">
+    <link rel="modulepreload" href="social.js">
 </body>
 </html>"""
 
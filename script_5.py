@@ -0,0 +1,105 @@
+# Create the service worker that script.js registers at /sw.js
+import json
+import os
+
+from precache import cache_version
+
+# The pages and assets of the site, as build.py hands them to this script
+ASSETS = ('index.html', 'styles.css', 'script.js', 'profile.js', 'success.js', 'social.js')
+
+files = {}
+for name in ASSETS:
+    if os.path.exists(name):
+        with open(name, 'rb') as f:
+            files[name] = f.read()
+
+precache_urls = ['/'] + ['/' + name for name in sorted(files)]
+
+# Cache name: the same content hash the release build uses
+version = cache_version(files)
+
+sw_js = """// Career Journaling Service Worker
+// Precaches the site under a cache named after the assets' content hashes.
+// Precached assets are served cache-first; pages are served
+// stale-while-revalidate so repeat visits render without the network.
+// The release build rewrites CACHE_NAME and PRECACHE_URLS with the
+// fingerprinted asset URLs.
+
+const CACHE_PREFIX = 'career-journal-';
+const CACHE_NAME = 'career-journal-__VERSION__';
+const PRECACHE_URLS = __PRECACHE_URLS__;
+const PRECACHE_PATHS = new Set(PRECACHE_URLS);
+
+self.addEventListener('install', (event) => {
+    event.waitUntil(
+        caches.open(CACHE_NAME)
+            .then((cache) => cache.addAll(PRECACHE_URLS))
+            .then(() => self.skipWaiting())
+    );
+});
+
+// Drop the caches of previous builds
+self.addEventListener('activate', (event) => {
+    event.waitUntil(
+        caches.keys()
+            .then((names) => Promise.all(names
+                .filter((name) => name.startsWith(CACHE_PREFIX) && name !== CACHE_NAME)
+                .map((name) => caches.delete(name))))
+            .then(() => self.clients.claim())
+    );
+});
+
+function cacheFirst(request) {
+    return caches.open(CACHE_NAME)
+        .then((cache) => cache.match(request))
+        .then((cached) => cached || fetch(request));
+}
+
+function staleWhileRevalidate(event) {
+    const request = event.request;
+    // Campaign links (?utm_source=...) share the cached page
+    const key = new URL(request.url).pathname;
+    return caches.open(CACHE_NAME).then((cache) => cache.match(key).then((cached) => {
+        const network = fetch(request).then((response) => {
+            if (response.ok && !response.redirected) {
+                cache.put(key, response.clone());
+            }
+            return response;
+        });
+        if (cached) {
+            event.waitUntil(network.catch(() => undefined));
+            return cached;
+        }
+        return network;
+    }));
+}
+
+self.addEventListener('fetch', (event) => {
+    const request = event.request;
+    const url = new URL(request.url);
+    // Supabase, analytics and font CDN requests go straight to the network
+    if (request.method !== 'GET' || url.origin !== self.location.origin) {
+        return;
+    }
+    if (request.mode === 'navigate' || url.pathname.endsWith('.html')) {
+        event.respondWith(staleWhileRevalidate(event));
+    } else if (PRECACHE_PATHS.has(url.pathname)) {
+        event.respondWith(cacheFirst(request));
+    }
+});
+"""
+sw_js = sw_js.replace('__VERSION__', version).replace('__PRECACHE_URLS__', json.dumps(precache_urls))
+
+# Save the service worker
+with open('sw.js', 'w', encoding='utf-8') as f:
+    f.write(sw_js)
+
+print("✅ sw.js created successfully!")
+print(f"📄 File size: {len(sw_js)} characters")
+print(f"🗃️ Cache: career-journal-{version} ({len(precache_urls)} URLs)")
+print("\n⚡ SERVICE WORKER FEATURES:")
+print("• Precaches pages, styles and scripts on install")
+print("• Versioned cache name derived from the asset hashes")
+print("• Cache-first static assets, stale-while-revalidate pages")
+print("• Old caches removed on activation")
+print("• Cross-origin and non-GET requests bypass the worker")
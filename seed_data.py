@@ -0,0 +1,285 @@
+# Seeded synthetic data for the Supabase schema
+#
+# Generates N users with the signup mix the funnel sees (sources, providers,
+# onboarding drop-off), their journal settings and a history of weekly
+# journal entries with realistic JSONB payloads and score distributions.
+# Every user is derived from (seed, index) alone, so output is reproducible
+# and streamed: memory stays flat at any N.
+#
+# The output is a psql script of COPY ... FROM STDIN blocks:
+#
+#   python seed_data.py --users 100000 | psql "$DATABASE_URL"
+#   python seed_data.py --users 10000 --seed 7 --out seed.sql
+#
+# auth.users rows are copied with triggers disabled (session_replication_role
+# = replica, needs a superuser, as on a local Supabase stack), so the
+# profile, settings and analytics rows handle_new_user() would create are
+# copied directly with their historical timestamps.  public.users and
+# journal_entries load with triggers on: their statement-level triggers keep
+# the signup rollup, daily_metrics and user_analytics current.  db_bench.py
+# loads the same steps through psycopg.
+
+import argparse
+import json
+import math
+import random
+import sys
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+
+DEFAULT_SEED = 42
+DEFAULT_DAYS = 365
+# Users per journal_entries COPY: each COPY is one trigger statement, and the
+# analytics trigger holds its changes in memory
+ENTRY_BATCH = 2000
+
+FIRST_NAMES = ('Alex', 'Sam', 'Jordan', 'Taylor', 'Morgan', 'Casey', 'Riley', 'Jamie', 'Avery', 'Quinn',
+               'Priya', 'Wei', 'Carlos', 'Amara', 'Yuki', 'Olivia', 'Noah', 'Fatima', 'Lukas', 'Sofia')
+UTM_SOURCES = {'direct': 40, 'google': 25, 'linkedin': 15, 'newsletter': 10, 'twitter': 5, 'referral': 5}
+AUTH_PROVIDERS = {'email': 60, 'google': 30, 'linkedin': 10}
+ONBOARDING_RATE = 0.65
+REMINDER_DAYS = {'friday': 50, 'thursday': 15, 'monday': 15, 'wednesday': 8, 'tuesday': 7,
+                 'sunday': 4, 'saturday': 1}
+REMINDER_TIMES = {'16:00:00': 55, '17:00:00': 15, '09:00:00': 15, '12:00:00': 10, '20:00:00': 5}
+CAREER_GOALS = ('promotion', 'skill-development', 'leadership', 'career-change', 'work-life-balance',
+                'salary-increase', 'other')
+JOB_TITLES = ('Software Engineer', 'Product Manager', 'Designer', 'Data Analyst', 'Marketing Manager',
+              'Engineering Manager', 'Consultant', 'Sales Lead', 'Researcher', 'Operations Manager')
+# Skill popularity is long-tailed: weights fall off as 1/rank
+SKILLS = ('communication', 'sql', 'python', 'stakeholder management', 'planning', 'mentoring',
+          'public speaking', 'negotiation', 'data analysis', 'writing', 'prioritization', 'hiring',
+          'system design', 'budgeting', 'facilitation', 'customer research', 'delegation', 'coaching')
+SKILL_WEIGHTS = tuple(1 / rank for rank in range(1, len(SKILLS) + 1))
+WEEKDAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday')
+WINS = ('shipped the release', 'closed a deal', 'unblocked the team', 'finished the analysis',
+        'good 1:1 with my manager', 'presented to leadership', 'fixed a nasty bug', 'hired a candidate')
+LEARNINGS = ('ask earlier', 'write the plan down first', 'smaller pull requests', 'say no more often',
+             'check assumptions with data', 'listen before proposing')
+CHALLENGES = ('too many meetings', 'unclear priorities', 'scope creep', 'context switching', 'low energy')
+RELATIONSHIPS = ('manager', 'peers', 'cross-functional partners', 'direct reports', 'customers', 'mentor')
+
+AUTH_USER_COLUMNS = ('id', 'email', 'raw_user_meta_data', 'created_at', 'updated_at')
+USER_COLUMNS = ('id', 'first_name', 'email', 'auth_provider', 'utm_source', 'onboarding_completed',
+                'created_at', 'updated_at')
+SETTINGS_COLUMNS = ('user_id', 'send_reminder', 'reminder_day', 'reminder_time', 'career_goal', 'job_title',
+                    'created_at', 'updated_at')
+ANALYTICS_COLUMNS = ('user_id', 'created_at')
+ENTRY_COLUMNS = ('user_id', 'week_start_date', 'week_end_date', 'weekly_goals', 'primary_skill_focus',
+                 'relationship_focus', 'daily_entries', 'accomplishments', 'insights_learned',
+                 'challenges_faced', 'skills_applied', 'productivity_score', 'learning_score',
+                 'collaboration_score', 'goal_progress_score', 'satisfaction_score', 'completion_status',
+                 'completion_date', 'created_at', 'updated_at')
+
+
+# ---------------------------------------------------------------------------
+# Users and entries
+# ---------------------------------------------------------------------------
+
+def _pick(rng, weights):
+    return rng.choices(tuple(weights), weights=tuple(weights.values()))[0]
+
+
+def _score(rng, mean, spread=1.5):
+    return min(10, max(1, round(rng.gauss(mean, spread))))
+
+
+def _monday(day):
+    return day - timedelta(days=day.weekday())
+
+
+def user_profile(seed, index, end, days):
+    """Signup attributes and engagement of user ``index``."""
+    rng = random.Random(f'{seed}:{index}:user')
+    # Signups grow over the window: later days are more likely
+    age = int(days * (1 - math.sqrt(rng.random())))
+    signed_up = datetime.combine(end - timedelta(days=age), time(), timezone.utc) + timedelta(
+        seconds=rng.randrange(86400))
+    onboarded = rng.random() < ONBOARDING_RATE
+    return {
+        'index': index,
+        'id': uuid.UUID(int=rng.getrandbits(128), version=4),
+        'first_name': rng.choice(FIRST_NAMES),
+        'email': f'user{index}@example.com',
+        'auth_provider': _pick(rng, AUTH_PROVIDERS),
+        'utm_source': _pick(rng, UTM_SOURCES),
+        'onboarding_completed': onboarded,
+        'created_at': signed_up,
+        # Engagement: weekly journaling probability and weeks until churn;
+        # users who skipped onboarding rarely journal
+        'engagement': rng.betavariate(2, 3) * (1 if onboarded else 0.2),
+        'churn_weeks': int(rng.expovariate(1 / 20)) + 1,
+        'baseline': rng.uniform(4, 8),
+        'reminder_day': _pick(rng, REMINDER_DAYS),
+        'reminder_time': _pick(rng, REMINDER_TIMES),
+        'send_reminder': rng.random() < 0.85,
+        'career_goal': rng.choice(CAREER_GOALS) if onboarded else None,
+        'job_title': rng.choice(JOB_TITLES) if onboarded else None,
+    }
+
+
+def weekly_entry(rng, user_id, week, mood, completed):
+    """One journal_entries row for the week starting ``week``."""
+    daily = {}
+    for day in rng.sample(WEEKDAYS, rng.randint(2, 5)):
+        daily[day] = {'energy': _score(rng, mood, 2), 'win': rng.choice(WINS), 'learning': rng.choice(LEARNINGS)}
+    skills = sorted(set(rng.choices(SKILLS, weights=SKILL_WEIGHTS, k=rng.randint(1, 4))), key=SKILLS.index)
+    written = datetime.combine(week + timedelta(days=4), time(16), timezone.utc) + timedelta(
+        minutes=rng.randrange(240))
+    return {
+        'user_id': user_id,
+        'week_start_date': week,
+        'week_end_date': week + timedelta(days=6),
+        'weekly_goals': [rng.choice(WINS) for _ in range(rng.randint(1, 3))],
+        'primary_skill_focus': skills[0],
+        'relationship_focus': rng.choice(RELATIONSHIPS),
+        'daily_entries': daily,
+        'accomplishments': rng.sample(WINS, rng.randint(0, 4)),
+        'insights_learned': rng.sample(LEARNINGS, rng.randint(0, 3)),
+        'challenges_faced': rng.sample(CHALLENGES, rng.randint(0, 2)),
+        'skills_applied': skills,
+        'productivity_score': _score(rng, mood),
+        'learning_score': _score(rng, mood - 0.5),
+        'collaboration_score': _score(rng, mood + 0.5),
+        'goal_progress_score': _score(rng, mood - 1),
+        'satisfaction_score': _score(rng, mood),
+        'completion_status': 'completed' if completed else 'draft',
+        'completion_date': written if completed else None,
+        'created_at': written - timedelta(days=rng.randint(0, 3)),
+        'updated_at': written,
+    }
+
+
+def entries_for(seed, user, end):
+    """Weekly journal entries of one user, from signup week through ``end``."""
+    rng = random.Random(f'{seed}:{user["index"]}:entries')
+    week = _monday(user['created_at'].date())
+    last_week = _monday(end)
+    for _ in range(user['churn_weeks']):
+        if week > last_week:
+            break
+        current = week
+        week += timedelta(days=7)
+        if rng.random() >= user['engagement']:
+            continue
+        # The current week is usually still a draft
+        completed = current < last_week and rng.random() < 0.9
+        yield weekly_entry(rng, user['id'], current, user['baseline'] + rng.gauss(0, 1), completed)
+
+
+# ---------------------------------------------------------------------------
+# COPY streams
+# ---------------------------------------------------------------------------
+
+def copy_value(value):
+    """One field in COPY text format."""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ')
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value, separators=(',', ':'))
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+def copy_line(row, columns):
+    return '\t'.join(copy_value(row[c]) for c in columns) + '\n'
+
+
+def steps(users, seed=DEFAULT_SEED, end=None, days=DEFAULT_DAYS):
+    """The load, in order: ``('sql', statement)`` or ``('copy', table, columns, lines)``.
+
+    ``lines`` are lazily generated COPY text lines.
+    """
+    end = end or datetime.now(timezone.utc).date()
+
+    def profiles(start=0, stop=users):
+        return (user_profile(seed, i, end, days) for i in range(start, stop))
+
+    def auth_rows():
+        for u in profiles():
+            meta = {'first_name': u['first_name'], 'provider': u['auth_provider']}
+            yield copy_line({'id': u['id'], 'email': u['email'], 'raw_user_meta_data': meta,
+                             'created_at': u['created_at'], 'updated_at': u['created_at']}, AUTH_USER_COLUMNS)
+
+    def user_rows():
+        for u in profiles():
+            yield copy_line({**u, 'updated_at': u['created_at']}, USER_COLUMNS)
+
+    def settings_rows():
+        for u in profiles():
+            yield copy_line({**u, 'user_id': u['id'], 'updated_at': u['created_at']}, SETTINGS_COLUMNS)
+
+    def analytics_rows():
+        for u in profiles():
+            yield copy_line({'user_id': u['id'], 'created_at': u['created_at']}, ANALYTICS_COLUMNS)
+
+    def entry_rows(start, stop):
+        for u in profiles(start, stop):
+            for entry in entries_for(seed, u, end):
+                yield copy_line(entry, ENTRY_COLUMNS)
+
+    first_week = _monday(end - timedelta(days=days))
+    return [
+        ('sql', f"SELECT * FROM public.maintain_journal_entry_partitions(4, NULL, '{first_week}')"),
+        ('sql', "SET session_replication_role = replica"),
+        ('copy', 'auth.users', AUTH_USER_COLUMNS, auth_rows()),
+        ('sql', "SET session_replication_role = DEFAULT"),
+        ('copy', 'public.users', USER_COLUMNS, user_rows()),
+        ('copy', 'public.journal_settings', SETTINGS_COLUMNS, settings_rows()),
+        ('copy', 'public.user_analytics', ANALYTICS_COLUMNS, analytics_rows()),
+    ] + [
+        ('copy', 'public.journal_entries', ENTRY_COLUMNS, entry_rows(start, min(start + ENTRY_BATCH, users)))
+        for start in range(0, users, ENTRY_BATCH)
+    ] + [
+        ('sql', "SELECT public.refresh_retention_cohorts(NULL)"),
+        ('sql', "ANALYZE"),
+    ]
+
+
+def write_script(out, load_steps):
+    """Write ``load_steps`` as a psql script; returns rows per table."""
+    counts = {}
+    out.write("\\set ON_ERROR_STOP on\nBEGIN;\n")
+    for step in load_steps:
+        if step[0] == 'sql':
+            out.write(step[1] + ";\n")
+            continue
+        _, table, columns, lines = step
+        out.write(f"COPY {table} ({', '.join(columns)}) FROM STDIN;\n")
+        n = 0
+        for line in lines:
+            out.write(line)
+            n += 1
+        out.write("\\.\n")
+        counts[table] = counts.get(table, 0) + n
+    out.write("COMMIT;\n")
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate seeded synthetic data as a psql COPY script.')
+    parser.add_argument('--users', type=int, default=10000, help='number of users (default: 10000)')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help=f'random seed (default: {DEFAULT_SEED})')
+    parser.add_argument('--days', type=int, default=DEFAULT_DAYS,
+                        help=f'signups spread over this many days before --end (default: {DEFAULT_DAYS})')
+    parser.add_argument('--end', type=date.fromisoformat, help='last signup date, YYYY-MM-DD (default: today)')
+    parser.add_argument('--out', help='write the script here instead of stdout')
+    args = parser.parse_args(argv)
+
+    load_steps = steps(args.users, args.seed, args.end, args.days)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            counts = write_script(f, load_steps)
+    else:
+        counts = write_script(sys.stdout, load_steps)
+    # Progress goes to stderr so stdout can be piped into psql
+    summary = ', '.join(f"{table} {n:,}" for table, n in counts.items())
+    print(f"✅ Generated {summary}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
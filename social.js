@@ -0,0 +1,26 @@
+// Career Journaling Signup Form - social login
+// Loaded by script.js on demand or when the browser is idle; the
+// methods are installed on CareerJournalingSignup, so `this` is the flow.
+
+export default {
+    async handleSocialLogin(provider) {
+        this.trackEvent('social_login_started', { provider });
+        this.setLoading(true, `Connecting to ${provider}...`);
+        
+        try {
+            // In a real implementation, this would use Supabase Auth
+            // supabase.auth.signInWithOAuth({ provider })
+            
+            // Simulate social login
+            await new Promise(resolve => setTimeout(resolve, 2000));
+            
+            // For demo, go directly to success
+            this.showSuccess();
+            
+        } catch (error) {
+            this.showError(`Failed to connect with ${provider}. Please try again.`);
+        } finally {
+            this.setLoading(false);
+        }
+    }
+};
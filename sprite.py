@@ -0,0 +1,250 @@
+# Inline-SVG to sprite extraction
+#
+# Moves the icons inlined in the pages (Google, LinkedIn, password toggle,
+# success check, calendar) into one cacheable icons.svg of <symbol>s and
+# replaces each inline <svg> with a <use> reference.  Identical icons across
+# pages share one symbol.  Path data is optimized on the way: coordinates are
+# rounded to PRECISION decimals, <line>/<polyline> become path data, and
+# consecutive stroke-only shapes with the same attributes are merged into one
+# <path>.
+#
+# Runs as a release stage and standalone on any set of pages:
+#
+#   python sprite.py index.html index_1.html index_2.html --out sprited/
+
+import argparse
+import hashlib
+import os
+import re
+import sys
+
+SPRITE = 'icons.svg'
+PRECISION = 2
+
+SVG_RE = re.compile(r'<svg\b([^>]*)>(.*?)</svg>', re.S)
+ELEMENT_RE = re.compile(r'<(\w+)\b([^>]*?)\s*(?:/>|>\s*</\1>)', re.S)
+ATTR_RE = re.compile(r'([\w:-]+)="([^"]*)"')
+START_TAG_RE = re.compile(r'<(\w+)\b([^>]*)>')
+PATH_COMMANDS = 'MmZzLlHhVvCcSsQqTtAa'
+NUMBER_RE = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+
+
+# ---------------------------------------------------------------------------
+# Path data
+# ---------------------------------------------------------------------------
+
+def parse_path(d):
+    """Tokenize path data into command letters and floats.
+
+    Arc flags are single characters and may be packed ("a2 2 0 01-2 2").
+    """
+    tokens = []
+    command = None
+    arg = 0
+    i = 0
+    while i < len(d):
+        ch = d[i]
+        if ch in PATH_COMMANDS:
+            tokens.append(ch)
+            command, arg = ch, 0
+            i += 1
+        elif ch in ' ,\t\r\n':
+            i += 1
+        elif command in ('A', 'a') and arg % 7 in (3, 4):
+            tokens.append(float(ch))
+            arg += 1
+            i += 1
+        else:
+            match = NUMBER_RE.match(d, i)
+            if match is None:
+                raise ValueError(f"bad path data at {d[i:i + 10]!r}")
+            tokens.append(float(match.group()))
+            arg += 1
+            i = match.end()
+    return tokens
+
+
+def format_number(value, precision=PRECISION):
+    text = f"{round(value, precision):.{precision}f}".rstrip('0').rstrip('.')
+    if text in ('-0', ''):
+        text = '0'
+    if text.startswith('0.'):
+        text = text[1:]
+    elif text.startswith('-0.'):
+        text = '-' + text[2:]
+    return text
+
+
+def serialize_path(tokens, precision=PRECISION):
+    out = []
+    last_number = None
+    for token in tokens:
+        if isinstance(token, str):
+            out.append(token)
+            last_number = None
+            continue
+        text = format_number(token, precision)
+        # Two numbers only need a separator if they would otherwise run together
+        if last_number is not None and not (
+                text.startswith('-') or (text.startswith('.') and '.' in last_number)):
+            out.append(' ')
+        out.append(text)
+        last_number = text
+    return ''.join(out)
+
+
+def absolute_start(tokens):
+    """Make a path safe to append to another one.
+
+    A leading relative moveto is absolute only at the start of a path, so it
+    is rewritten to "M"; extra coordinate pairs after it are implicit
+    relative linetos and get an explicit "l".
+    """
+    if not tokens or tokens[0] != 'm':
+        return tokens
+    tokens = ['M'] + tokens[1:]
+    if len(tokens) > 3 and not isinstance(tokens[3], str):
+        tokens = tokens[:3] + ['l'] + tokens[3:]
+    return tokens
+
+
+def shape_to_path(tag, attrs):
+    """Path tokens for <line>/<polyline>/<path>, else None."""
+    if tag == 'path':
+        return parse_path(attrs.pop('d'))
+    if tag == 'line':
+        coords = [float(attrs.pop(k, 0)) for k in ('x1', 'y1', 'x2', 'y2')]
+        return ['M', coords[0], coords[1], 'L', coords[2], coords[3]]
+    if tag == 'polyline':
+        points = [float(n) for n in NUMBER_RE.findall(attrs.pop('points'))]
+        return ['M'] + points[:2] + (['L'] + points[2:] if len(points) > 2 else [])
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Symbols
+# ---------------------------------------------------------------------------
+
+def render_attrs(attrs):
+    return ''.join(f' {name}="{value}"' for name, value in attrs.items())
+
+
+def optimize_shapes(inner, stroke_only):
+    """Round, convert and merge the shapes inside one icon."""
+    shapes = []
+    for tag, raw in ELEMENT_RE.findall(inner):
+        attrs = dict(ATTR_RE.findall(raw))
+        tokens = shape_to_path(tag, attrs)
+        merge = (tokens is not None and stroke_only and 'fill' not in attrs and shapes
+                 and shapes[-1][0] == 'path' and shapes[-1][1] == attrs)
+        if merge:
+            shapes[-1][2].extend(absolute_start(tokens))
+        elif tokens is not None:
+            shapes.append(('path', attrs, absolute_start(tokens)))
+        else:
+            for key in ('x', 'y', 'cx', 'cy', 'r', 'rx', 'ry', 'width', 'height'):
+                if key in attrs:
+                    attrs[key] = format_number(float(attrs[key]))
+            shapes.append((tag, attrs, None))
+
+    out = []
+    for tag, attrs, tokens in shapes:
+        if tokens is not None:
+            attrs = {'d': serialize_path(tokens), **attrs}
+        out.append(f'<{tag}{render_attrs(attrs)}/>')
+    return ''.join(out)
+
+
+def symbol_name(html, start):
+    """Readable id from the element the icon sits in (id, else first class)."""
+    for tag in reversed(list(START_TAG_RE.finditer(html, 0, start))):
+        attrs = dict(ATTR_RE.findall(tag.group(2)))
+        label = attrs.get('id') or (attrs.get('class') or '').split(' ')[0]
+        if label:
+            return 'icon-' + re.sub(r'(?<!^)(?=[A-Z])', '-', label).lower()
+    return 'icon'
+
+
+def extract_sprite(pages, sprite_url=SPRITE):
+    """Replace inline <svg> icons in ``pages`` with <use> references.
+
+    ``pages`` maps names to HTML text.  Returns ``(pages, sprite_svg)``.
+    """
+    symbols = {}  # hash of symbol markup -> (id, markup)
+    ids = set()
+    result = {}
+    for name, html in pages.items():
+        out = []
+        last = 0
+        for match in SVG_RE.finditer(html):
+            attrs = dict(ATTR_RE.findall(match.group(1)))
+            view_box = attrs.pop('viewBox', None)
+            if view_box is None or '<use' in match.group(2):
+                continue
+            stroke_only = attrs.get('fill') == 'none'
+            inner = optimize_shapes(match.group(2), stroke_only)
+            symbol = f'<symbol id="{{id}}" viewBox="{view_box}">{inner}</symbol>'
+            key = hashlib.sha256(symbol.encode('utf-8')).hexdigest()
+            if key not in symbols:
+                base = symbol_name(html, match.start())
+                symbol_id, n = base, 2
+                while symbol_id in ids:
+                    symbol_id, n = f"{base}-{n}", n + 1
+                ids.add(symbol_id)
+                symbols[key] = (symbol_id, symbol.replace('{id}', symbol_id, 1))
+            symbol_id = symbols[key][0]
+            out.append(html[last:match.start()])
+            out.append(f'<svg{render_attrs(attrs)}><use href="{sprite_url}#{symbol_id}"/></svg>')
+            last = match.end()
+        out.append(html[last:])
+        result[name] = ''.join(out)
+
+    sprite = ('<svg xmlns="http://www.w3.org/2000/svg">'
+              + ''.join(markup for _, markup in symbols.values()) + '</svg>\n')
+    return result, (sprite if symbols else None)
+
+
+def sprite_icons(site, log):
+    """Release stage: move inline icons into a shared, cacheable sprite."""
+    pages = {name: data.decode('utf-8') for name, data in site.items() if name.endswith('.html')}
+    pages_out, sprite = extract_sprite(pages)
+    if sprite is None:
+        return site
+
+    site = dict(site)
+    before = sum(len(data) for name, data in site.items() if name in pages)
+    for name, html in pages_out.items():
+        site[name] = html.encode('utf-8')
+    site[SPRITE] = sprite.encode('utf-8')
+    after = sum(len(site[name]) for name in pages)
+    log.append(f"🧩 {SPRITE}: {sprite.count('<symbol')} icon(s), "
+               f"HTML {before:,} → {after:,} bytes, sprite {len(site[SPRITE]):,} bytes")
+    return site
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Extract inline SVG icons into a shared sprite.')
+    parser.add_argument('pages', nargs='+', help='HTML pages to rewrite')
+    parser.add_argument('--out', required=True, help='directory for the rewritten pages and ' + SPRITE)
+    args = parser.parse_args(argv)
+
+    pages = {}
+    for path in args.pages:
+        with open(path, encoding='utf-8') as f:
+            pages[os.path.basename(path)] = f.read()
+    pages_out, sprite = extract_sprite(pages)
+
+    os.makedirs(args.out, exist_ok=True)
+    for name, html in pages_out.items():
+        with open(os.path.join(args.out, name), 'w', encoding='utf-8') as f:
+            f.write(html)
+    if sprite:
+        with open(os.path.join(args.out, SPRITE), 'w', encoding='utf-8') as f:
+            f.write(sprite)
+    saved = sum(len(p) for p in pages.values()) - sum(len(p) for p in pages_out.values())
+    print(f"✅ {sprite.count('<symbol') if sprite else 0} icon(s) in {SPRITE}, {saved:,} bytes moved out of the HTML")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,80 @@
+// Career Journaling Signup Form - success step
+// Loaded by script.js on demand or when the browser is idle; the
+// methods are installed on CareerJournalingSignup, so `this` is the flow.
+
+export default {
+    showSuccessStep() {
+        const signupForm = document.getElementById('signupForm');
+        const profileForm = document.getElementById('profileForm');
+        const successContainer = document.getElementById('successContainer');
+        
+        if (signupForm) signupForm.style.display = 'none';
+        if (profileForm) profileForm.style.display = 'none';
+        if (successContainer) {
+            successContainer.style.display = 'block';
+            successContainer.scrollIntoView({ behavior: 'smooth' });
+        }
+        
+        this.currentStep = 3;
+        
+        // Track conversion (in real app, send to analytics)
+        this.trackConversion();
+    },
+
+    addCalendarReminder() {
+        // Generate calendar event for Friday journaling
+        const event = {
+            title: 'Weekly Career Journal Reflection',
+            description: 'Time to reflect on this week\'s professional growth and document key experiences.',
+            start: this.getNextFriday(),
+            duration: 20, // 20 minutes
+            recurring: 'weekly'
+        };
+        
+        this.trackEvent('calendar_reminder_added');
+        const googleCalendarUrl = this.generateGoogleCalendarUrl(event);
+        window.open(googleCalendarUrl, '_blank');
+    },
+
+    getNextFriday() {
+        const today = new Date();
+        const daysUntilFriday = (5 - today.getDay() + 7) % 7 || 7;
+        const nextFriday = new Date(today);
+        nextFriday.setDate(today.getDate() + daysUntilFriday);
+        nextFriday.setHours(16, 0, 0, 0); // 4 PM
+        return nextFriday;
+    },
+
+    generateGoogleCalendarUrl(event) {
+        const baseUrl = 'https://calendar.google.com/calendar/render';
+        const params = new URLSearchParams({
+            action: 'TEMPLATE',
+            text: event.title,
+            details: event.description,
+            dates: this.formatCalendarDate(event.start),
+            recur: 'RRULE:FREQ=WEEKLY;BYDAY=FR'
+        });
+        
+        return `${baseUrl}?${params.toString()}`;
+    },
+
+    formatCalendarDate(date) {
+        const start = new Date(date);
+        const end = new Date(start.getTime() + (20 * 60 * 1000)); // 20 minutes later
+        
+        const formatDate = (d) => {
+            return d.toISOString().replace(/[-:]/g, '').split('.')[0] + 'Z';
+        };
+        
+        return `${formatDate(start)}/${formatDate(end)}`;
+    },
+
+    startJournaling() {
+        // In a real app, this would redirect to the journal interface
+        window.location.href = '/journal';
+    },
+
+    trackConversion() {
+        this.trackEvent('signup_completed');
+    }
+};
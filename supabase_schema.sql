@@ -34,87 +34,214 @@ CREATE TABLE public.journal_settings (
     job_title TEXT CHECK (length(job_title) <= 100),
     created_at TIMESTAMPTZ DEFAULT NOW(),
     updated_at TIMESTAMPTZ DEFAULT NOW(),
-
+    
     -- Ensure one settings record per user
     UNIQUE(user_id)
 );
 
 -- Journal entries table (for future analytics)
+-- Range-partitioned by quarter on week_start_date; partitions are managed by
+-- public.maintain_journal_entry_partitions() below. Keys must include the
+-- partition column, hence the composite primary key.
 CREATE TABLE public.journal_entries (
-    id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
+    id UUID DEFAULT gen_random_uuid(),
     user_id UUID REFERENCES public.users(id) ON DELETE CASCADE NOT NULL,
     week_start_date DATE NOT NULL,
     week_end_date DATE NOT NULL,
-
+    
     -- Weekly goals and focus
     weekly_goals JSONB,
     primary_skill_focus TEXT,
     relationship_focus TEXT,
-
+    
     -- Daily entries (stored as JSONB for flexibility)
     daily_entries JSONB DEFAULT '{}',
-
+    
     -- Weekly reflection
     accomplishments JSONB,
     insights_learned JSONB,
     challenges_faced JSONB,
     skills_applied JSONB,
-
+    
     -- Performance metrics
     productivity_score INTEGER CHECK (productivity_score >= 1 AND productivity_score <= 10),
     learning_score INTEGER CHECK (learning_score >= 1 AND learning_score <= 10),
     collaboration_score INTEGER CHECK (collaboration_score >= 1 AND collaboration_score <= 10),
     goal_progress_score INTEGER CHECK (goal_progress_score >= 1 AND goal_progress_score <= 10),
     satisfaction_score INTEGER CHECK (satisfaction_score >= 1 AND satisfaction_score <= 10),
-
+    
     -- Metadata
     completion_status TEXT DEFAULT 'draft' CHECK (completion_status IN ('draft', 'completed')),
     completion_date TIMESTAMPTZ,
     created_at TIMESTAMPTZ DEFAULT NOW(),
     updated_at TIMESTAMPTZ DEFAULT NOW(),
+    
+    PRIMARY KEY (id, week_start_date),
+    
+    -- Ensure one entry per user per week, keyed by the week's Monday: the
+    -- analytics count completed entries as completed weeks
+    UNIQUE(user_id, week_start_date),
+    CHECK (EXTRACT(ISODOW FROM week_start_date) = 1)
+) PARTITION BY RANGE (week_start_date);
 
-    -- Ensure one entry per user per week
-    UNIQUE(user_id, week_start_date)
-);
+-- Detached journal_entries partitions are moved here, out of the API's reach,
+-- and re-attached under journal_archive.journal_entries. Archived entries
+-- still count towards lifetime analytics: update_user_analytics_bulk() and
+-- refresh_retention_cohorts() read both parents, matching the incremental
+-- totals, which archiving leaves untouched.
+CREATE SCHEMA IF NOT EXISTS journal_archive;
+CREATE TABLE journal_archive.journal_entries (LIKE public.journal_entries)
+    PARTITION BY RANGE (week_start_date);
 
 -- User analytics summary (for future ML/AI insights)
 CREATE TABLE public.user_analytics (
     id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
     user_id UUID REFERENCES public.users(id) ON DELETE CASCADE NOT NULL,
-
+    
     -- Computed metrics
     total_entries INTEGER DEFAULT 0,
-    consistency_score DECIMAL(3,2), -- 0.00 to 1.00
-    average_productivity DECIMAL(3,2),
-    average_satisfaction DECIMAL(3,2),
+    consistency_score DECIMAL(3,2), -- 0.00 to 1.00: completed weeks / weeks since signup
+    average_productivity DECIMAL(4,2), -- 1.00 to 10.00
+    average_satisfaction DECIMAL(4,2),
     growth_trend JSONB, -- Store trend data as JSON
-
+    
+    -- Running totals behind the averages, maintained incrementally
+    productivity_sum INTEGER DEFAULT 0,
+    productivity_count INTEGER DEFAULT 0,
+    satisfaction_sum INTEGER DEFAULT 0,
+    satisfaction_count INTEGER DEFAULT 0,
+    
     -- Key insights
     top_skills JSONB,
     collaboration_patterns JSONB,
     achievement_patterns JSONB,
-
+    
     -- Computed at
     last_computed_at TIMESTAMPTZ DEFAULT NOW(),
     created_at TIMESTAMPTZ DEFAULT NOW(),
     updated_at TIMESTAMPTZ DEFAULT NOW(),
-
+    
     UNIQUE(user_id)
 );
 
+-- Users whose analytics cannot be patched incrementally and need a recompute
+CREATE TABLE public.analytics_dirty_users (
+    user_id UUID PRIMARY KEY REFERENCES public.users(id) ON DELETE CASCADE,
+    queued_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Daily numeric metrics from journal_entries.daily_entries, one typed row per
+-- user and day, maintained by triggers so trend queries skip JSON decoding
+CREATE TABLE public.daily_metrics (
+    user_id UUID REFERENCES public.users(id) ON DELETE CASCADE NOT NULL,
+    entry_date DATE NOT NULL,
+    week_start_date DATE NOT NULL,
+    energy SMALLINT,
+    
+    PRIMARY KEY (user_id, entry_date)
+);
+
+-- Signup funnel rollup: signups per UTC day × source × provider × onboarding
+-- state, kept exact by triggers on public.users
+CREATE TABLE public.signup_rollup_daily (
+    signup_date DATE NOT NULL,
+    utm_source TEXT NOT NULL,
+    auth_provider auth_provider_type NOT NULL,
+    onboarding_completed BOOLEAN NOT NULL,
+    signups INTEGER NOT NULL DEFAULT 0,
+    
+    PRIMARY KEY (signup_date, utm_source, auth_provider, onboarding_completed)
+);
+
+-- Weekly journaling retention: users of a signup-week cohort with an entry in
+-- a given journal week, refreshed by public.refresh_retention_cohorts()
+CREATE TABLE public.retention_cohort_weekly (
+    cohort_week DATE NOT NULL,
+    activity_week DATE NOT NULL,
+    active_users INTEGER NOT NULL,
+    
+    PRIMARY KEY (cohort_week, activity_week)
+);
+
+-- Journal weeks before the current one whose entries were added, removed or
+-- moved since the last refresh_retention_cohorts(), which recounts them
+CREATE TABLE public.retention_dirty_weeks (
+    activity_week DATE PRIMARY KEY,
+    queued_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- One changed completed entry, as seen by the analytics triggers
+CREATE TYPE public.analytics_change AS (
+    user_id UUID,
+    sign INTEGER, -- +1 entry counted, -1 entry no longer counted
+    productivity_score INTEGER,
+    satisfaction_score INTEGER
+);
+
+-- Typed metric rows for one week's daily_entries object; weekday keys are
+-- placed on the calendar relative to week_start_date. Energy outside the
+-- 1-10 scale is stored as NULL: the sync trigger runs inside the journal
+-- save, and a side table must never be able to reject it.
+CREATE OR REPLACE FUNCTION public.daily_metric_rows(week_start_date DATE, daily_entries JSONB)
+RETURNS TABLE (entry_date DATE, energy SMALLINT) AS $$
+    SELECT
+        week_start_date + (array_position(
+            ARRAY['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday'], day.key
+        ) - EXTRACT(ISODOW FROM week_start_date)::INTEGER + 7) % 7,
+        CASE WHEN jsonb_typeof(day.value->'energy') = 'number' THEN
+            CASE WHEN ROUND((day.value->>'energy')::NUMERIC) BETWEEN 1 AND 10
+                 THEN ROUND((day.value->>'energy')::NUMERIC)::SMALLINT END
+        END
+    FROM jsonb_each(CASE WHEN jsonb_typeof(daily_entries) = 'object' THEN daily_entries ELSE '{}' END) AS day
+    WHERE day.key IN ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday');
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Lowest "energy" recorded on any day of a daily_entries object
+CREATE OR REPLACE FUNCTION public.lowest_daily_energy(daily_entries JSONB)
+RETURNS NUMERIC AS $$
+    SELECT MIN((day.value->>'energy')::NUMERIC)
+    FROM jsonb_each(CASE WHEN jsonb_typeof(daily_entries) = 'object' THEN daily_entries ELSE '{}' END) AS day
+    WHERE jsonb_typeof(day.value->'energy') = 'number';
+$$ LANGUAGE sql IMMUTABLE;
+
 -- Create indexes for performance
-CREATE INDEX idx_users_email ON public.users(email);
+-- users(email), journal_entries(user_id, week_start_date) and
+-- user_analytics(user_id) are already indexed by their UNIQUE constraints;
+-- the latter also serves "a user's entries by week".
 CREATE INDEX idx_users_created_at on public.users(created_at);
-CREATE INDEX idx_journal_entries_user_id ON public.journal_entries(user_id);
 CREATE INDEX idx_journal_entries_week_start ON public.journal_entries(week_start_date);
-CREATE INDEX idx_journal_entries_completion ON public.journal_entries(completion_status);
-CREATE INDEX idx_user_analytics_user_id ON public.user_analytics(user_id);
+
+-- Analytics recomputation: completed entries per user, answered from the
+-- index alone (drafts are never read by analytics)
+CREATE INDEX idx_journal_entries_completed ON public.journal_entries(user_id, week_start_date)
+    INCLUDE (productivity_score, satisfaction_score)
+    WHERE completion_status = 'completed';
+
+-- JSONB journal fields: containment/jsonpath lookups ("weeks that used skill
+-- X", "Monday energy of 1 or 2") and the lowest energy of the week
+CREATE INDEX idx_journal_entries_skills ON public.journal_entries USING GIN (skills_applied jsonb_path_ops);
+CREATE INDEX idx_journal_entries_accomplishments ON public.journal_entries USING GIN (accomplishments jsonb_path_ops);
+CREATE INDEX idx_journal_entries_daily_entries ON public.journal_entries USING GIN (daily_entries jsonb_path_ops);
+CREATE INDEX idx_journal_entries_lowest_energy ON public.journal_entries(public.lowest_daily_energy(daily_entries));
+
+-- Reminder job: who gets a reminder on a given day, in send-time order
+CREATE INDEX idx_journal_settings_reminders ON public.journal_settings(reminder_day, reminder_time)
+    INCLUDE (user_id)
+    WHERE send_reminder;
+
+-- Dirty-queue drain order
+CREATE INDEX idx_analytics_dirty_users_queued_at ON public.analytics_dirty_users(queued_at);
 
 -- Enable Row Level Security (RLS)
 ALTER TABLE public.users ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.journal_settings ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.journal_entries ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.user_analytics ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.daily_metrics ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.analytics_dirty_users ENABLE ROW LEVEL SECURITY; -- no policies: service role only
+ALTER TABLE public.signup_rollup_daily ENABLE ROW LEVEL SECURITY; -- no policies: service role only
+ALTER TABLE public.retention_cohort_weekly ENABLE ROW LEVEL SECURITY; -- no policies: service role only
+ALTER TABLE public.retention_dirty_weeks ENABLE ROW LEVEL SECURITY; -- no policies: service role only
 
 -- RLS Policies
 
@@ -140,6 +267,10 @@ CREATE POLICY "Users can manage own journal entries" ON public.journal_entries
 CREATE POLICY "Users can view own analytics" ON public.user_analytics
     FOR SELECT USING (auth.uid() = user_id);
 
+-- Daily metrics policies (read-only for users, written by triggers)
+CREATE POLICY "Users can view own daily metrics" ON public.daily_metrics
+    FOR SELECT USING (auth.uid() = user_id);
+
 -- Functions for automatic timestamp updates
 CREATE OR REPLACE FUNCTION update_updated_at()
 RETURNS TRIGGER AS $$
@@ -171,13 +302,17 @@ BEGIN
         NEW.id,
         NEW.email,
         COALESCE(NEW.raw_user_meta_data->>'first_name', split_part(NEW.email, '@', 1)),
-        COALESCE(NEW.raw_user_meta_data->>'provider', 'email')
+        COALESCE(NEW.raw_user_meta_data->>'provider', 'email')::auth_provider_type
     );
-
+    
     -- Create default journal settings
     INSERT INTO public.journal_settings (user_id)
     VALUES (NEW.id);
-
+    
+    -- Start analytics at zero so journal_entries triggers can apply deltas
+    INSERT INTO public.user_analytics (user_id)
+    VALUES (NEW.id);
+    
     RETURN NEW;
 END;
 $$ LANGUAGE plpgsql SECURITY DEFINER;
@@ -187,63 +322,829 @@ CREATE TRIGGER on_auth_user_created
     AFTER INSERT ON auth.users
     FOR EACH ROW EXECUTE FUNCTION public.handle_new_user();
 
--- Function to calculate user analytics (runs periodically)
-CREATE OR REPLACE FUNCTION public.update_user_analytics(target_user_id UUID)
-RETURNS VOID AS $$
+-- Statement-level trigger: move signups between signup_rollup_daily buckets.
+-- Changes are collected as rollup rows whose signups column is the delta, and
+-- applied in key order so concurrent statements cannot deadlock.
+CREATE OR REPLACE FUNCTION public.users_signup_rollup_delta()
+RETURNS TRIGGER AS $$
 DECLARE
-    entry_count INTEGER;
-    avg_productivity DECIMAL;
-    avg_satisfaction DECIMAL;
-    consistency DECIMAL;
+    changes public.signup_rollup_daily[];
 BEGIN
-    -- Calculate metrics from journal entries
-    SELECT 
-        COUNT(*),
-        AVG(productivity_score),
-        AVG(satisfaction_score)
-    INTO entry_count, avg_productivity, avg_satisfaction
-    FROM public.journal_entries 
-    WHERE user_id = target_user_id AND completion_status = 'completed';
-
-    -- Calculate consistency (entries per week over time)
-    SELECT 
-        CASE 
-            WHEN EXTRACT(WEEK FROM MAX(created_at)) - EXTRACT(WEEK FROM MIN(created_at)) + 1 > 0
-            THEN entry_count::DECIMAL / (EXTRACT(WEEK FROM MAX(created_at)) - EXTRACT(WEEK FROM MIN(created_at)) + 1)
-            ELSE 0
-        END
-    INTO consistency
-    FROM public.journal_entries 
-    WHERE user_id = target_user_id AND completion_status = 'completed';
+    IF TG_OP = 'INSERT' THEN
+        changes := ARRAY(
+            SELECT ROW((n.created_at AT TIME ZONE 'UTC')::DATE, COALESCE(n.utm_source, 'direct'),
+                       n.auth_provider, COALESCE(n.onboarding_completed, FALSE), 1)::public.signup_rollup_daily
+            FROM new_rows n
+        );
+    ELSIF TG_OP = 'DELETE' THEN
+        changes := ARRAY(
+            SELECT ROW((o.created_at AT TIME ZONE 'UTC')::DATE, COALESCE(o.utm_source, 'direct'),
+                       o.auth_provider, COALESCE(o.onboarding_completed, FALSE), -1)::public.signup_rollup_daily
+            FROM old_rows o
+        );
+    ELSE
+        -- Only rows whose bucket columns changed move; other updates (names,
+        -- emails, updated_at) produce no delta
+        changes := ARRAY(
+            SELECT b.change
+            FROM old_rows o
+            JOIN new_rows n ON n.id = o.id
+            CROSS JOIN LATERAL (VALUES
+                (ROW((o.created_at AT TIME ZONE 'UTC')::DATE, COALESCE(o.utm_source, 'direct'),
+                     o.auth_provider, COALESCE(o.onboarding_completed, FALSE), -1)::public.signup_rollup_daily),
+                (ROW((n.created_at AT TIME ZONE 'UTC')::DATE, COALESCE(n.utm_source, 'direct'),
+                     n.auth_provider, COALESCE(n.onboarding_completed, FALSE), 1)::public.signup_rollup_daily)
+            ) AS b(change)
+            WHERE (o.created_at, o.utm_source, o.auth_provider, o.onboarding_completed)
+                  IS DISTINCT FROM
+                  (n.created_at, n.utm_source, n.auth_provider, n.onboarding_completed)
+        );
+    END IF;
+
+    INSERT INTO public.signup_rollup_daily AS r (signup_date, utm_source, auth_provider, onboarding_completed, signups)
+    SELECT c.signup_date, c.utm_source, c.auth_provider, c.onboarding_completed, SUM(c.signups)
+    FROM unnest(changes) c
+    GROUP BY c.signup_date, c.utm_source, c.auth_provider, c.onboarding_completed
+    HAVING SUM(c.signups) <> 0
+    ORDER BY c.signup_date, c.utm_source, c.auth_provider, c.onboarding_completed
+    ON CONFLICT (signup_date, utm_source, auth_provider, onboarding_completed)
+    DO UPDATE SET signups = r.signups + EXCLUDED.signups;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+CREATE TRIGGER users_signup_rollup_insert
+    AFTER INSERT ON public.users
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.users_signup_rollup_delta();
+
+-- Transition tables rule out a column list (UPDATE OF ...); the function
+-- filters unchanged rows instead
+CREATE TRIGGER users_signup_rollup_update
+    AFTER UPDATE ON public.users
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.users_signup_rollup_delta();
+
+CREATE TRIGGER users_signup_rollup_delete
+    AFTER DELETE ON public.users
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.users_signup_rollup_delta();
+
+-- Weeks (Monday-based) from the signup week through the current one, inclusive
+CREATE OR REPLACE FUNCTION public.weeks_since(signed_up_at TIMESTAMPTZ)
+RETURNS INTEGER AS $$
+    SELECT (date_trunc('week', CURRENT_DATE)::DATE - date_trunc('week', signed_up_at)::DATE) / 7 + 1;
+$$ LANGUAGE sql STABLE;
+
+-- Consistency: share of weeks since signup with a completed entry, capped at
+-- 1.0 (entries backfilled for weeks before signup could exceed it)
+CREATE OR REPLACE FUNCTION public.analytics_consistency(completed_weeks BIGINT, signed_up_at TIMESTAMPTZ)
+RETURNS DECIMAL AS $$
+    SELECT LEAST(completed_weeks::DECIMAL / GREATEST(public.weeks_since(signed_up_at), 1), 1.0);
+$$ LANGUAGE sql STABLE;
+
+-- JSONB query helpers. They run with the caller's rights, so RLS limits
+-- clients to their own entries, and are written as containment/jsonpath
+-- matches so the GIN indexes above apply.
+
+-- Entries whose skills_applied array contains a skill
+CREATE OR REPLACE FUNCTION public.entries_with_skill(skill TEXT)
+RETURNS SETOF public.journal_entries AS $$
+    SELECT *
+    FROM public.journal_entries
+    WHERE skills_applied @> jsonb_build_array(skill);
+$$ LANGUAGE sql STABLE;
+
+-- Entries that recorded a given accomplishment
+CREATE OR REPLACE FUNCTION public.entries_with_accomplishment(accomplishment TEXT)
+RETURNS SETOF public.journal_entries AS $$
+    SELECT *
+    FROM public.journal_entries
+    WHERE accomplishments @> jsonb_build_array(accomplishment);
+$$ LANGUAGE sql STABLE;
+
+-- Entries with energy below a threshold on a given day, or on any day when
+-- day is NULL. Energy is an integer score, so "below" on one day is spelled
+-- as a jsonpath OR of equalities, which jsonb_path_ops can answer.
+CREATE OR REPLACE FUNCTION public.entries_with_low_energy(below INTEGER, day reminder_day_type DEFAULT NULL)
+RETURNS SETOF public.journal_entries AS $$
+BEGIN
+    IF day IS NULL THEN
+        RETURN QUERY
+        SELECT * FROM public.journal_entries e
+        WHERE public.lowest_daily_energy(e.daily_entries) < below;
+    ELSE
+        RETURN QUERY
+        SELECT * FROM public.journal_entries e
+        WHERE e.daily_entries @@ COALESCE(
+            (SELECT string_agg(format('$.%s.energy == %s', day, n), ' || ')
+             FROM generate_series(1, below - 1) AS n),
+            'false'
+        )::jsonpath;
+    END IF;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Most used skills per user across completed entries, as
+-- [{"skill": ..., "weeks": n}, ...]
+CREATE OR REPLACE FUNCTION public.top_skills(target_user_ids UUID[] DEFAULT NULL, skill_limit INTEGER DEFAULT 5)
+RETURNS TABLE (user_id UUID, top_skills JSONB) AS $$
+    WITH counts AS (
+        SELECT e.user_id, skill, COUNT(*) AS weeks,
+               ROW_NUMBER() OVER (PARTITION BY e.user_id ORDER BY COUNT(*) DESC, skill COLLATE "C") AS rank
+        FROM public.journal_entries e
+        CROSS JOIN LATERAL jsonb_array_elements_text(
+            CASE WHEN jsonb_typeof(e.skills_applied) = 'array' THEN e.skills_applied ELSE '[]' END
+        ) AS skill
+        WHERE e.completion_status = 'completed'
+          AND (target_user_ids IS NULL OR e.user_id = ANY(target_user_ids))
+        GROUP BY e.user_id, skill
+    )
+    SELECT c.user_id, jsonb_agg(jsonb_build_object('skill', c.skill, 'weeks', c.weeks) ORDER BY c.rank)
+    FROM counts c
+    WHERE c.rank <= skill_limit
+    GROUP BY c.user_id;
+$$ LANGUAGE sql STABLE;
+
+-- Accomplishment habits per user across completed entries
+CREATE OR REPLACE FUNCTION public.achievement_patterns(target_user_ids UUID[] DEFAULT NULL)
+RETURNS TABLE (user_id UUID, achievement_patterns JSONB) AS $$
+    WITH weeks AS (
+        SELECT e.user_id, e.week_start_date,
+               CASE WHEN jsonb_typeof(e.accomplishments) = 'array'
+                    THEN jsonb_array_length(e.accomplishments) ELSE 0 END AS accomplishments
+        FROM public.journal_entries e
+        WHERE e.completion_status = 'completed'
+          AND (target_user_ids IS NULL OR e.user_id = ANY(target_user_ids))
+    )
+    SELECT w.user_id, jsonb_build_object(
+        'total', SUM(w.accomplishments),
+        'weeks_with_accomplishments', COUNT(*) FILTER (WHERE w.accomplishments > 0),
+        'average_per_week', ROUND(AVG(w.accomplishments), 2),
+        'best_week', (array_agg(w.week_start_date ORDER BY w.accomplishments DESC, w.week_start_date DESC))[1]
+    )
+    FROM weeks w
+    GROUP BY w.user_id;
+$$ LANGUAGE sql STABLE;
+
+-- Weekly average energy per user over the last n weeks, with its trend line
+-- slope, read from daily_metrics
+CREATE OR REPLACE FUNCTION public.energy_trend(target_user_ids UUID[] DEFAULT NULL, weeks INTEGER DEFAULT 52)
+RETURNS TABLE (user_id UUID, energy_trend JSONB) AS $$
+    WITH weekly AS (
+        SELECT m.user_id, m.week_start_date, AVG(m.energy) AS energy
+        FROM public.daily_metrics m
+        WHERE m.energy IS NOT NULL
+          AND m.entry_date >= CURRENT_DATE - 7 * weeks
+          AND (target_user_ids IS NULL OR m.user_id = ANY(target_user_ids))
+        GROUP BY m.user_id, m.week_start_date
+    )
+    SELECT w.user_id, jsonb_build_object(
+        'weekly_energy', jsonb_agg(
+            jsonb_build_object('week', w.week_start_date, 'energy', ROUND(w.energy, 2))
+            ORDER BY w.week_start_date
+        ),
+        'energy_slope_per_week', ROUND(regr_slope(
+            w.energy::DOUBLE PRECISION,
+            (w.week_start_date - DATE '2000-01-03') / 7.0
+        )::NUMERIC, 4)
+    )
+    FROM weekly w
+    GROUP BY w.user_id;
+$$ LANGUAGE sql STABLE;
+
+-- Function to recompute user analytics in one set-based pass
+-- Pass NULL to recompute every user, or an array of user ids for a subset.
+-- Users without completed entries get zero counts and NULL averages.
+-- The target rows stay locked until the caller commits, and every journal
+-- save of those users waits for them: with NULL that stalls all saves for
+-- the whole run. Schedule update_user_analytics_in_batches() instead.
+CREATE OR REPLACE FUNCTION public.update_user_analytics_bulk(target_user_ids UUID[] DEFAULT NULL)
+RETURNS TABLE (rows_touched BIGINT, elapsed_ms NUMERIC) AS $$
+DECLARE
+    started_at TIMESTAMPTZ := clock_timestamp();
+    touched BIGINT;
+BEGIN
+    -- Lock the analytics rows first: a concurrent journal write then either
+    -- commits before the aggregate below (and is counted by it) or applies its
+    -- delta after this upsert, never in between.
+    PERFORM 1
+    FROM public.user_analytics a
+    WHERE target_user_ids IS NULL OR a.user_id = ANY(target_user_ids)
+    ORDER BY a.user_id
+    FOR UPDATE;
 
-    -- Upsert analytics record
+    -- Completed entries are read once; the aggregates, the streak summary, the
+    -- top skills and the accomplishment stats all come from this CTE (the
+    -- same results as top_skills() and achievement_patterns(), which only read
+    -- attached quarters). Archived quarters count too, as they do in the
+    -- incremental totals.
+    -- week_start_date is a Monday (CHECK above), so weeks are numbered from a
+    -- Monday epoch and every completed entry is a distinct completed week, as
+    -- apply_analytics_deltas() assumes.
+    WITH completed AS (
+        SELECT
+            e.user_id,
+            (e.week_start_date - DATE '2000-01-03') / 7 AS week_no,
+            e.productivity_score,
+            e.satisfaction_score,
+            e.skills_applied,
+            CASE WHEN jsonb_typeof(e.accomplishments) = 'array'
+                 THEN jsonb_array_length(e.accomplishments) ELSE 0 END AS accomplishments
+        FROM (
+            SELECT user_id, week_start_date, completion_status, productivity_score, satisfaction_score,
+                   skills_applied, accomplishments
+            FROM public.journal_entries
+            UNION ALL
+            SELECT user_id, week_start_date, completion_status, productivity_score, satisfaction_score,
+                   skills_applied, accomplishments
+            FROM journal_archive.journal_entries
+        ) e
+        WHERE e.completion_status = 'completed'
+          AND (target_user_ids IS NULL OR e.user_id = ANY(target_user_ids))
+    ),
+    stats AS (
+        SELECT
+            user_id,
+            COUNT(*) AS entry_count,
+            COUNT(DISTINCT week_no) AS completed_weeks,
+            SUM(productivity_score) AS productivity_sum,
+            COUNT(productivity_score) AS productivity_count,
+            SUM(satisfaction_score) AS satisfaction_sum,
+            COUNT(satisfaction_score) AS satisfaction_count,
+            jsonb_build_object(
+                'total', SUM(accomplishments),
+                'weeks_with_accomplishments', COUNT(*) FILTER (WHERE accomplishments > 0),
+                'average_per_week', ROUND(AVG(accomplishments), 2),
+                'best_week', DATE '2000-01-03'
+                    + 7 * (array_agg(week_no ORDER BY accomplishments DESC, week_no DESC))[1]
+            ) AS achievement_patterns
+        FROM completed
+        GROUP BY user_id
+    ),
+    skill_counts AS (
+        SELECT user_id, skill, COUNT(*) AS weeks,
+               ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY COUNT(*) DESC, skill COLLATE "C") AS rank
+        FROM completed
+        CROSS JOIN LATERAL jsonb_array_elements_text(
+            CASE WHEN jsonb_typeof(skills_applied) = 'array' THEN skills_applied ELSE '[]' END
+        ) AS skill
+        GROUP BY user_id, skill
+    ),
+    skills AS (
+        -- top_skills()'s default limit of five
+        SELECT user_id, jsonb_agg(jsonb_build_object('skill', skill, 'weeks', weeks) ORDER BY rank) AS top_skills
+        FROM skill_counts
+        WHERE rank <= 5
+        GROUP BY user_id
+    ),
+    -- Gaps and islands: consecutive weeks share week_no - row_number
+    runs AS (
+        SELECT
+            user_id,
+            week_no,
+            week_no - ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY week_no) AS run,
+            week_no - LAG(week_no) OVER (PARTITION BY user_id ORDER BY week_no) - 1 AS gap_before
+        FROM (SELECT DISTINCT user_id, week_no FROM completed) w
+    ),
+    streaks AS (
+        SELECT
+            user_id,
+            jsonb_build_object(
+                'current_streak', COALESCE(MAX(run_weeks) FILTER (
+                    WHERE run_last >= (date_trunc('week', CURRENT_DATE)::DATE - DATE '2000-01-03') / 7 - 1
+                ), 0),
+                'longest_streak', MAX(run_weeks),
+                'longest_gap', COALESCE(MAX(gap_before), 0),
+                'last_completed_week', DATE '2000-01-03' + 7 * MAX(run_last)
+            ) AS summary
+        FROM (
+            SELECT
+                user_id,
+                gap_before,
+                COUNT(*) OVER (PARTITION BY user_id, run) AS run_weeks,
+                MAX(week_no) OVER (PARTITION BY user_id, run) AS run_last
+            FROM runs
+        ) r
+        GROUP BY user_id
+    )
     INSERT INTO public.user_analytics (
-        user_id, 
-        total_entries, 
-        consistency_score, 
-        average_productivity, 
+        user_id,
+        total_entries,
+        consistency_score,
+        average_productivity,
         average_satisfaction,
+        growth_trend,
+        productivity_sum,
+        productivity_count,
+        satisfaction_sum,
+        satisfaction_count,
+        top_skills,
+        achievement_patterns,
         last_computed_at
     )
-    VALUES (
-        target_user_id,
-        entry_count,
-        LEAST(consistency, 1.0), -- Cap at 1.0
-        avg_productivity,
-        avg_satisfaction,
+    SELECT
+        u.id,
+        COALESCE(s.entry_count, 0),
+        public.analytics_consistency(COALESCE(s.completed_weeks, 0), u.created_at),
+        s.productivity_sum::DECIMAL / NULLIF(s.productivity_count, 0),
+        s.satisfaction_sum::DECIMAL / NULLIF(s.satisfaction_count, 0),
+        COALESCE(et.energy_trend, '{}') || COALESCE(st.summary, '{}') || jsonb_build_object(
+            'completed_weeks', COALESCE(s.completed_weeks, 0),
+            'weeks_since_signup', public.weeks_since(u.created_at)
+        ),
+        COALESCE(s.productivity_sum, 0),
+        COALESCE(s.productivity_count, 0),
+        COALESCE(s.satisfaction_sum, 0),
+        COALESCE(s.satisfaction_count, 0),
+        sk.top_skills,
+        s.achievement_patterns,
         NOW()
-    )
-    ON CONFLICT (user_id) 
+    FROM public.users u
+    LEFT JOIN stats s ON s.user_id = u.id
+    LEFT JOIN streaks st ON st.user_id = u.id
+    LEFT JOIN skills sk ON sk.user_id = u.id
+    LEFT JOIN public.energy_trend(target_user_ids) et ON et.user_id = u.id
+    WHERE target_user_ids IS NULL OR u.id = ANY(target_user_ids)
+    ON CONFLICT (user_id)
     DO UPDATE SET
         total_entries = EXCLUDED.total_entries,
         consistency_score = EXCLUDED.consistency_score,
         average_productivity = EXCLUDED.average_productivity,
         average_satisfaction = EXCLUDED.average_satisfaction,
+        growth_trend = EXCLUDED.growth_trend,
+        productivity_sum = EXCLUDED.productivity_sum,
+        productivity_count = EXCLUDED.productivity_count,
+        satisfaction_sum = EXCLUDED.satisfaction_sum,
+        satisfaction_count = EXCLUDED.satisfaction_count,
+        top_skills = EXCLUDED.top_skills,
+        achievement_patterns = EXCLUDED.achievement_patterns,
         last_computed_at = EXCLUDED.last_computed_at,
         updated_at = NOW();
+
+    GET DIAGNOSTICS touched = ROW_COUNT;
+    rows_touched := touched;
+    elapsed_ms := ROUND((EXTRACT(EPOCH FROM clock_timestamp() - started_at) * 1000)::NUMERIC, 3);
+    RETURN NEXT;
 END;
 $$ LANGUAGE plpgsql SECURITY DEFINER;
 
+-- Bulk recomputation is a maintenance job, not something clients may call
+REVOKE EXECUTE ON FUNCTION public.update_user_analytics_bulk(UUID[]) FROM PUBLIC, anon, authenticated;
+
+-- Recompute every user in user-id batches, committing after each one, so a
+-- journal save waits for at most one batch's locks. CALL it outside a
+-- transaction block (procedures that commit cannot be SECURITY DEFINER), e.g.
+--   SELECT cron.schedule('user-analytics', '30 2 * * *', 'CALL public.update_user_analytics_in_batches()');
+CREATE OR REPLACE PROCEDURE public.update_user_analytics_in_batches(batch_size INTEGER DEFAULT 5000)
+LANGUAGE plpgsql AS $$
+DECLARE
+    last_id UUID;
+    batch UUID[];
+BEGIN
+    LOOP
+        SELECT array_agg(u.id ORDER BY u.id) INTO batch
+        FROM (
+            SELECT id
+            FROM public.users
+            WHERE last_id IS NULL OR id > last_id
+            ORDER BY id
+            LIMIT batch_size
+        ) u;
+        EXIT WHEN batch IS NULL;
+        PERFORM public.update_user_analytics_bulk(batch);
+        COMMIT;
+        last_id := batch[cardinality(batch)];
+    END LOOP;
+END;
+$$;
+
+REVOKE EXECUTE ON PROCEDURE public.update_user_analytics_in_batches(INTEGER) FROM PUBLIC, anon, authenticated;
+
+-- Function to calculate analytics for a single user
+CREATE OR REPLACE FUNCTION public.update_user_analytics(target_user_id UUID)
+RETURNS VOID AS $$
+BEGIN
+    PERFORM public.update_user_analytics_bulk(ARRAY[target_user_id]);
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Apply a batch of completed-entry changes to the running totals
+CREATE OR REPLACE FUNCTION public.apply_analytics_deltas(changes public.analytics_change[])
+RETURNS VOID AS $$
+BEGIN
+    -- Users without an analytics row (created before it was made at signup)
+    -- have no base to add to: queue them for a recompute.
+    INSERT INTO public.analytics_dirty_users (user_id)
+    SELECT DISTINCT c.user_id
+    FROM unnest(changes) c
+    JOIN public.users u ON u.id = c.user_id
+    LEFT JOIN public.user_analytics a ON a.user_id = c.user_id
+    WHERE a.user_id IS NULL
+    ON CONFLICT (user_id) DO NOTHING;
+
+    WITH deltas AS (
+        SELECT
+            c.user_id,
+            SUM(c.sign) AS entry_count,
+            COALESCE(SUM(c.sign * c.productivity_score), 0) AS productivity_sum,
+            COALESCE(SUM(c.sign) FILTER (WHERE c.productivity_score IS NOT NULL), 0) AS productivity_count,
+            COALESCE(SUM(c.sign * c.satisfaction_score), 0) AS satisfaction_sum,
+            COALESCE(SUM(c.sign) FILTER (WHERE c.satisfaction_score IS NOT NULL), 0) AS satisfaction_count
+        FROM unnest(changes) c
+        GROUP BY c.user_id
+    )
+    UPDATE public.user_analytics a
+    SET
+        total_entries = a.total_entries + d.entry_count,
+        productivity_sum = a.productivity_sum + d.productivity_sum,
+        productivity_count = a.productivity_count + d.productivity_count,
+        satisfaction_sum = a.satisfaction_sum + d.satisfaction_sum,
+        satisfaction_count = a.satisfaction_count + d.satisfaction_count,
+        average_productivity = (a.productivity_sum + d.productivity_sum)::DECIMAL
+            / NULLIF(a.productivity_count + d.productivity_count, 0),
+        average_satisfaction = (a.satisfaction_sum + d.satisfaction_sum)::DECIMAL
+            / NULLIF(a.satisfaction_count + d.satisfaction_count, 0),
+        -- One entry per user per Monday, so completed entries = completed weeks
+        consistency_score = public.analytics_consistency(a.total_entries + d.entry_count, u.created_at),
+        last_computed_at = NOW()
+    FROM deltas d
+    JOIN public.users u ON u.id = d.user_id
+    WHERE a.user_id = d.user_id;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Statement-level trigger: turn the transition tables into analytics deltas.
+-- Only completed entries count; updates that leave owner, status and scores
+-- alone (e.g. text edits) produce no delta.
+CREATE OR REPLACE FUNCTION public.journal_entries_analytics_delta()
+RETURNS TRIGGER AS $$
+DECLARE
+    changes public.analytics_change[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(ROW(n.user_id, 1, n.productivity_score, n.satisfaction_score)::public.analytics_change)
+        INTO changes
+        FROM new_rows n
+        WHERE n.completion_status = 'completed';
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(ROW(o.user_id, -1, o.productivity_score, o.satisfaction_score)::public.analytics_change)
+        INTO changes
+        FROM old_rows o
+        WHERE o.completion_status = 'completed';
+    ELSE
+        WITH changed AS (
+            SELECT o.*, n.user_id AS new_user_id, n.completion_status AS new_status,
+                   n.productivity_score AS new_productivity, n.satisfaction_score AS new_satisfaction
+            FROM old_rows o
+            JOIN new_rows n ON n.id = o.id
+            WHERE (o.user_id, o.completion_status, o.productivity_score, o.satisfaction_score)
+                  IS DISTINCT FROM
+                  (n.user_id, n.completion_status, n.productivity_score, n.satisfaction_score)
+        )
+        SELECT array_agg(change)
+        INTO changes
+        FROM (
+            SELECT ROW(user_id, -1, productivity_score, satisfaction_score)::public.analytics_change AS change
+            FROM changed
+            WHERE completion_status = 'completed'
+            UNION ALL
+            SELECT ROW(new_user_id, 1, new_productivity, new_satisfaction)::public.analytics_change
+            FROM changed
+            WHERE new_status = 'completed'
+        ) c;
+    END IF;
+
+    IF changes IS NOT NULL THEN
+        PERFORM public.apply_analytics_deltas(changes);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Transition tables need one trigger per event
+CREATE TRIGGER journal_entries_analytics_insert
+    AFTER INSERT ON public.journal_entries
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.journal_entries_analytics_delta();
+
+CREATE TRIGGER journal_entries_analytics_update
+    AFTER UPDATE ON public.journal_entries
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.journal_entries_analytics_delta();
+
+CREATE TRIGGER journal_entries_analytics_delete
+    AFTER DELETE ON public.journal_entries
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.journal_entries_analytics_delta();
+
+-- Keep daily_metrics in step with daily_entries: drop the rows of deleted or
+-- changed weeks, then derive them again from the new versions
+CREATE OR REPLACE FUNCTION public.journal_entries_sync_daily_metrics()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO public.daily_metrics (user_id, entry_date, week_start_date, energy)
+        SELECT n.user_id, d.entry_date, n.week_start_date, d.energy
+        FROM new_rows n
+        CROSS JOIN LATERAL public.daily_metric_rows(n.week_start_date, n.daily_entries) d
+        ON CONFLICT (user_id, entry_date)
+        DO UPDATE SET week_start_date = EXCLUDED.week_start_date, energy = EXCLUDED.energy;
+    ELSIF TG_OP = 'DELETE' THEN
+        DELETE FROM public.daily_metrics m
+        USING old_rows o
+        WHERE m.user_id = o.user_id
+          AND m.entry_date BETWEEN o.week_start_date AND o.week_start_date + 6
+          AND m.week_start_date = o.week_start_date;
+    ELSE
+        -- Only rows whose owner, week or daily_entries changed
+        DELETE FROM public.daily_metrics m
+        USING old_rows o
+        JOIN new_rows n ON n.id = o.id
+        WHERE (o.user_id, o.week_start_date, o.daily_entries)
+              IS DISTINCT FROM (n.user_id, n.week_start_date, n.daily_entries)
+          AND m.user_id = o.user_id
+          AND m.entry_date BETWEEN o.week_start_date AND o.week_start_date + 6
+          AND m.week_start_date = o.week_start_date;
+
+        INSERT INTO public.daily_metrics (user_id, entry_date, week_start_date, energy)
+        SELECT n.user_id, d.entry_date, n.week_start_date, d.energy
+        FROM new_rows n
+        JOIN old_rows o ON o.id = n.id
+        CROSS JOIN LATERAL public.daily_metric_rows(n.week_start_date, n.daily_entries) d
+        WHERE (o.user_id, o.week_start_date, o.daily_entries)
+              IS DISTINCT FROM (n.user_id, n.week_start_date, n.daily_entries)
+        ON CONFLICT (user_id, entry_date)
+        DO UPDATE SET week_start_date = EXCLUDED.week_start_date, energy = EXCLUDED.energy;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+CREATE TRIGGER journal_entries_daily_metrics_insert
+    AFTER INSERT ON public.journal_entries
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.journal_entries_sync_daily_metrics();
+
+CREATE TRIGGER journal_entries_daily_metrics_update
+    AFTER UPDATE ON public.journal_entries
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.journal_entries_sync_daily_metrics();
+
+CREATE TRIGGER journal_entries_daily_metrics_delete
+    AFTER DELETE ON public.journal_entries
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.journal_entries_sync_daily_metrics();
+
+-- Statement-level trigger: queue the past weeks a statement adds entries to
+-- or removes them from. Retention only counts which users have an entry in a
+-- week, so updates that keep owner and week queue nothing, and saves to the
+-- current week never touch the queue.
+CREATE OR REPLACE FUNCTION public.journal_entries_retention_dirty()
+RETURNS TRIGGER AS $$
+DECLARE
+    weeks DATE[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        weeks := ARRAY(SELECT n.week_start_date FROM new_rows n);
+    ELSIF TG_OP = 'DELETE' THEN
+        weeks := ARRAY(SELECT o.week_start_date FROM old_rows o);
+    ELSE
+        weeks := ARRAY(
+            SELECT w.week
+            FROM old_rows o
+            JOIN new_rows n ON n.id = o.id
+            CROSS JOIN LATERAL (VALUES (o.week_start_date), (n.week_start_date)) AS w(week)
+            WHERE (o.user_id, o.week_start_date) IS DISTINCT FROM (n.user_id, n.week_start_date)
+        );
+    END IF;
+
+    INSERT INTO public.retention_dirty_weeks (activity_week)
+    SELECT DISTINCT w.week
+    FROM unnest(weeks) AS w(week)
+    WHERE w.week < date_trunc('week', CURRENT_DATE)::DATE
+    ORDER BY w.week
+    ON CONFLICT (activity_week) DO NOTHING;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+CREATE TRIGGER journal_entries_retention_insert
+    AFTER INSERT ON public.journal_entries
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.journal_entries_retention_dirty();
+
+CREATE TRIGGER journal_entries_retention_update
+    AFTER UPDATE ON public.journal_entries
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.journal_entries_retention_dirty();
+
+CREATE TRIGGER journal_entries_retention_delete
+    AFTER DELETE ON public.journal_entries
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.journal_entries_retention_dirty();
+
+-- Recompute queued users in batches; returns how many were processed.
+-- Schedule it, e.g. with pg_cron:
+--   SELECT cron.schedule('drain-analytics', '*/5 * * * *', 'SELECT public.drain_analytics_dirty_users()');
+CREATE OR REPLACE FUNCTION public.drain_analytics_dirty_users(batch_size INTEGER DEFAULT 1000)
+RETURNS INTEGER AS $$
+DECLARE
+    batch UUID[];
+BEGIN
+    WITH picked AS (
+        DELETE FROM public.analytics_dirty_users
+        WHERE user_id IN (
+            SELECT user_id
+            FROM public.analytics_dirty_users
+            ORDER BY queued_at
+            LIMIT batch_size
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING user_id
+    )
+    SELECT array_agg(user_id) INTO batch FROM picked;
+
+    IF batch IS NULL THEN
+        RETURN 0;
+    END IF;
+    PERFORM public.update_user_analytics_bulk(batch);
+    RETURN cardinality(batch);
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+REVOKE EXECUTE ON FUNCTION public.drain_analytics_dirty_users(INTEGER) FROM PUBLIC, anon, authenticated;
+
+-- Create quarterly journal_entries partitions up to quarters_ahead past the
+-- current quarter (starting at start_date, default the current quarter), and
+-- detach partitions that end more than retain_quarters before it into the
+-- journal_archive schema (NULL keeps everything). Run it from a schedule, e.g.
+--   SELECT cron.schedule('journal-partitions', '0 3 1 * *', 'SELECT * FROM public.maintain_journal_entry_partitions(4, 12)');
+CREATE OR REPLACE FUNCTION public.maintain_journal_entry_partitions(
+    quarters_ahead INTEGER DEFAULT 4,
+    retain_quarters INTEGER DEFAULT NULL,
+    start_date DATE DEFAULT NULL
+)
+RETURNS TABLE (partition_name TEXT, action TEXT) AS $$
+DECLARE
+    current_quarter DATE := date_trunc('quarter', CURRENT_DATE)::DATE;
+    quarter_start DATE := date_trunc('quarter', COALESCE(start_date, CURRENT_DATE))::DATE;
+    cutoff DATE;
+    part RECORD;
+BEGIN
+    WHILE quarter_start <= current_quarter + make_interval(months => 3 * quarters_ahead) LOOP
+        partition_name := format('journal_entries_%sq%s',
+                                 EXTRACT(YEAR FROM quarter_start), EXTRACT(QUARTER FROM quarter_start));
+        IF to_regclass('public.' || partition_name) IS NULL THEN
+            EXECUTE format('CREATE TABLE public.%I PARTITION OF public.journal_entries FOR VALUES FROM (%L) TO (%L)',
+                           partition_name, quarter_start, (quarter_start + INTERVAL '3 months')::DATE);
+            -- A partition is a table of its own: the parent's policies do not
+            -- apply when it is queried directly, and Supabase's default
+            -- privileges would expose it through the API. Lock it down; reads
+            -- go through public.journal_entries and its policies.
+            EXECUTE format('ALTER TABLE public.%I ENABLE ROW LEVEL SECURITY', partition_name);
+            EXECUTE format('REVOKE ALL ON TABLE public.%I FROM anon, authenticated', partition_name);
+            action := 'created';
+            RETURN NEXT;
+        END IF;
+        quarter_start := (quarter_start + INTERVAL '3 months')::DATE;
+    END LOOP;
+
+    IF retain_quarters IS NOT NULL THEN
+        cutoff := (current_quarter - make_interval(months => 3 * retain_quarters))::DATE;
+        FOR part IN
+            SELECT c.relname,
+                   make_date(substring(c.relname FROM '_(\d{4})q')::INTEGER,
+                             substring(c.relname FROM 'q(\d)$')::INTEGER * 3 - 2, 1) AS starts_at
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'public.journal_entries'::regclass
+              AND c.relname ~ '^journal_entries_\d{4}q[1-4]$'
+            ORDER BY c.relname
+        LOOP
+            CONTINUE WHEN part.starts_at + INTERVAL '3 months' > cutoff;
+            EXECUTE format('ALTER TABLE public.journal_entries DETACH PARTITION public.%I', part.relname);
+            EXECUTE format('ALTER TABLE public.%I SET SCHEMA journal_archive', part.relname);
+            EXECUTE format('ALTER TABLE journal_archive.journal_entries ATTACH PARTITION journal_archive.%I '
+                           'FOR VALUES FROM (%L) TO (%L)',
+                           part.relname, part.starts_at, (part.starts_at + INTERVAL '3 months')::DATE);
+            partition_name := part.relname;
+            action := 'archived';
+            RETURN NEXT;
+        END LOOP;
+    END IF;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+REVOKE EXECUTE ON FUNCTION public.maintain_journal_entry_partitions(INTEGER, INTEGER, DATE) FROM PUBLIC, anon, authenticated;
+
+-- Partitions from the start of 2024 through a year ahead
+SELECT * FROM public.maintain_journal_entry_partitions(4, NULL, '2024-01-01');
+
+-- Rebuild signup_rollup_daily from scratch (initial load or reconciliation).
+-- The EXCLUSIVE lock holds off the signup triggers' writes, so no delta is
+-- lost between the DELETE and the INSERT; dashboards are not blocked and
+-- keep reading the previous rows until it commits.
+CREATE OR REPLACE FUNCTION public.rebuild_signup_rollup()
+RETURNS BIGINT AS $$
+DECLARE
+    buckets BIGINT;
+BEGIN
+    LOCK TABLE public.signup_rollup_daily IN EXCLUSIVE MODE;
+    DELETE FROM public.signup_rollup_daily;
+    INSERT INTO public.signup_rollup_daily (signup_date, utm_source, auth_provider, onboarding_completed, signups)
+    SELECT (created_at AT TIME ZONE 'UTC')::DATE,
+           COALESCE(utm_source, 'direct'),
+           auth_provider,
+           COALESCE(onboarding_completed, FALSE),
+           COUNT(*)
+    FROM public.users
+    GROUP BY 1, 2, 3, 4;
+    GET DIAGNOSTICS buckets = ROW_COUNT;
+    RETURN buckets;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Recompute retention for journal weeks from since_week on, plus the older
+-- weeks queued in retention_dirty_weeks by journal writes since the last run,
+-- so a daily run only reads the recent journal_entries partitions and the
+-- weeks that changed. Runs in one transaction: dashboards keep reading the
+-- previous rows until it commits. Pass NULL to rebuild every week.
+CREATE OR REPLACE FUNCTION public.refresh_retention_cohorts(
+    since_week DATE DEFAULT (date_trunc('week', CURRENT_DATE) - INTERVAL '1 week')::DATE
+)
+RETURNS BIGINT AS $$
+DECLARE
+    refreshed BIGINT;
+    dirty_weeks DATE[];
+BEGIN
+    -- One refresh at a time
+    PERFORM pg_advisory_xact_lock(hashtext('public.refresh_retention_cohorts'));
+    -- Activity weeks are Mondays: a mid-week since_week must cover its whole
+    -- week in both statements, or the INSERT recreates rows the DELETE kept
+    since_week := date_trunc('week', since_week)::DATE;
+    -- Claim the queued weeks; writes that commit after this queue them again
+    WITH picked AS (
+        DELETE FROM public.retention_dirty_weeks
+        RETURNING activity_week
+    )
+    SELECT array_agg(activity_week) INTO dirty_weeks FROM picked;
+
+    DELETE FROM public.retention_cohort_weekly
+    WHERE since_week IS NULL OR activity_week >= since_week OR activity_week = ANY(dirty_weeks);
+
+    INSERT INTO public.retention_cohort_weekly (cohort_week, activity_week, active_users)
+    SELECT date_trunc('week', u.created_at AT TIME ZONE 'UTC')::DATE,
+           date_trunc('week', e.week_start_date)::DATE,
+           COUNT(DISTINCT e.user_id)
+    FROM (
+        SELECT user_id, week_start_date FROM public.journal_entries
+        UNION ALL
+        SELECT user_id, week_start_date FROM journal_archive.journal_entries
+    ) e
+    JOIN public.users u ON u.id = e.user_id
+    WHERE since_week IS NULL OR e.week_start_date >= since_week OR e.week_start_date = ANY(dirty_weeks)
+    GROUP BY 1, 2;
+    GET DIAGNOSTICS refreshed = ROW_COUNT;
+    RETURN refreshed;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+REVOKE EXECUTE ON FUNCTION public.rebuild_signup_rollup() FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.refresh_retention_cohorts(DATE) FROM PUBLIC, anon, authenticated;
+
+-- Dashboard views: read the rollups only, O(days) rather than O(users).
+-- security_invoker keeps the rollups' RLS in force for API roles.
+CREATE OR REPLACE VIEW public.signup_conversion_by_source
+WITH (security_invoker = true) AS
+SELECT
+    utm_source,
+    auth_provider,
+    SUM(signups) AS signups,
+    SUM(signups) FILTER (WHERE onboarding_completed) AS onboarded,
+    ROUND(SUM(signups) FILTER (WHERE onboarding_completed)::DECIMAL / NULLIF(SUM(signups), 0), 4) AS onboarding_rate,
+    MIN(signup_date) AS first_signup_date,
+    MAX(signup_date) AS last_signup_date
+FROM public.signup_rollup_daily
+WHERE signups > 0
+GROUP BY utm_source, auth_provider;
+
+CREATE OR REPLACE VIEW public.retention_cohorts
+WITH (security_invoker = true) AS
+WITH cohorts AS (
+    SELECT date_trunc('week', signup_date)::DATE AS cohort_week, SUM(signups) AS cohort_size
+    FROM public.signup_rollup_daily
+    GROUP BY 1
+)
+SELECT
+    r.cohort_week,
+    c.cohort_size,
+    (r.activity_week - r.cohort_week) / 7 AS weeks_since_signup,
+    r.active_users,
+    ROUND(r.active_users::DECIMAL / NULLIF(c.cohort_size, 0), 4) AS retention_rate
+FROM public.retention_cohort_weekly r
+JOIN cohorts c ON c.cohort_week = r.cohort_week;
+
 -- Create sample data for testing (remove in production)
 -- This is helpful for development and testing
 
@@ -266,4 +1167,5 @@ COMMENT ON TABLE public.user_analytics IS 'Computed analytics and insights for u
 COMMENT ON COLUMN public.journal_entries.daily_entries IS 'JSONB structure: {"monday": {"energy": 5, "win": "...", "learning": "..."}, ...}';
 COMMENT ON COLUMN public.journal_entries.accomplishments IS 'JSONB array of weekly accomplishments';
 COMMENT ON COLUMN public.journal_entries.skills_applied IS 'JSONB array of skills used during the week';
+COMMENT ON TABLE public.daily_metrics IS 'Typed per-day metrics derived from journal_entries.daily_entries';
 COMMENT ON COLUMN public.user_analytics.growth_trend IS 'JSONB with trend data for ML/AI processing';
\ No newline at end of file
@@ -0,0 +1,69 @@
+// Career Journaling Service Worker
+// Precaches the site under a cache named after the assets' content hashes.
+// Precached assets are served cache-first; pages are served
+// stale-while-revalidate so repeat visits render without the network.
+// The release build rewrites CACHE_NAME and PRECACHE_URLS with the
+// fingerprinted asset URLs.
+
+const CACHE_PREFIX = 'career-journal-';
+const CACHE_NAME = 'career-journal-a5e6ce08f6';
+const PRECACHE_URLS = ["/", "/index.html", "/profile.js", "/script.js", "/social.js", "/styles.css", "/success.js"];
+const PRECACHE_PATHS = new Set(PRECACHE_URLS);
+
+self.addEventListener('install', (event) => {
+    event.waitUntil(
+        caches.open(CACHE_NAME)
+            .then((cache) => cache.addAll(PRECACHE_URLS))
+            .then(() => self.skipWaiting())
+    );
+});
+
+// Drop the caches of previous builds
+self.addEventListener('activate', (event) => {
+    event.waitUntil(
+        caches.keys()
+            .then((names) => Promise.all(names
+                .filter((name) => name.startsWith(CACHE_PREFIX) && name !== CACHE_NAME)
+                .map((name) => caches.delete(name))))
+            .then(() => self.clients.claim())
+    );
+});
+
+function cacheFirst(request) {
+    return caches.open(CACHE_NAME)
+        .then((cache) => cache.match(request))
+        .then((cached) => cached || fetch(request));
+}
+
+function staleWhileRevalidate(event) {
+    const request = event.request;
+    // Campaign links (?utm_source=...) share the cached page
+    const key = new URL(request.url).pathname;
+    return caches.open(CACHE_NAME).then((cache) => cache.match(key).then((cached) => {
+        const network = fetch(request).then((response) => {
+            if (response.ok && !response.redirected) {
+                cache.put(key, response.clone());
+            }
+            return response;
+        });
+        if (cached) {
+            event.waitUntil(network.catch(() => undefined));
+            return cached;
+        }
+        return network;
+    }));
+}
+
+self.addEventListener('fetch', (event) => {
+    const request = event.request;
+    const url = new URL(request.url);
+    // Supabase, analytics and font CDN requests go straight to the network
+    if (request.method !== 'GET' || url.origin !== self.location.origin) {
+        return;
+    }
+    if (request.mode === 'navigate' || url.pathname.endsWith('.html')) {
+        event.respondWith(staleWhileRevalidate(event));
+    } else if (PRECACHE_PATHS.has(url.pathname)) {
+        event.respondWith(cacheFirst(request));
+    }
+});
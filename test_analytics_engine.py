@@ -0,0 +1,45 @@
+# Parity check for analytics_engine.py against the SQL it mirrors
+#
+# fixtures/analytics holds psql exports of a small database: users.csv and
+# journal_entries.csv (the \copy commands in analytics_engine.py), and
+# user_analytics.csv, taken right after
+#
+#   SELECT * FROM public.update_user_analytics_bulk();
+#
+# ran on that data.  The fixture covers weeks and signups across New Year,
+# NULL scores, non-array skills/accomplishments/daily_entries, skill ties
+# broken by byte order, and energy values that round half up or fall off
+# the 1-10 scale.  To regenerate it, load the two input CSVs into a
+# database with supabase_schema.sql, run the bulk function and export
+# user_analytics' analytics_engine.OUTPUT_COLUMNS the same way.
+
+import csv
+import os
+
+import analytics_engine
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'analytics')
+ENTRIES = os.path.join(FIXTURES, 'journal_entries.csv')
+USERS = os.path.join(FIXTURES, 'users.csv')
+EXPECTED = os.path.join(FIXTURES, 'user_analytics.csv')
+
+
+def _computed():
+    # CURRENT_DATE of the bulk run: the export's last_computed_at
+    with open(EXPECTED, newline='', encoding='utf-8') as f:
+        as_of = max(analytics_engine._timestamp(row['last_computed_at']) for row in csv.DictReader(f))
+    users, entries = analytics_engine.load(ENTRIES, USERS)
+    return analytics_engine.compute(users, entries, as_of)
+
+
+def test_matches_update_user_analytics_bulk():
+    differences, count = analytics_engine.compare(_computed(), EXPECTED)
+    assert count == 0, '\n'.join(differences)
+
+
+def test_compare_reports_differences():
+    rows = _computed()
+    rows[0]['top_skills'] = None
+    rows[-1]['total_entries'] += 1
+    _, count = analytics_engine.compare(rows, EXPECTED)
+    assert count == 2
@@ -0,0 +1,101 @@
+# Archiving a quarter must not change lifetime analytics
+#
+# maintain_journal_entry_partitions() moves quarters older than
+# retain_quarters into journal_archive.  The incremental totals never see the
+# move (DETACH fires no triggers), so the recompute has to keep reading the
+# archived entries for the two paths to agree.
+#
+# Needs a local database with supabase_schema.sql loaded (DATABASE_URL, or
+# db_bench.LOCAL_DSN for `supabase start`); skipped otherwise.  Everything
+# runs in one transaction that is rolled back.
+
+import os
+import uuid
+from datetime import date, timedelta
+
+import pytest
+
+import db_bench
+
+ANALYTICS_SQL = """
+SELECT total_entries, average_productivity, average_satisfaction, consistency_score
+FROM public.user_analytics WHERE user_id = %s
+"""
+ARCHIVED_SQL = """
+SELECT count(*) FROM journal_archive.journal_entries WHERE user_id = %s
+"""
+
+
+@pytest.fixture
+def conn():
+    if db_bench.psycopg is None:
+        pytest.skip('needs psycopg')
+    dsn = os.environ.get('DATABASE_URL', db_bench.LOCAL_DSN)
+    if not db_bench.is_local(dsn):
+        pytest.skip('refusing to run against a non-local database')
+    try:
+        connection = db_bench.psycopg.connect(dsn, connect_timeout=3)
+    except db_bench.psycopg.OperationalError as e:
+        pytest.skip(f'no database: {e}')
+    try:
+        yield connection
+    finally:
+        connection.rollback()
+        connection.close()
+
+
+def _quarter(day):
+    return date(day.year, (day.month - 1) // 3 * 3 + 1, 1)
+
+
+def _monday(day):
+    return day + timedelta(days=(7 - day.weekday()) % 7)
+
+
+def test_archiving_keeps_lifetime_analytics(conn):
+    cur = conn.cursor()
+    cur.execute('SELECT CURRENT_DATE')
+    today = cur.fetchone()[0]
+    current_quarter = _quarter(today)
+    old_week = date(2024, 1, 1)
+    recent_week = _monday(current_quarter)
+    if recent_week > today:
+        recent_week -= timedelta(days=7)
+
+    user_id = uuid.uuid4()
+    cur.execute("INSERT INTO auth.users (id, email, created_at) VALUES (%s, %s, '2023-12-01')",
+                (user_id, f'{user_id}@example.com'))
+    cur.execute("UPDATE public.users SET created_at = '2023-12-01' WHERE id = %s", (user_id,))
+    for week, productivity, satisfaction in ((old_week, 4, 6),
+                                             (old_week + timedelta(days=7), 6, None),
+                                             (recent_week, 9, 8)):
+        cur.execute("""
+            INSERT INTO public.journal_entries (user_id, week_start_date, week_end_date,
+                                                productivity_score, satisfaction_score, completion_status)
+            VALUES (%s, %s, %s, %s, %s, 'completed')
+        """, (user_id, week, week + timedelta(days=6), productivity, satisfaction))
+
+    cur.execute('SELECT public.update_user_analytics(%s)', (user_id,))
+    cur.execute(ANALYTICS_SQL, (user_id,))
+    before = cur.fetchone()
+    assert before[0] == 3
+
+    # Keep every quarter after 2024q1: only that one is archived
+    retain = (current_quarter.year - 2024) * 4 + (current_quarter.month - 4) // 3
+    cur.execute('SELECT partition_name, action FROM public.maintain_journal_entry_partitions(0, %s)',
+                (retain,))
+    assert ('journal_entries_2024q1', 'archived') in cur.fetchall()
+    cur.execute(ARCHIVED_SQL, (user_id,))
+    assert cur.fetchone()[0] == 2
+
+    # Incremental totals are untouched by the move ...
+    cur.execute(ANALYTICS_SQL, (user_id,))
+    assert cur.fetchone() == before
+
+    # ... and both recompute paths still count the archived weeks
+    cur.execute('SELECT public.update_user_analytics(%s)', (user_id,))
+    cur.execute(ANALYTICS_SQL, (user_id,))
+    assert cur.fetchone() == before
+    cur.execute('SELECT public.update_user_analytics_bulk(%s)', ([user_id],))
+    cur.execute(ANALYTICS_SQL, (user_id,))
+    assert cur.fetchone() == before